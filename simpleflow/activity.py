@@ -36,6 +36,7 @@ def with_attributes(
     heartbeat_timeout: int | str | None = settings.ACTIVITY_HEARTBEAT_TIMEOUT,
     idempotent: bool | None = None,
     meta: dict[str, Any] | str | None = None,
+    max_concurrency_per_host: int | None = None,
 ) -> Callable[[Callable], Activity]:
     """
     Decorator: wrap a function/class into an Activity.
@@ -52,6 +53,8 @@ def with_attributes(
     :param heartbeat_timeout:
     :param idempotent: True if the activity is idempotent.
     :param meta:
+    :param max_concurrency_per_host: maximum number of tasks of this activity
+        processed at once by the workers of a host.
 
     """
 
@@ -70,6 +73,7 @@ def with_attributes(
             task_priority=task_priority,
             idempotent=idempotent,
             meta=meta,
+            max_concurrency_per_host=max_concurrency_per_host,
         )
 
     return wrap
@@ -91,6 +95,7 @@ class Activity:
         task_priority: str | NotSet = PRIORITY_NOT_SET,
         idempotent: bool | None = None,
         meta: dict[str, Any] | str | None = None,
+        max_concurrency_per_host: int | None = None,
     ):
         self._callable = callable
 
@@ -106,6 +111,7 @@ class Activity:
         self.task_schedule_to_start_timeout = schedule_to_start_timeout
         self.task_heartbeat_timeout = heartbeat_timeout
         self.meta = meta if meta is not None else {}
+        self.max_concurrency_per_host = max_concurrency_per_host
 
         self.register()
 
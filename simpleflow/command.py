@@ -20,11 +20,12 @@ from simpleflow import __version__, format, log, logger
 from simpleflow.download import download_binaries
 from simpleflow.history import History
 from simpleflow.settings import print_settings
-from simpleflow.swf import helpers
+from simpleflow.swf import bulk, helpers
 from simpleflow.swf.process import decider, worker
+from simpleflow.swf.process.worker.task_lists import parse_task_list
 from simpleflow.swf.stats import pretty
 from simpleflow.swf.task import ActivityTask
-from simpleflow.swf.utils import get_workflow_execution, set_workflow_class_name
+from simpleflow.swf.utils import get_workflow_execution, set_workflow_class_name, transform_input
 from simpleflow.utils import import_from_module, json_dumps
 
 if TYPE_CHECKING:
@@ -89,22 +90,6 @@ def get_or_load_input(input_file, input):
         return get_input(input)
 
 
-def transform_input(wf_input):
-    if isinstance(wf_input, dict):
-        return wf_input
-    if isinstance(wf_input, list):
-        wf_input = {
-            "args": wf_input,
-            "kwargs": {},
-        }
-    else:
-        wf_input = {
-            "args": [wf_input],
-            "kwargs": {},
-        }
-    return wf_input
-
-
 def run_workflow_locally(workflow_class, wf_input, middlewares):
     from .local.executor import Executor
 
@@ -239,6 +224,23 @@ def with_format(ctx):
     )
 
 
+def with_streamed_format(ctx):
+    return pretty.streamed(
+        with_header=ctx.parent.params["header"],
+        fmt=ctx.parent.params["format"] or pretty.DEFAULT_FORMAT,
+    )
+
+
+def print_streamed(chunks):
+    """
+    Print the chunks as they come, like print("".join(chunks)).
+    """
+    for chunk in chunks:
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    sys.stdout.write("\n")
+
+
 @click.argument("run_id", required=False)
 @click.argument("workflow_id")
 @click.argument(
@@ -323,11 +325,18 @@ def status(ctx, domain, workflow_id, run_id, nb_tasks):
     help="Open/Closed",
 )
 @click.option("--started-since", "-d", default=30, show_default=True, help="Started since N days.")
+@click.option(
+    "--slices",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Split the time window in N slices, listed concurrently.",
+)
 @click.pass_context
-def list_workflows(ctx, domain, status, started_since):
-    print(
-        with_format(ctx)(helpers.list_workflow_executions)(
-            domain, status=status.upper(), start_oldest_date=started_since
+def list_workflows(ctx, domain, status, started_since, slices):
+    print_streamed(
+        with_streamed_format(ctx)(helpers.list_workflow_executions)(
+            domain, status=status.upper(), start_oldest_date=started_since, slices=slices
         )
     )
 
@@ -350,6 +359,13 @@ def list_workflows(ctx, domain, status, started_since):
 @click.option("--workflow-type-name", default=None, help="Workflow Name.")
 @click.option("--workflow-type-version", default=None, help="Workflow Version (name needed).")
 @click.option("--started-since", "-d", default=30, show_default=True, help="Started since N days.")
+@click.option(
+    "--slices",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Split the time window in N slices, listed concurrently.",
+)
 @click.pass_context
 def filter_workflows(
     ctx,
@@ -360,6 +376,7 @@ def filter_workflows(
     workflow_type_name,
     workflow_type_version,
     started_since,
+    slices,
 ):
     status = status.upper()
     kwargs = {}
@@ -367,19 +384,141 @@ def filter_workflows(
         kwargs["oldest_date"] = started_since
     else:
         kwargs["start_oldest_date"] = started_since
-    print(
-        with_format(ctx)(helpers.filter_workflow_executions)(
+    print_streamed(
+        with_streamed_format(ctx)(helpers.filter_workflow_executions)(
             domain,
             status=status.upper(),
             tag=tag,
             workflow_id=workflow_id,
             workflow_type_name=workflow_type_name,
             workflow_type_version=workflow_type_version,
+            slices=slices,
             **kwargs,
         )
     )
 
 
+def bulk_options(filters: bool = True):
+    """
+    Options of the bulk.* commands: input file, optionally filter, concurrency
+    and rate.
+    """
+
+    def decorator(func):
+        options = [
+            click.option(
+                "--input-file",
+                "-i",
+                type=click.File(),
+                required=not filters,
+                help="NDJSON file of the items (one JSON object per line), '-' for stdin.",
+            ),
+            click.option(
+                "--concurrency",
+                "-c",
+                default=bulk.DEFAULT_CONCURRENCY,
+                show_default=True,
+                type=click.IntRange(min=1),
+                help="Operations in flight.",
+            ),
+            click.option("--rate", type=click.FloatRange(min=0, min_open=True), help="Max operations per second."),
+        ]
+        if filters:
+            options += [
+                click.option("--tag", default=None, help="Open executions with this tag, without --input-file."),
+                click.option("--workflow-type-name", default=None, help="Open executions of this workflow type."),
+                click.option("--workflow-type-version", default=None, help="Workflow Version (name needed)."),
+                click.option("--started-since", "-d", default=30, show_default=True, help="Started since N days."),
+                click.option(
+                    "--slices",
+                    default=1,
+                    show_default=True,
+                    type=click.IntRange(min=1),
+                    help="Split the time window in N slices, listed concurrently.",
+                ),
+            ]
+        for option in options:
+            func = option(func)
+        return func
+
+    return decorator
+
+
+def get_bulk_items(domain, input_file, tag, workflow_type_name, workflow_type_version, started_since, slices):
+    if input_file:
+        return bulk.read_items(input_file)
+    if not tag and not workflow_type_name:
+        raise click.UsageError("one of --input-file, --tag or --workflow-type-name is required")
+    return bulk.filtered_items(
+        domain,
+        slices=slices,
+        tag=tag,
+        workflow_type_name=workflow_type_name,
+        workflow_type_version=workflow_type_version,
+        oldest_date=started_since,
+    )
+
+
+def print_bulk_results(ctx, operation, items, concurrency, rate):
+    errors = 0
+
+    def outcomes():
+        nonlocal errors
+        for item, result, error in bulk.run(operation, items, concurrency=concurrency, rate=rate):
+            if error:
+                errors += 1
+            yield item, result, error
+
+    print_streamed(with_streamed_format(ctx)(bulk.results)(outcomes()))
+    if errors:
+        logger.error(f"{errors} operations failed")
+        sys.exit(1)
+
+
+@bulk_options(filters=False)
+@click.option("--domain", "-d", envvar="SWF_DOMAIN", required=True, help="Amazon SWF Domain.")
+@click.argument("workflow")
+@cli.command(
+    "bulk.start",
+    help="Start executions of the workflow defined in the WORKFLOW module, one per item:"
+    " workflow_id, input, tags, task_list, execution_timeout, decision_tasks_timeout.",
+)
+@click.pass_context
+def bulk_start(ctx, workflow, domain, input_file, concurrency, rate):
+    workflow_class = import_from_module(workflow)
+    workflow_type = get_workflow_type(domain, workflow_class)
+    print_bulk_results(ctx, bulk.start(workflow_type, workflow_class), bulk.read_items(input_file), concurrency, rate)
+
+
+@bulk_options()
+@click.option("--signal", "signal_name", required=True, help="Signal name.")
+@click.argument("domain", envvar="SWF_DOMAIN")
+@cli.command("bulk.signal", help="Signal executions, one per item: workflow_id, run_id, input.")
+@click.pass_context
+def bulk_signal(ctx, domain, signal_name, input_file, concurrency, rate, **filters):
+    items = get_bulk_items(domain, input_file, **filters)
+    print_bulk_results(ctx, bulk.signal(domain, signal_name), items, concurrency, rate)
+
+
+@bulk_options()
+@click.argument("domain", envvar="SWF_DOMAIN")
+@cli.command("bulk.cancel", help="Request the cancellation of executions, one per item: workflow_id, run_id.")
+@click.pass_context
+def bulk_cancel(ctx, domain, input_file, concurrency, rate, **filters):
+    items = get_bulk_items(domain, input_file, **filters)
+    print_bulk_results(ctx, bulk.cancel(domain), items, concurrency, rate)
+
+
+@bulk_options()
+@click.option("--reason", default=None, help="Termination reason, unless set by the item.")
+@click.argument("domain", envvar="SWF_DOMAIN")
+@cli.command("bulk.terminate", help="Terminate executions, one per item: workflow_id, run_id, reason.")
+@click.pass_context
+def bulk_terminate(ctx, domain, reason, input_file, concurrency, rate, **filters):
+    items = get_bulk_items(domain, input_file, **filters)
+    print_bulk_results(ctx, bulk.terminate(domain, reason), items, concurrency, rate)
+
+
 @click.argument("task_id")
 @click.argument("workflow_id")
 @click.argument(
@@ -393,13 +532,25 @@ def task_info(ctx, domain, workflow_id, task_id, details):
     print(with_format(ctx)(helpers.get_task)(domain, workflow_id, task_id, details))
 
 
+@click.option(
+    "--max-rss-per-child",
+    type=int,
+    required=False,
+    help="Replace a decider process when its memory usage exceeds this many MB.",
+)
+@click.option(
+    "--max-tasks-per-child",
+    type=int,
+    required=False,
+    help="Replace a decider process after it processed this many decision tasks.",
+)
 @click.option("--nb-processes", "-N", type=int)
 @click.option("--log-level", "-l")
 @click.option("--task-list", "-t")
 @click.option("--domain", "-d", envvar="SWF_DOMAIN", required=True, help="SWF Domain")
 @click.argument("workflows", nargs=-1, required=False)
 @cli.command("decider.start", help="Start a decider process to manage workflow executions.")
-def start_decider(workflows, domain, task_list, log_level, nb_processes):
+def start_decider(workflows, domain, task_list, log_level, nb_processes, max_tasks_per_child, max_rss_per_child):
     if log_level:
         logger.warning("Deprecated: --log-level will be removed, use LOG_LEVEL environment variable instead")
     decider.command.start(
@@ -408,9 +559,28 @@ def start_decider(workflows, domain, task_list, log_level, nb_processes):
         task_list,
         None,
         nb_processes,
+        max_tasks_per_child=max_tasks_per_child,
+        max_rss_per_child=max_rss_per_child,
     )
 
 
+def parse_task_lists(ctx, param, value):
+    try:
+        return [parse_task_list(task_list) for task_list in value]
+    except ValueError as err:
+        raise click.BadParameter(str(err))
+
+
+def parse_concurrency_limits(ctx, param, value):
+    concurrency_limits = {}
+    for limit in value:
+        name, _, number = limit.rpartition("=")
+        if not name or not number.isdigit() or not int(number):
+            raise click.BadParameter(f"invalid limit {limit!r}, expected ACTIVITY_NAME=N with N > 0")
+        concurrency_limits[name] = int(number)
+    return concurrency_limits
+
+
 @click.option("--middleware-pre-execution", required=False, multiple=True)
 @click.option("--middleware-post-execution", required=False, multiple=True)
 @click.option(
@@ -418,6 +588,37 @@ def start_decider(workflows, domain, task_list, log_level, nb_processes):
     help="Provide a base64 encoded json dump of the SWF poll response, instead of polling SWF",
 )
 @click.option("--one-task", is_flag=True, help="Run only one task and shut down (no supervisor).")
+@click.option(
+    "--preload",
+    multiple=True,
+    help="Module defining activities, to import before forking the worker processes (multiple option).",
+)
+@click.option(
+    "--concurrency-limit",
+    multiple=True,
+    callback=parse_concurrency_limits,
+    help="Maximum number of tasks of an activity processed at once on this host, as ACTIVITY_NAME=N"
+    " (multiple option).",
+)
+@click.option(
+    "--prefetch",
+    type=int,
+    required=False,
+    default=0,
+    help="Number of tasks each process polls ahead while processing the current one (0 to disable).",
+)
+@click.option(
+    "--max-rss-per-child",
+    type=int,
+    required=False,
+    help="Replace a poller process when its memory usage exceeds this many MB.",
+)
+@click.option(
+    "--max-tasks-per-child",
+    type=int,
+    required=False,
+    help="Replace a poller process after it processed this many activity tasks.",
+)
 @click.option(
     "--heartbeat",
     type=int,
@@ -427,7 +628,13 @@ def start_decider(workflows, domain, task_list, log_level, nb_processes):
 )
 @click.option("--nb-processes", "-N", type=int)
 @click.option("--log-level", "-l")
-@click.option("--task-list", "-t")
+@click.option(
+    "--task-list",
+    "-t",
+    multiple=True,
+    callback=parse_task_lists,
+    help="Task list to poll, as NAME[:weight=N,priority=N,max=N] (multiple option).",
+)
 @click.option("--domain", "-d", envvar="SWF_DOMAIN", required=True, help="SWF Domain")
 @cli.command("worker.start", help="Start a worker process to handle activity tasks.")
 def start_worker(
@@ -436,6 +643,11 @@ def start_worker(
     log_level,
     nb_processes,
     heartbeat,
+    max_tasks_per_child,
+    max_rss_per_child,
+    prefetch,
+    concurrency_limit,
+    preload,
     one_task,
     poll_data,
     middleware_pre_execution,
@@ -447,6 +659,12 @@ def start_worker(
     if not task_list and not poll_data:
         raise ValueError("Please provide a --task-list or some data via --poll-data")
 
+    task_lists = task_list
+    if len(task_lists) == 1 and not task_lists[0].has_options:
+        task_list, task_lists = task_lists[0].name, None
+    else:
+        task_list = None
+
     middlewares = {
         "pre": middleware_pre_execution,
         "post": middleware_post_execution,
@@ -455,11 +673,17 @@ def start_worker(
     worker.command.start(
         domain=domain,
         task_list=task_list,
+        task_lists=task_lists,
         middlewares=middlewares,
         nb_processes=nb_processes,
         heartbeat=heartbeat,
         one_task=one_task,
         poll_data=poll_data,
+        max_tasks_per_child=max_tasks_per_child,
+        max_rss_per_child=max_rss_per_child,
+        prefetch=prefetch,
+        concurrency_limits=concurrency_limit,
+        preload=preload,
     )
 
 
@@ -25,8 +25,25 @@ MAX_LOG_FIELD = 500 * 1024  # 500kB
 
 # Jumbo fields
 JUMBO_FIELDS_PREFIX = "simpleflow+s3://"
+JUMBO_FIELDS_FILE_PREFIX = "simpleflow+file://"
 JUMBO_FIELDS_MAX_SIZE = 5 * 1024**2  # 5MB
 
+# Compressed fields: prefix followed by the base64 of the compressed content
+COMPRESSED_FIELDS_PREFIX = "simpleflow+{codec}:"
+
 # Cache directory
 # No security considerations expected :)
 CACHE_DIR = "/tmp/simpleflow-cache"  # nosec
+# Histories of closed workflow executions
+HISTORY_CACHE_DIR = "/tmp/simpleflow-history-cache"  # nosec
+# Activity and workflow types known to be registered, descriptions of domains
+# and types
+REGISTRATION_CACHE_DIR = "/tmp/simpleflow-registration-cache"  # nosec
+
+# Lock files shared by the workers of a host
+LOCKS_DIR = "/tmp/simpleflow-locks"  # nosec
+
+# Failure reason of activity tasks released by a worker because the activity
+# reached its concurrency limit on the host; they are rescheduled by the decider
+# without counting as a retry.
+CONCURRENCY_LIMIT_REASON = "simpleflow: activity concurrency limit reached on worker host"
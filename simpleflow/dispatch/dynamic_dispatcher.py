@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from importlib import import_module
+
 from simpleflow.activity import Activity
 from simpleflow.utils import import_object_from_module
 
@@ -8,10 +12,18 @@ class Dispatcher:
     """
     Dispatch by name, like simpleflow.swf.process.worker.dispatch.by_module.ModuleDispatcher
     but without a hierarchy.
+
+    The activities of the modules given to `preload()` are cached: the worker
+    imports them once, before forking the processes handling the tasks, which
+    only do a dict lookup. Their code is only reloaded when the worker restarts.
+    Other activities are imported by each process handling a task, so code
+    redeployed on disk is picked up by the next task.
     """
 
-    @staticmethod
-    def dispatch_activity(name):
+    _activities: dict[str, Activity] = {}
+
+    @classmethod
+    def dispatch_activity(cls, name):
         """
 
         :param name:
@@ -20,6 +32,30 @@ class Dispatcher:
         :rtype: Activity
         :raise DispatchError: if doesn't exist or not an activity
         """
+        activity = cls._activities.get(name)
+        if activity is None:
+            activity = cls._import_activity(name)
+        return activity
+
+    @classmethod
+    def cached_activity(cls, name: str) -> Activity | None:
+        """
+        Activity of a preloaded module, if any; nothing is imported.
+        """
+        return cls._activities.get(name)
+
+    @classmethod
+    def preload(cls, module_name: str) -> None:
+        """
+        Import a module and cache the activities it defines.
+        """
+        module = import_module(module_name)
+        for attr_name, obj in vars(module).items():
+            if isinstance(obj, Activity):
+                cls._activities.setdefault(f"{module_name}.{attr_name}", obj)
+
+    @staticmethod
+    def _import_activity(name):
         module_name, activity_name = name.rsplit(".", 1)
         try:
             activity = import_object_from_module(module_name, activity_name)
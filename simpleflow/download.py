@@ -9,7 +9,7 @@ from lockfile import FileLock
 
 from simpleflow import logger
 from simpleflow.settings import SIMPLEFLOW_BINARIES_DIRECTORY
-from simpleflow.storage import pull
+from simpleflow.storage import pull, split_url
 
 
 class RemoteBinary:
@@ -24,14 +24,13 @@ class RemoteBinary:
         """
         :param name: name of the binary to be downloaded
         :type  name: str
-        :param remote_location: remote location where to download the binary from (only S3 for now)
+        :param remote_location: remote location where to download the binary from (s3:// or file://)
         :type  remote_location: str
         """
         self.name = name
 
-        # limit ourselves to S3 for now
-        if not remote_location.startswith("s3://"):
-            raise NotImplementedError("We currently only support S3")
+        if not remote_location.startswith(("s3://", "file://")):
+            raise NotImplementedError("We currently only support S3 and local files")
         self.remote_location = remote_location
         self.local_directory = self._compute_local_directory()
         self.local_location = self._compute_local_location()
@@ -68,7 +67,7 @@ class RemoteBinary:
 
     def _download_binary(self):
         logger.info(f"Downloading binary: {self.remote_location} -> {self.local_location}")
-        bucket, path = self.remote_location.replace("s3://", "", 1).split("/", 1)
+        bucket, path = split_url(self.remote_location)
         # with FileLock(dest):
         pull(bucket, path, self.local_location)
         # Executable file, +x is deliberate
@@ -1,18 +1,48 @@
 from __future__ import annotations
 
+import hashlib
+import lzma
 import os
+import zlib
+from base64 import b64decode, b64encode
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from sqlite3 import OperationalError
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 import lazy_object_proxy
 from diskcache import Cache
 
-from simpleflow import constants, logger, storage
+from simpleflow import constants, logger, settings, storage
 from simpleflow.settings import SIMPLEFLOW_ENABLE_DISK_CACHE
-from simpleflow.utils import json_dumps, json_loads_or_raw
+from simpleflow.utils import LRUCache, json_dumps, json_loads_or_raw
 
-JUMBO_FIELDS_MEMORY_CACHE: dict[str, str] = {}
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Jumbo fields are cached in memory by each process, then optionally on disk
+# for the whole host.
+JUMBO_FIELDS_MEMORY_CACHE = LRUCache(settings.SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_SIZE)
+JUMBO_FIELDS_DISK_CACHE_STATS: Counter[str] = Counter()
+_disk_cache: Cache | None = None
+
+
+def _reset_after_fork() -> None:
+    global _disk_cache
+    _disk_cache = None
+    JUMBO_FIELDS_DISK_CACHE_STATS.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+JUMBO_FIELDS_PREFIXES = (constants.JUMBO_FIELDS_PREFIX, constants.JUMBO_FIELDS_FILE_PREFIX)
+
+COMPRESSION_CODECS = {
+    "zlib": zlib,
+    "lzma": lzma,
+}
 
 
 class JumboTooLargeError(ValueError):
@@ -33,7 +63,7 @@ def _jumbo_fields_bucket() -> str | None:
 def decode(content: str | None, parse_json: bool = True, use_proxy: bool = True) -> Any:
     if content is None:
         return content
-    if content.startswith(constants.JUMBO_FIELDS_PREFIX):
+    if content.startswith(JUMBO_FIELDS_PREFIXES):
 
         def unwrap():
             location, _size = content.split()
@@ -46,24 +76,40 @@ def decode(content: str | None, parse_json: bool = True, use_proxy: bool = True)
             return lazy_object_proxy.Proxy(unwrap)
         return unwrap()
 
+    if content.startswith("simpleflow+"):
+        for codec, module in COMPRESSION_CODECS.items():
+            prefix = constants.COMPRESSED_FIELDS_PREFIX.format(codec=codec)
+            if content.startswith(prefix):
+                content = module.decompress(b64decode(content[len(prefix) :])).decode()
+                break
+
     if parse_json:
         return json_loads_or_raw(content)
 
     return content
 
 
-def encode(message: str | None, max_length: int, allow_jumbo_fields: bool = True) -> str | None:
+def encode(
+    message: str | None, max_length: int, allow_jumbo_fields: bool = True, allow_compression: bool = False
+) -> str | None:
     if not message:
         return message
 
     can_use_jumbo_fields = allow_jumbo_fields and _jumbo_fields_bucket()
 
     if len(message) > max_length:
+        # only for fields read with decode(): failure reasons or details are
+        # displayed as is
+        compressed = _compress_field(message, max_length) if allow_compression else None
+        if compressed:
+            return compressed
+
         if not can_use_jumbo_fields:
             _log_message_too_long(message)
             raise JumboTooLargeError(f"Message too long ({len(message)} chars)")
 
-        if len(message) > constants.JUMBO_FIELDS_MAX_SIZE:
+        # compressed jumbo fields are checked against the limit once compressed
+        if len(message) > constants.JUMBO_FIELDS_MAX_SIZE and not settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION:
             _log_message_too_long(message)
             raise JumboTooLargeError(f"Message too long even for a jumbo field ({len(message)} chars)")
 
@@ -78,25 +124,66 @@ def encode(message: str | None, max_length: int, allow_jumbo_fields: bool = True
     return message
 
 
+def _compress_field(message: str, max_length: int) -> str | None:
+    """
+    Compressed form of a message, if enabled and shorter than max_length.
+    """
+    codec = settings.SIMPLEFLOW_COMPRESSED_FIELDS
+    if not codec or len(message) > constants.JUMBO_FIELDS_MAX_SIZE:
+        return None
+    compressed = COMPRESSION_CODECS[codec].compress(message.encode())
+    content = constants.COMPRESSED_FIELDS_PREFIX.format(codec=codec) + b64encode(compressed).decode()
+    if len(content) > max_length:
+        return None
+    return content
+
+
+def _get_disk_cache() -> Cache:
+    # NB: cache objects do not survive forks, see DiskCache docs
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = Cache(
+            constants.CACHE_DIR,
+            size_limit=settings.SIMPLEFLOW_DISK_CACHE_SIZE_LIMIT,
+            eviction_policy="least-recently-used",
+        )
+    return _disk_cache
+
+
+def jumbo_fields_cache_stats() -> dict[str, int]:
+    """
+    Hits and misses of the jumbo fields caches in this process.
+    """
+    return {
+        "memory_hits": JUMBO_FIELDS_MEMORY_CACHE.hits,
+        "memory_misses": JUMBO_FIELDS_MEMORY_CACHE.misses,
+        "memory_size": JUMBO_FIELDS_MEMORY_CACHE.size,
+        "disk_hits": JUMBO_FIELDS_DISK_CACHE_STATS["hits"],
+        "disk_misses": JUMBO_FIELDS_DISK_CACHE_STATS["misses"],
+    }
+
+
 def _get_cached(path: str) -> str | None:
     # 1/ memory cache
-    if path in JUMBO_FIELDS_MEMORY_CACHE:
-        return JUMBO_FIELDS_MEMORY_CACHE[path]
+    content = JUMBO_FIELDS_MEMORY_CACHE.get(path)
+    if content is not None:
+        return content
 
     # 2/ disk cache
     if SIMPLEFLOW_ENABLE_DISK_CACHE:
         try:
             # NB: this cache may also be triggered on activity workers, where it's not that
             # useful. The performance hit should be minimal. To be improved later.
-            # NB2: cache has to be lazily instantiated here, cache objects do not survive forks,
-            # see DiskCache docs.
-            cache = Cache(constants.CACHE_DIR)
             # generate a dedicated cache key because this cache may be shared with other
             # features of simpleflow at some point
             cache_key = "jumbo_fields/" + path.split("/")[-1]
-            if cache_key in cache:
+            content = _get_disk_cache().get(cache_key)
+            if content is not None:
                 logger.debug(f"diskcache: getting key={cache_key} from cache_dir={constants.CACHE_DIR}")
-                return cache[cache_key]
+                JUMBO_FIELDS_DISK_CACHE_STATS["hits"] += 1
+                JUMBO_FIELDS_MEMORY_CACHE[path] = content
+                return content
+            JUMBO_FIELDS_DISK_CACHE_STATS["misses"] += 1
         except OperationalError:
             logger.warning("diskcache: got an OperationalError, skipping cache usage")
 
@@ -111,44 +198,101 @@ def _set_cached(path: str, content: str) -> None:
     # 2/ disk cache
     if SIMPLEFLOW_ENABLE_DISK_CACHE:
         try:
-            cache = Cache(constants.CACHE_DIR)
             cache_key = "jumbo_fields/" + path.split("/")[-1]
             logger.debug(f"diskcache: setting key={cache_key} on cache_dir={constants.CACHE_DIR}")
-            cache.set(cache_key, content, expire=3 * constants.HOUR)
+            _get_disk_cache().set(cache_key, content, expire=3 * constants.HOUR)
         except OperationalError:
             logger.warning("diskcache: got an OperationalError on write, skipping cache write")
 
 
 def _push_jumbo_field(message: str) -> str:
     size = len(message)
-    uuid = str(uuid4())
-    bucket_with_dir = _jumbo_fields_bucket()
-    if "/" in bucket_with_dir:
-        bucket, directory = _jumbo_fields_bucket().split("/", 1)
-        path = f"{directory}/{uuid}"
+    content_addressed = settings.SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED
+    if content_addressed:
+        key = hashlib.blake2b(message.encode(), digest_size=20).hexdigest()
     else:
-        bucket = bucket_with_dir
-        path = uuid
-
-    storage.push_content(bucket, path, message)
+        key = str(uuid4())
+    # "bucket[/directory]" for S3, or "file:///directory" for a local directory
+    url = _jumbo_fields_bucket()
+    if "://" not in url:
+        url = f"s3://{url}"
+    url = f"{url}/{key}"
+    bucket, path = storage.split_url(url)
+
+    # Content-addressed fields already in a cache of the host were stored before
+    if content_addressed and (_get_cached(path) is not None or storage.exists(bucket, path)):
+        logger.debug(f"jumbo field {path} already stored, skipping upload")
+    elif settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION:
+        content = storage.gzip_content(message)
+        if len(content) > constants.JUMBO_FIELDS_MAX_SIZE:
+            _log_message_too_long(message)
+            raise JumboTooLargeError(f"Message too long even for a compressed jumbo field ({len(content)} bytes)")
+        storage.push_content(bucket, path, content, content_encoding="gzip")
+    else:
+        storage.push_content(bucket, path, message)
     _set_cached(path, message)
 
-    return f"{constants.JUMBO_FIELDS_PREFIX}{bucket}/{path} {size}"
+    return f"simpleflow+{url} {size}"
+
+
+def _local_jumbo_field(url: str) -> tuple[str, str]:
+    """
+    Bucket and key of a `file://` jumbo field. Fields can come from anyone
+    able to start a workflow: only files of the configured jumbo fields
+    directory are read.
+    """
+    root = _jumbo_fields_bucket() or ""
+    if not root.startswith("file://"):
+        raise ValueError(f"cannot read jumbo field {url}: jumbo fields are not stored locally")
+    directory = os.path.normpath(root[len("file://") :])
+    file_path = os.path.normpath(url[len("file://") :])
+    if os.path.dirname(file_path) != directory:
+        raise ValueError(f"cannot read jumbo field {url}: not in {root}")
+    return root, os.path.basename(file_path)
 
 
 def _pull_jumbo_field(location: str) -> str:
-    bucket, path = location.replace(constants.JUMBO_FIELDS_PREFIX, "").split("/", 1)
+    url = location[len("simpleflow+") :]
+    bucket, path = storage.split_url(url)
+    key = path
+    if location.startswith(constants.JUMBO_FIELDS_FILE_PREFIX):
+        bucket, key = _local_jumbo_field(url)
 
     cached_value = _get_cached(path)
     if cached_value:
         return cached_value
 
-    content = storage.pull_content(bucket, path)
+    content = storage.pull_content(bucket, key)
     _set_cached(path, content)
 
     return content
 
 
+def prefetch_jumbo_fields(contents: Iterable[str | None]) -> None:
+    """
+    Download the jumbo fields found in `contents` into the cache, concurrently,
+    so that decoding them later doesn't wait on S3 one field after the other.
+    Errors are only logged: decoding will pull the field again and raise.
+    """
+    locations = {
+        content.split()[0]
+        for content in contents
+        if isinstance(content, str) and content.startswith(JUMBO_FIELDS_PREFIXES)
+    }
+    if not locations or not settings.SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS:
+        return
+
+    def prefetch(location: str) -> None:
+        try:
+            _pull_jumbo_field(location)
+        except Exception as err:
+            logger.warning(f"cannot prefetch jumbo field {location}: {err}")
+
+    logger.debug(f"prefetching {len(locations)} jumbo fields")
+    with ThreadPoolExecutor(min(len(locations), settings.SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS)) as executor:
+        list(executor.map(prefetch, locations))
+
+
 def _log_message_too_long(message):
     if len(message) > constants.MAX_LOG_FIELD:
         message = f"{message[: constants.MAX_LOG_FIELD]} <...truncated to {constants.MAX_LOG_FIELD} chars>"
@@ -176,7 +320,7 @@ def identity(message):
 
 
 def input(message):
-    return encode(json_dumps(message), constants.MAX_INPUT_LENGTH)
+    return encode(json_dumps(message), constants.MAX_INPUT_LENGTH, allow_compression=True)
 
 
 def reason(message):
@@ -184,8 +328,8 @@ def reason(message):
 
 
 def result(message):
-    return encode(json_dumps(message), constants.MAX_RESULT_LENGTH)
+    return encode(json_dumps(message), constants.MAX_RESULT_LENGTH, allow_compression=True)
 
 
 def control(message):
-    return encode(json_dumps(message), constants.MAX_CONTROL_LENGTH)
+    return encode(json_dumps(message), constants.MAX_CONTROL_LENGTH, allow_compression=True)
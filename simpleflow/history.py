@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import collections
-from typing import TYPE_CHECKING, Callable
+import itertools
+from typing import TYPE_CHECKING, Callable, Iterable
 
 import simpleflow.swf.mapper.models.history
-from simpleflow import logger
+from simpleflow import constants, logger
 from simpleflow.swf.mapper.models.event.task import ActivityTaskEventDict
 from simpleflow.swf.mapper.models.event.workflow import ExternalWorkflowExecutionEvent
 
@@ -21,6 +22,10 @@ if TYPE_CHECKING:
 class History:
     """
     History data.
+
+    Parsing is incremental: `parse()` only handles the events added since the
+    previous call, so a history can be fed page by page while it downloads
+    and queried at any point.
     """
 
     def __init__(self, history: simpleflow.swf.mapper.models.history.History) -> None:
@@ -39,6 +44,7 @@ class History:
         self.started_decision_id: int | None = None
         self.completed_decision_id: int | None = None
         self.last_event_id: int | None = None
+        self._parsed = 0
 
     @property
     def swf_history(self) -> simpleflow.swf.mapper.models.history.History:
@@ -233,10 +239,12 @@ class History:
                     "failed_timestamp": event.timestamp,
                 }
             )
-            if "retry" not in activity:
-                activity["retry"] = 0
-            else:
-                activity["retry"] += 1
+            # Tasks released by a worker at their concurrency limit didn't fail
+            if activity["reason"] != constants.CONCURRENCY_LIMIT_REASON:
+                if "retry" not in activity:
+                    activity["retry"] = 0
+                else:
+                    activity["retry"] += 1
         elif event.state == "cancelled":
             activity = get_activity()
             activity.update(
@@ -650,18 +658,29 @@ class History:
 
     def parse(self):
         """
-        Parse the events.
+        Parse the events not parsed yet.
         Update the corresponding statuses.
         """
 
         events = self.events
-        for event in events:
+        for event in itertools.islice(events, self._parsed, None):
             parser = self.TYPE_TO_PARSER.get(event.type)
             if parser:
                 parser(self, events, event)
+        self._parsed = len(events)
         if events:
             self.last_event_id = events[-1].id
 
+    def feed(self, data: Iterable[dict[str, Any]]) -> list[Event]:
+        """
+        Add events, following the ones already there, and parse them.
+        :param data: raw events, e.g. a page of a PollForDecisionTask response.
+        :return: the new events.
+        """
+        events = self._history.feed(data)
+        self.parse()
+        return events
+
     @staticmethod
     def get_event_id(event: dict[str, Any]) -> int | None:
         for event_id_key in (  # FIXME add a universal name?..
@@ -163,16 +163,15 @@ class MetrologyWorkflow(Workflow, ABC):
         """
         Fetch workflow history and merge it with metrology
         """
-        activity_keys = storage.list_keys(settings.METROLOGY_BUCKET, self.metrology_path)
+        activity_keys = storage.iter_keys(settings.METROLOGY_BUCKET, os.path.join(self.metrology_path, "activity."))
         history_dumped = dump_history_to_json(history)
         history = json.loads(history_dumped)
 
-        for key in activity_keys:
-            if not key.key.startswith(os.path.join(self.metrology_path, "activity.")):
-                continue
-            contents = key.get()["Body"].read().decode("utf-8")
-            result = json.loads(contents)
-            search = ACTIVITY_KEY_RE.search(key.key)
+        for pulled in storage.pull_many(settings.METROLOGY_BUCKET, (key.key for key in activity_keys)):
+            if pulled.error:
+                raise pulled.error
+            result = json.loads(pulled.value)
+            search = ACTIVITY_KEY_RE.search(pulled.path)
             name = search.group(1)
             for h in history:
                 if h[0] == name:
@@ -1,2 +1,4 @@
 from ._named_mixin import NamedMixin, with_state  # NOQA
-from ._supervisor import Supervisor, reset_signal_handlers  # NOQA
+from ._rate_limiter import HostRateLimiter  # NOQA
+from ._semaphore import FileSemaphore  # NOQA
+from ._supervisor import Supervisor, record_task_processed, reset_signal_handlers  # NOQA
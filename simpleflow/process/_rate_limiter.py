@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+import weakref
+
+from simpleflow import logger
+
+# State of the bucket: rate (tokens per second), tokens, last refill time,
+# last decrease time (wall clock: the file outlives reboots and containers)
+_STATE = struct.Struct("dddd")
+
+_LIMITERS: weakref.WeakSet[HostRateLimiter] = weakref.WeakSet()
+
+
+def _reset_locks_after_fork() -> None:
+    # a thread of the parent process may have held them
+    for limiter in list(_LIMITERS):
+        limiter._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+class HostRateLimiter:
+    """
+    Token bucket shared by all processes of a host, stored in a `flock()`-ed,
+    memory-mapped file. Its rate adapts to the throttling of the server (AIMD):
+    it is halved when a request is throttled (at most once per `cooldown`
+    seconds, so a burst of throttles counts once), then grows by one request
+    per second every second without throttling, up to `max_rate`.
+
+    Callers don't burst when tokens are missing: each one reserves the next
+    token and waits until it is due, so the requests of the host are spread
+    evenly at the current rate.
+
+    NB: timestamps are read from the wall clock, as the file may outlive the
+    monotonic clock (reboot with a persistent /tmp, volume shared with a new
+    container). If the clock goes backwards, the bucket is reset.
+
+    The threads of a process share the file, hence its `flock()`: they are
+    serialized by a lock of their own.
+    """
+
+    def __init__(self, path: str, max_rate: float, min_rate: float = 1.0, cooldown: float = 1.0) -> None:
+        if not 0 < min_rate <= max_rate:
+            raise ValueError(f"invalid rates: min_rate={min_rate}, max_rate={max_rate}")
+        self.path = path
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.cooldown = cooldown
+        self._fd: int | None = None
+        self._mmap: mmap.mmap | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+        _LIMITERS.add(self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(path={self.path}, max_rate={self.max_rate})"
+
+    def _open(self) -> None:
+        # NB: called with self._lock held
+        # flock() locks belong to the open file, which forked processes share
+        if self._pid == os.getpid():
+            return
+        if self._fd is not None:
+            # inherited from the parent process, whose lock isn't released
+            self._mmap.close()
+            os.close(self._fd)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < _STATE.size:
+                os.write(fd, _STATE.pack(self.max_rate, self.max_rate, time.time(), 0.0))
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd = fd
+        self._mmap = mmap.mmap(fd, _STATE.size)
+        self._pid = os.getpid()
+
+    @contextlib.contextmanager
+    def _state(self):
+        with self._lock:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                state = list(_STATE.unpack_from(self._mmap))
+                yield state
+                _STATE.pack_into(self._mmap, 0, *state)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @property
+    def rate(self) -> float:
+        with self._lock:
+            self._open()
+            return _STATE.unpack_from(self._mmap)[0]
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting until it is available. Returns the time waited.
+        """
+        with self._state() as state:
+            # under the lock: other processes may have refilled the bucket since
+            now = time.time()
+            rate, tokens, refilled_at, _ = state
+            elapsed = now - refilled_at
+            if elapsed < 0:
+                # the clock went backwards
+                tokens = rate
+            # at most one second of burst
+            tokens = min(rate, tokens + max(elapsed, 0.0) * rate) - 1
+            state[1], state[2] = tokens, now
+        if tokens >= 0:
+            return 0.0
+        wait = -tokens / rate
+        logger.debug(f"rate limiter {self.path}: waiting {wait:.3f}s")
+        time.sleep(wait)
+        return wait
+
+    def throttled(self) -> None:
+        with self._state() as state:
+            now = time.time()
+            if 0 <= now - state[3] < self.cooldown:
+                return
+            state[0] = max(self.min_rate, state[0] / 2)
+            # the tokens left were computed at the old rate
+            state[1] = min(state[1], 0.0)
+            state[3] = now
+            logger.info(f"rate limiter {self.path}: throttled, rate decreased to {state[0]:.1f}/s")
+
+    def succeeded(self) -> None:
+        if self.rate >= self.max_rate:
+            # nothing to do: don't take the lock
+            return
+        with self._state() as state:
+            state[0] = min(self.max_rate, state[0] + 1 / state[0])
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import fcntl
+import os
+
+
+class FileSemaphore:
+    """
+    Counting semaphore shared by all processes of a host, implemented with
+    `flock()`-ed slot files in a directory. Unlike a shared memory counter,
+    the kernel releases the slots of a process that dies without cleaning up.
+
+    Acquiring never blocks: `try_acquire()` returns None when all slots are
+    taken, so callers can go do something else.
+
+    NB: slots are held by file descriptors, so processes forked while holding a
+    slot keep it until they exit too.
+    """
+
+    def __init__(self, directory: str, value: int) -> None:
+        if value < 1:
+            raise ValueError(f"semaphore value must be positive, got {value}")
+        self.directory = directory
+        self.value = value
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(directory={self.directory}, value={self.value})"
+
+    def try_acquire(self) -> int | None:
+        """
+        Take a free slot. Returns a token to pass to `release()`, or None if
+        there is no free slot.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        for slot in range(self.value):
+            path = os.path.join(self.directory, f"slot-{slot}.lock")
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    @staticmethod
+    def release(token: int) -> None:
+        try:
+            fcntl.flock(token, fcntl.LOCK_UN)
+        finally:
+            os.close(token)
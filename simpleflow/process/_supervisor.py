@@ -13,6 +13,10 @@ from simpleflow import logger
 
 from ._named_mixin import NamedMixin, with_state
 
+# Shared counter of tasks processed by the current worker process, set by the
+# Supervisor when it starts a child. Stays None outside of a supervised child.
+_tasks_counter = None
+
 
 def reset_signal_handlers(func):
     """
@@ -31,6 +35,17 @@ def reset_signal_handlers(func):
     return wrapped
 
 
+def record_task_processed():
+    """
+    Report to the supervisor (if any) that the current worker process finished
+    a task. This is used to recycle children after `max_tasks_per_child` tasks.
+    """
+    if _tasks_counter is None:
+        return
+    with _tasks_counter.get_lock():
+        _tasks_counter.value += 1
+
+
 def _void_handle_sigchld(signum, frame):
     """
     Default action for a SIGCHLD signal handling is to ignore it
@@ -66,6 +81,8 @@ class Supervisor(NamedMixin):
         arguments: tuple | list | None = None,
         nb_children: int | None = None,
         background: bool = False,
+        max_tasks_per_child: int | None = None,
+        max_rss_per_child: int | None = None,
     ) -> None:
         """
         Initializes a Manager() instance, with a payload (a callable that will be
@@ -74,6 +91,8 @@ class Supervisor(NamedMixin):
         of workers, which defaults to the number of CPU cores if not passed).
 
         background: whether the supervisor process should launch in background
+        max_tasks_per_child: number of tasks after which a worker is drained and replaced
+        max_rss_per_child: resident memory (in MB) above which a worker is drained and replaced
         """
         # NB: below, compare explicitly to "None" there because nb_children could be 0
         if nb_children is None:
@@ -85,8 +104,12 @@ class Supervisor(NamedMixin):
         self._named_mixin_properties = ["_payload_friendly_name", "_nb_children"]
         self._args = arguments if arguments is not None else ()
         self._background = background
+        self._max_tasks_per_child = max_tasks_per_child
+        self._max_rss_per_child = max_rss_per_child
 
         self._processes = {}
+        self._tasks_counters = {}
+        self._draining = set()
         self._terminating = False
 
         super().__init__()
@@ -123,6 +146,46 @@ class Supervisor(NamedMixin):
         # cleanup our internal state (self._processes)
         for pid in to_remove:
             del self._processes[pid]
+            self._tasks_counters.pop(pid, None)
+            self._draining.discard(pid)
+
+    def _should_recycle(self, pid: int) -> str | None:
+        """
+        Returns the reason why a worker process should be replaced, if any.
+        """
+        if self._max_tasks_per_child:
+            nb_tasks = self._tasks_counters[pid].value
+            if nb_tasks >= self._max_tasks_per_child:
+                return f"processed {nb_tasks} tasks"
+        if self._max_rss_per_child:
+            try:
+                rss = self._processes[pid].memory_info().rss
+            except psutil.NoSuchProcess:
+                return None
+            if rss > self._max_rss_per_child * 1024**2:
+                return f"uses {rss // 1024 ** 2}MB of memory"
+        return None
+
+    def _recycle_worker_processes(self):
+        """
+        Gracefully stop worker processes that reached their tasks or memory limit.
+        They finish their current task then exit, and are replaced as soon as they
+        are marked as draining.
+        """
+        if self._terminating:
+            return
+        for pid, child in self._processes.items():
+            if pid in self._draining:
+                continue
+            reason = self._should_recycle(pid)
+            if not reason:
+                continue
+            logger.info(f"process: recycling pid={pid} because it {reason}")
+            self._draining.add(pid)
+            try:
+                child.terminate()
+            except psutil.NoSuchProcess:
+                pass
 
     def _start_worker_processes(self):
         """
@@ -131,8 +194,10 @@ class Supervisor(NamedMixin):
         """
         if self._terminating:
             return
-        for _ in range(len(self._processes), self._nb_children):
-            child = multiprocess.Process(target=reset_signal_handlers(self._payload), args=self._args)
+        # draining processes will exit soon, so they don't count
+        for _ in range(len(self._processes) - len(self._draining), self._nb_children):
+            tasks_counter = multiprocess.Value("i", 0)
+            child = multiprocess.Process(target=self._run_child, args=(tasks_counter,))
             child.start()
 
             # One might wonder if `child.pid` is guaranteed to be set at this
@@ -144,6 +209,15 @@ class Supervisor(NamedMixin):
             if not pid:
                 raise AssertionError(f"Cannot add process with pid={pid}: {child}")
             self._processes[pid] = psutil.Process(pid)
+            self._tasks_counters[pid] = tasks_counter
+
+    def _run_child(self, tasks_counter):
+        """
+        Worker process entrypoint: expose the tasks counter to the payload, then run it.
+        """
+        global _tasks_counter
+        _tasks_counter = tasks_counter
+        return reset_signal_handlers(self._payload)(*self._args)
 
     def target(self):
         """
@@ -169,6 +243,7 @@ class Supervisor(NamedMixin):
 
             # start worker processes
             self._cleanup_worker_processes()
+            self._recycle_worker_processes()
             self._start_worker_processes()
 
             # re-evaluate state at least every 5 seconds ; if a SIGCHLD happens during
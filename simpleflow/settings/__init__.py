@@ -46,8 +46,13 @@ ACTIVITY_SCHEDULE_TO_CLOSE_TIMEOUT: str
 ACTIVITY_SCHEDULE_TO_START_TIMEOUT: str
 ACTIVITY_HEARTBEAT_TIMEOUT: str
 
+SIMPLEFLOW_FAST_JSON: bool
+
 SIMPLEFLOW_S3_HOST: str
 SIMPLEFLOW_S3_SSE: bool
+SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS: int
+SIMPLEFLOW_STORAGE_MAX_WORKERS: int
+SIMPLEFLOW_STORAGE_RETRIES: int
 
 STEP_BUCKET: str
 
@@ -58,10 +63,29 @@ LOGGING: dict[str, Any]
 SIMPLEFLOW_SYSLOG_TARGET: str | None
 
 SIMPLEFLOW_ENABLE_DISK_CACHE: bool
+SIMPLEFLOW_DISK_CACHE_SIZE_LIMIT: int
+SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_SIZE: int
+SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS: int
+SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED: bool
+SIMPLEFLOW_COMPRESSED_FIELDS: str | None
+SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION: bool
 SIMPLEFLOW_BINARIES_DIRECTORY: str
+SIMPLEFLOW_HISTORY_CACHE: bool
+SIMPLEFLOW_HISTORY_CACHE_SIZE_LIMIT: int
+SIMPLEFLOW_REGISTRATION_CACHE: bool
+SIMPLEFLOW_REGISTRATION_CACHE_TTL: int
+SIMPLEFLOW_REGISTRATION_CACHE_ON_DISK: bool
+
+# Decider management
+
+DECIDER_REGISTER_TYPES_WORKERS: int
 
 # Activity management
 
 # Amount of time to wait for process spawned by an activity poller to wait in
 # response to a SIGTERM.
 ACTIVITY_SIGTERM_WAIT_SEC: int
+
+# Delay before rescheduling an activity task released by a worker because the
+# activity reached its concurrency limit on the worker host.
+ACTIVITY_CONCURRENCY_LIMIT_RETRY_DELAY: int
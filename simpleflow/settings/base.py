@@ -72,8 +72,13 @@ ACTIVITY_HEARTBEAT_TIMEOUT = str
 LOGGING = dict
 SIMPLEFLOW_SYSLOG_TARGET = str_or_none
 
+SIMPLEFLOW_FAST_JSON = bool
+
 SIMPLEFLOW_S3_HOST = str
 SIMPLEFLOW_S3_SSE = bool
+SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS = int
+SIMPLEFLOW_STORAGE_MAX_WORKERS = int
+SIMPLEFLOW_STORAGE_RETRIES = int
 
 STEP_BUCKET = str
 
@@ -81,6 +86,20 @@ METROLOGY_BUCKET = str
 METROLOGY_PATH_PREFIX = str_or_none
 
 SIMPLEFLOW_ENABLE_DISK_CACHE = bool
+SIMPLEFLOW_DISK_CACHE_SIZE_LIMIT = int
+SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_SIZE = int
+SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS = int
+SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED = bool
+SIMPLEFLOW_COMPRESSED_FIELDS = str_or_none
+SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION = bool
 SIMPLEFLOW_BINARIES_DIRECTORY = str
+SIMPLEFLOW_HISTORY_CACHE = bool
+SIMPLEFLOW_HISTORY_CACHE_SIZE_LIMIT = int
+SIMPLEFLOW_REGISTRATION_CACHE = bool
+SIMPLEFLOW_REGISTRATION_CACHE_TTL = int
+SIMPLEFLOW_REGISTRATION_CACHE_ON_DISK = bool
+
+DECIDER_REGISTER_TYPES_WORKERS = int
 
 ACTIVITY_SIGTERM_WAIT_SEC = float
+ACTIVITY_CONCURRENCY_LIMIT_RETRY_DELAY = int
@@ -16,8 +16,16 @@ ACTIVITY_SCHEDULE_TO_CLOSE_TIMEOUT = ACTIVITY_DEFAULT_TIMEOUT
 ACTIVITY_SCHEDULE_TO_START_TIMEOUT = ACTIVITY_DEFAULT_TIMEOUT
 ACTIVITY_HEARTBEAT_TIMEOUT = ACTIVITY_DEFAULT_TIMEOUT
 
+# Use orjson, when installed, to speed up simpleflow.utils.json_dumps() and json_loads_or_raw()
+SIMPLEFLOW_FAST_JSON = True
+
 SIMPLEFLOW_S3_HOST = "s3.amazonaws.com"
 SIMPLEFLOW_S3_SSE = False
+SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS = 32
+# Bulk operations of simpleflow.storage (pull_many(), push_many(), ...)
+SIMPLEFLOW_STORAGE_MAX_WORKERS = 16
+# Retries of the storage calls, on throttling, server and connection errors
+SIMPLEFLOW_STORAGE_RETRIES = 3
 
 STEP_BUCKET = "step_bucket"
 
@@ -54,10 +62,41 @@ LOGGING = {
 SIMPLEFLOW_SYSLOG_TARGET = None
 
 SIMPLEFLOW_ENABLE_DISK_CACHE = False
+SIMPLEFLOW_DISK_CACHE_SIZE_LIMIT = 1024**3  # 1GB
+# Size of the jumbo fields kept in memory by each process, in bytes
+SIMPLEFLOW_JUMBO_FIELDS_MEMORY_CACHE_SIZE = 64 * 1024**2  # 64MB
+# Number of threads downloading the jumbo fields of a history before replaying it
+SIMPLEFLOW_JUMBO_FIELDS_PREFETCH_WORKERS = 16
+# Store jumbo fields under a hash of their content, so identical ones are uploaded once
+SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED = False
+# Codec ("zlib" or "lzma") used to store fields too long for SWF compressed
+# inline when they fit, before resorting to jumbo fields; disabled if empty
+SIMPLEFLOW_COMPRESSED_FIELDS = None
+# Store jumbo fields gzip-compressed; JUMBO_FIELDS_MAX_SIZE then applies to the compressed size
+SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION = False
 SIMPLEFLOW_BINARIES_DIRECTORY = "/tmp/simpleflow-binaries"  # nosec
+# Cache the histories of closed workflow executions on disk, for the whole host
+SIMPLEFLOW_HISTORY_CACHE = True
+SIMPLEFLOW_HISTORY_CACHE_SIZE_LIMIT = 256 * 1024**2  # 256MB
+# Remember the registered activity and workflow types on disk, for the whole host
+SIMPLEFLOW_REGISTRATION_CACHE = True
+# Keep the descriptions of domains and types for this many seconds (0 to disable),
+# in each process and optionally on disk, for the whole host
+SIMPLEFLOW_REGISTRATION_CACHE_TTL = 300
+SIMPLEFLOW_REGISTRATION_CACHE_ON_DISK = False
+
+# Decider management
+
+# Threads registering the activity and workflow types used by the workflows
+# when a decider starts (0 to only register them when scheduling fails)
+DECIDER_REGISTER_TYPES_WORKERS = 8
 
 # Activity management
 
 # Amount of time to wait for process spawned by an activity poller to wait in
 # response to a SIGTERM.
 ACTIVITY_SIGTERM_WAIT_SEC = 3
+
+# Delay before rescheduling an activity task released by a worker because the
+# activity reached its concurrency limit on the worker host.
+ACTIVITY_CONCURRENCY_LIMIT_RETRY_DELAY = 30
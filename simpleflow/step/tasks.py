@@ -24,10 +24,7 @@ class GetStepsDoneTask:
         self.path_len = len(path) + (1 if not path.endswith("/") else 0)
 
     def execute(self) -> list[str]:
-        steps: list[str] = []
-        for f in storage.list_keys(self.bucket, self.path):
-            steps.append(f.key[self.path_len :])
-        return steps
+        return [f.key[self.path_len :] for f in storage.iter_keys(self.bucket, self.path)]
 
 
 class MarkStepDoneTask:
@@ -1,34 +1,112 @@
 from __future__ import annotations
 
+import abc
+import codecs
+import contextlib
 import io
-from typing import TYPE_CHECKING
+import itertools
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, BinaryIO
 
+import attr
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from . import logger, settings
-from .swf.mapper.exceptions import extract_error_code
+from .swf.mapper.exceptions import extract_error_code, is_retryable_error
+from .utils import retry
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
     from typing import Optional, Tuple  # NOQA
 
     from mypy_boto3_s3.service_resource import Bucket, ObjectSummary  # NOQA
 
-BUCKET_CACHE = {}
 BUCKET_LOCATIONS_CACHE = {}
 
+# Size of the chunks streamed through codecs
+CHUNK_SIZE = 1024**2
+GZIP_MAGIC = b"\x1f\x8b"
 
-def get_client() -> boto3.session.Session.client:
-    return boto3.session.Session().client("s3")
+# Sessions and clients are expensive to build (credentials lookup, new
+# connection pool, TLS handshakes): they are shared by the threads of a
+# process. Resources (and their buckets) are not thread-safe: each thread
+# builds its own. Connections can't be shared with forked processes, which
+# build their own.
+_session = None
+_CLIENTS = {}
+_local = threading.local()
+_lock = threading.Lock()
 
 
-def get_resource(host_or_region: str) -> boto3.session.Session.resource:
+def _reset_after_fork() -> None:
+    global _local, _lock, _session
+    _local = threading.local()
+    _lock = threading.Lock()
+    _session = None
+    _CLIENTS.clear()
+
+
+def _thread_cache(name: str) -> dict:
+    return _local.__dict__.setdefault(name, {})
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_session() -> boto3.session.Session:
+    # boto3 sessions are not thread-safe: only use it under the lock
+    global _session
+    if _session is None:
+        _session = boto3.session.Session()
+    return _session
+
+
+def _get_config() -> Config:
+    return Config(max_pool_connections=settings.SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS, tcp_keepalive=True)
+
+
+def _location_kwargs(host_or_region: str | None) -> dict[str, str]:
+    if not host_or_region:
+        return {}
     # first case: we got a valid DNS (host)
     if "." in host_or_region:
-        return boto3.resource("s3", endpoint_url=f"https://{host_or_region}")
-
+        return {"endpoint_url": f"https://{host_or_region}"}
     # second case: we got a region
-    return boto3.resource("s3", region_name=host_or_region)
+    return {"region_name": host_or_region}
+
+
+def get_client(host_or_region: str | None = None) -> boto3.session.Session.client:
+    """
+    S3 client of a host or region (default: the one of the environment),
+    shared by the threads of the process.
+    """
+    with _lock:
+        if host_or_region not in _CLIENTS:
+            _CLIENTS[host_or_region] = _get_session().client(
+                "s3", config=_get_config(), **_location_kwargs(host_or_region)
+            )
+        return _CLIENTS[host_or_region]
+
+
+def get_resource(host_or_region: str) -> boto3.session.Session.resource:
+    """
+    S3 resource of a host or region, for the current thread.
+    """
+    resources = _thread_cache("resources")
+    if host_or_region not in resources:
+        with _lock:
+            resources[host_or_region] = _get_session().resource(
+                "s3", config=_get_config(), **_location_kwargs(host_or_region)
+            )
+    return resources[host_or_region]
 
 
 def sanitize_bucket_and_host(bucket: str) -> tuple[str, str]:
@@ -77,46 +155,430 @@ def sanitize_bucket_and_host(bucket: str) -> tuple[str, str]:
 
 
 def get_bucket(bucket_name: str) -> "Bucket":
+    """
+    Bucket resource, for the current thread.
+    """
     bucket_name, location = sanitize_bucket_and_host(bucket_name)
-    s3 = get_resource(location)
-    if bucket_name not in BUCKET_CACHE:
-        bucket = s3.Bucket(bucket_name)
-        BUCKET_CACHE[bucket_name] = bucket
-    return BUCKET_CACHE[bucket_name]
+    buckets = _thread_cache("buckets")
+    if bucket_name not in buckets:
+        buckets[bucket_name] = get_resource(location).Bucket(bucket_name)
+    return buckets[bucket_name]
+
+
+class StorageBackend(abc.ABC):
+    """
+    Storage of objects under paths, in a bucket or a directory.
+    """
+
+    @abc.abstractmethod
+    def pull(self, path: str, dest_file: str) -> None:
+        """Download an object to a file."""
+
+    @abc.abstractmethod
+    def pull_stream(self, path: str) -> BinaryIO:
+        """Readable stream of the stored bytes of an object (not decompressed)."""
+
+    @abc.abstractmethod
+    def pull_content(self, path: str) -> str:
+        """
+        Download and decode an object, decompressing it on the fly if it was
+        stored gzip-encoded.
+        """
+
+    @abc.abstractmethod
+    def push(self, path: str, src_file: str, content_type: str | None = None) -> None:
+        """Upload a file."""
+
+    @abc.abstractmethod
+    def push_stream(
+        self, path: str, stream: BinaryIO, content_type: str | None = None, content_encoding: str | None = None
+    ) -> None:
+        """Upload the content of a readable stream."""
+
+    def push_content(
+        self, path: str, content: str | bytes, content_type: str | None = None, content_encoding: str | None = None
+    ) -> None:
+        """
+        Upload a string, or bytes already encoded with `content_encoding` (see `gzip_content()`).
+        """
+        if isinstance(content, str):
+            content = content.encode()
+        self.push_stream(path, io.BytesIO(content), content_type=content_type, content_encoding=content_encoding)
+
+    @abc.abstractmethod
+    def exists(self, path: str) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, path: str) -> None:
+        """Delete an object; deleting a missing object is not an error."""
+
+    @abc.abstractmethod
+    def iter_keys(self, path: str | None = None) -> Iterator:
+        """
+        Objects whose path starts with `path`; they have a `key` attribute.
+        They are fetched lazily, page by page.
+        """
+
+    def list_keys(self, path: str | None = None) -> list:
+        return list(self.iter_keys(path))
+
+
+class S3Backend(StorageBackend):
+    def __init__(self, bucket: str) -> None:
+        self.bucket = bucket
+
+    def _client(self) -> tuple[str, boto3.session.Session.client]:
+        # clients are thread-safe, unlike resources
+        bucket_name, location = sanitize_bucket_and_host(self.bucket)
+        return bucket_name, get_client(location)
+
+    def pull(self, path: str, dest_file: str) -> None:
+        bucket_name, client = self._client()
+        client.download_file(bucket_name, path, dest_file)
+
+    def pull_stream(self, path: str) -> BinaryIO:
+        bucket_name, client = self._client()
+        return client.get_object(Bucket=bucket_name, Key=path)["Body"]
+
+    def pull_content(self, path: str) -> str:
+        bucket_name, client = self._client()
+        response = client.get_object(Bucket=bucket_name, Key=path)
+        return _decode_stream(response["Body"], response.get("ContentEncoding") == "gzip")
+
+    def push(self, path: str, src_file: str, content_type: str | None = None) -> None:
+        bucket_name, client = self._client()
+        client.upload_file(src_file, bucket_name, path, ExtraArgs=self._extra_args(content_type))
+
+    def push_stream(
+        self, path: str, stream: BinaryIO, content_type: str | None = None, content_encoding: str | None = None
+    ) -> None:
+        bucket_name, client = self._client()
+        client.upload_fileobj(stream, bucket_name, path, ExtraArgs=self._extra_args(content_type, content_encoding))
+
+    def exists(self, path: str) -> bool:
+        bucket_name, client = self._client()
+        try:
+            client.head_object(Bucket=bucket_name, Key=path)
+        except ClientError as e:
+            if extract_error_code(e) in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
+
+    def delete(self, path: str) -> None:
+        bucket_name, client = self._client()
+        client.delete_object(Bucket=bucket_name, Key=path)
+
+    def iter_keys(self, path: str | None = None) -> Iterator[ObjectSummary]:
+        return iter(get_bucket(self.bucket).objects.filter(Prefix=path or ""))
+
+    @staticmethod
+    def _extra_args(content_type: str | None = None, content_encoding: str | None = None) -> dict[str, str]:
+        extra_args = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if content_encoding:
+            extra_args["ContentEncoding"] = content_encoding
+        if settings.SIMPLEFLOW_S3_SSE:
+            extra_args["ServerSideEncryption"] = "AES256"
+        return extra_args
+
+
+@attr.s
+class LocalObjectSummary:
+    key: str = attr.ib()
+    size: int = attr.ib()
+
+
+class LocalBackend(StorageBackend):
+    """
+    Objects stored as files under a directory, e.g. on a local disk or an NFS
+    mount. Writes go to a temporary file renamed into place, so readers never
+    see partial objects. Gzip-encoded objects are recognized by their magic
+    number, which can't start UTF-8 text.
+    """
+
+    TMP_PREFIX = ".tmp-"
+
+    def __init__(self, root: str) -> None:
+        self.root = root or "/"
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(root={self.root})"
+
+    def _path(self, path: str) -> str:
+        full_path = os.path.normpath(os.path.join(self.root, path))
+        if os.path.relpath(full_path, self.root).startswith(".."):
+            raise ValueError(f"path {path} is outside of {self.root}")
+        return full_path
+
+    def pull(self, path: str, dest_file: str) -> None:
+        shutil.copyfile(self._path(path), dest_file)
+
+    def pull_stream(self, path: str) -> BinaryIO:
+        return open(self._path(path), "rb")
+
+    def pull_content(self, path: str) -> str:
+        with open(self._path(path), "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                if content[:2] == GZIP_MAGIC:
+                    return zlib.decompress(content, wbits=31).decode()
+                return str(content, "utf-8")
+
+    def push(self, path: str, src_file: str, content_type: str | None = None) -> None:
+        with open(src_file, "rb") as f:
+            self.push_stream(path, f)
+
+    def push_stream(
+        self, path: str, stream: BinaryIO, content_type: str | None = None, content_encoding: str | None = None
+    ) -> None:
+        full_path = self._path(path)
+        directory, name = os.path.split(full_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{self.TMP_PREFIX}{name}-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(stream, f, CHUNK_SIZE)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def exists(self, path: str) -> bool:
+        return os.path.isfile(self._path(path))
+
+    def delete(self, path: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._path(path))
+
+    def iter_keys(self, path: str | None = None) -> Iterator[LocalObjectSummary]:
+        prefix = path or ""
+        # like S3, prefixes are not necessarily directories
+        start = self._path(os.path.dirname(prefix))
+        for dirpath, dirnames, filenames in os.walk(start):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.startswith(self.TMP_PREFIX):
+                    continue
+                full_path = os.path.join(dirpath, filename)
+                key = os.path.relpath(full_path, self.root)
+                if key.startswith(prefix):
+                    yield LocalObjectSummary(key, os.path.getsize(full_path))
+
+    def list_keys(self, path: str | None = None) -> list[LocalObjectSummary]:
+        # S3 lists keys in lexicographic order, not directory by directory
+        return sorted(self.iter_keys(path), key=lambda obj: obj.key)
+
+
+# Storage backends by URL scheme; bucket names without a scheme are S3 buckets
+BACKENDS: dict[str, type[StorageBackend]] = {
+    "s3": S3Backend,
+    "file": LocalBackend,
+}
+
+
+def get_backend(bucket: str) -> StorageBackend:
+    """
+    Storage backend of a bucket: `bucket_name`, `s3://bucket_name` or `file:///directory`.
+    """
+    scheme, sep, location = bucket.partition("://")
+    if not sep:
+        return S3Backend(bucket)
+    if scheme not in BACKENDS:
+        raise ValueError(f"unsupported storage scheme {scheme!r} in {bucket}")
+    return BACKENDS[scheme](location)
+
+
+def split_url(url: str) -> tuple[str, str]:
+    """
+    Split a URL into a bucket for `get_backend()` and a path.
+
+    >>> split_url("s3://bucket/path/to/key")
+    ('bucket', 'path/to/key')
+    >>> split_url("file:///path/to/file")
+    ('file:///', 'path/to/file')
+    """
+    scheme, _, location = url.partition("://")
+    if scheme == "file":
+        return "file:///", location.lstrip("/")
+    bucket, _, path = location.partition("/")
+    return bucket, path
+
+
+def _decode_stream(stream: BinaryIO, gzipped: bool) -> str:
+    decompressor = zlib.decompressobj(wbits=31) if gzipped else None
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    with contextlib.closing(stream):
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            if decompressor:
+                chunk = decompressor.decompress(chunk)
+            parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(decompressor.flush() if decompressor else b"", final=True))
+    return "".join(parts)
+
+
+def gzip_content(content: str) -> bytes:
+    """
+    Gzip a string chunk by chunk, without a full uncompressed copy in memory.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    chunks = [compressor.compress(content[i : i + CHUNK_SIZE].encode()) for i in range(0, len(content), CHUNK_SIZE)]
+    chunks.append(compressor.flush())
+    return b"".join(chunks)
+
+
+def _retry_policy(retries: int | None = None) -> retry.RetryPolicy:
+    retries = settings.SIMPLEFLOW_STORAGE_RETRIES if retries is None else retries
+    return retry.RetryPolicy(max_attempts=retries + 1, is_retryable=is_retryable_error)
 
 
 def pull(bucket: str, path: str, dest_file: str) -> None:
-    bucket_resource = get_bucket(bucket)
-    bucket_resource.download_file(path, dest_file)
+    _retry_policy().call(get_backend(bucket).pull, path, dest_file)
 
 
 def pull_content(bucket: str, path: str) -> str:
-    bucket_resource = get_bucket(bucket)
-    bytes_buffer = io.BytesIO()
-    bucket_resource.download_fileobj(path, bytes_buffer)
-    return bytes_buffer.getvalue().decode()
+    return _retry_policy().call(get_backend(bucket).pull_content, path)
+
+
+def pull_stream(bucket: str, path: str) -> BinaryIO:
+    return _retry_policy().call(get_backend(bucket).pull_stream, path)
 
 
 def push(bucket: str, path: str, src_file: str, content_type: str | None = None) -> None:
-    bucket_resource = get_bucket(bucket)
-    extra_args = {}
-    if content_type:
-        extra_args["ContentType"] = content_type
-    if settings.SIMPLEFLOW_S3_SSE:
-        extra_args["ServerSideEncryption"] = "AES256"
-    bucket_resource.upload_file(src_file, path, ExtraArgs=extra_args)
-
-
-def push_content(bucket: str, path: str, content: str, content_type: str | None = None) -> None:
-    bucket_resource = get_bucket(bucket)
-    extra_args = {}
-    if content_type:
-        extra_args["ContentType"] = content_type
-    if settings.SIMPLEFLOW_S3_SSE:
-        extra_args["ServerSideEncryption"] = "AES256"
-    bucket_resource.upload_fileobj(io.BytesIO(content.encode()), path, ExtraArgs=extra_args)
-
-
-def list_keys(bucket: str, path: str = None) -> list["ObjectSummary"]:
-    bucket_resource = get_bucket(bucket)
-    return [obj for obj in bucket_resource.objects.filter(Prefix=path or "").all()]
+    _retry_policy().call(get_backend(bucket).push, path, src_file, content_type=content_type)
+
+
+def push_content(
+    bucket: str,
+    path: str,
+    content: str | bytes,
+    content_type: str | None = None,
+    content_encoding: str | None = None,
+) -> None:
+    _retry_policy().call(
+        get_backend(bucket).push_content,
+        path,
+        content,
+        content_type=content_type,
+        content_encoding=content_encoding,
+    )
+
+
+def push_stream(
+    bucket: str,
+    path: str,
+    stream: BinaryIO,
+    content_type: str | None = None,
+    content_encoding: str | None = None,
+) -> None:
+    # not retried: the stream can't be read again
+    get_backend(bucket).push_stream(path, stream, content_type=content_type, content_encoding=content_encoding)
+
+
+def exists(bucket: str, path: str) -> bool:
+    return _retry_policy().call(get_backend(bucket).exists, path)
+
+
+def list_keys(bucket: str, path: str | None = None) -> list:
+    return get_backend(bucket).list_keys(path)
+
+
+def iter_keys(bucket: str, path: str | None = None) -> Iterator:
+    return get_backend(bucket).iter_keys(path)
+
+
+def delete(bucket: str, path: str) -> None:
+    _retry_policy().call(get_backend(bucket).delete, path)
+
+
+@attr.s
+class BulkResult:
+    """
+    Outcome of one operation of `pull_many()`, `push_many()` or `delete_many()`:
+    `value` is the pulled content, `error` the exception raised after all
+    retries were exhausted.
+    """
+
+    path: str = attr.ib()
+    value: Any = attr.ib(default=None)
+    error: Exception | None = attr.ib(default=None)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _run_many(
+    func: Callable[..., Any],
+    items: Iterable[tuple[str, ...]],
+    max_workers: int | None = None,
+    retries: int | None = None,
+) -> Iterator[BulkResult]:
+    """
+    Call `func(*item)` for each item on a thread pool and yield the results as
+    they complete. At most twice `max_workers` items are consumed ahead, so
+    `items` can be a (long) generator, e.g. `iter_keys()`.
+    """
+    max_workers = max_workers or settings.SIMPLEFLOW_STORAGE_MAX_WORKERS
+    policy = _retry_policy(retries)
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        while True:
+            for item in itertools.islice(items, 2 * max_workers - len(pending)):
+                pending[executor.submit(policy.call, func, *item)] = item[0]
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    yield BulkResult(path, value=future.result())
+                except Exception as error:
+                    yield BulkResult(path, error=error)
+
+
+def pull_many(
+    bucket: str, paths: Iterable[str], max_workers: int | None = None, retries: int | None = None
+) -> Iterator[BulkResult]:
+    """
+    Pull the content of many objects concurrently; yield a BulkResult per
+    object as soon as it is downloaded, in no particular order.
+    """
+    backend = get_backend(bucket)
+    return _run_many(backend.pull_content, ((path,) for path in paths), max_workers, retries)
+
+
+def push_many(
+    bucket: str,
+    contents: Iterable[tuple[str, str | bytes]],
+    content_type: str | None = None,
+    content_encoding: str | None = None,
+    max_workers: int | None = None,
+    retries: int | None = None,
+) -> Iterator[BulkResult]:
+    """
+    Push many (path, content) pairs concurrently; yield a BulkResult per
+    object as soon as it is uploaded.
+    """
+    backend = get_backend(bucket)
+
+    def push_one(path: str, content: str | bytes) -> None:
+        backend.push_content(path, content, content_type=content_type, content_encoding=content_encoding)
+
+    return _run_many(push_one, contents, max_workers, retries)
+
+
+def delete_many(
+    bucket: str, paths: Iterable[str], max_workers: int | None = None, retries: int | None = None
+) -> Iterator[BulkResult]:
+    """
+    Delete many objects concurrently; yield a BulkResult per object.
+    """
+    backend = get_backend(bucket)
+    return _run_many(backend.delete, ((path,) for path in paths), max_workers, retries)
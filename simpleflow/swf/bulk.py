@@ -0,0 +1,212 @@
+"""
+Operations on many workflow executions at once: start, signal, cancel or
+terminate them concurrently, sharing one SWF client (see
+`simpleflow.swf.mapper.core.get_client`).
+
+Items are dicts, typically read from NDJSON (one JSON object per line)::
+
+    {"workflow_id": "crawl-1234", "run_id": "...", "input": {"args": [1234]}}
+
+Results are yielded as the operations complete, not in the order of the items.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, TextIO
+
+import simpleflow.swf.mapper.models
+import simpleflow.swf.mapper.querysets
+from simpleflow.swf.mapper.core import MAX_POOL_CONNECTIONS
+from simpleflow.swf.utils import set_workflow_class_name, transform_input
+from simpleflow.utils import json_loads_or_raw
+
+if TYPE_CHECKING:
+    from simpleflow.swf.mapper.models.workflow import WorkflowExecution, WorkflowType
+    from simpleflow.workflow import Workflow
+
+    Item = dict[str, Any]
+
+# one connection per thread
+DEFAULT_CONCURRENCY = min(16, MAX_POOL_CONNECTIONS)
+
+
+class Pacer:
+    """
+    Spread calls evenly at `rate` calls per second, across threads.
+
+    >>> pacer = Pacer(rate=10)
+    >>> pacer.wait()
+    0.0
+    >>> 0 < pacer.wait() <= 0.1
+    True
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError(f"invalid rate: {rate}")
+        self.interval = 1 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """
+        Wait for the next slot. Returns the time waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+def read_items(fp: TextIO) -> Iterator[Item]:
+    """
+    Items of a NDJSON file; blank lines are skipped.
+    """
+    for lineno, line in enumerate(fp, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        item = json_loads_or_raw(line)
+        if not isinstance(item, dict):
+            raise ValueError(f"line {lineno}: expected a JSON object, got {line!r}")
+        yield item
+
+
+def filtered_items(domain_name: str, slices: int = 1, **filters) -> Iterator[Item]:
+    """
+    Items of the open executions matching `filters`, see
+    `WorkflowExecutionQuerySet.iter_filter()`.
+    """
+    domain = simpleflow.swf.mapper.models.Domain(domain_name)
+    query = simpleflow.swf.mapper.querysets.WorkflowExecutionQuerySet(domain)
+    for execution in query.iter_filter(slices=slices, **filters):
+        yield {"workflow_id": execution.workflow_id, "run_id": execution.run_id}
+
+
+def run(
+    operation: Callable[[Item], Any],
+    items: Iterable[Item],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float | None = None,
+) -> Iterator[tuple[Item, Any, Exception | None]]:
+    """
+    Call `operation` on each item, with at most `concurrency` calls in flight
+    and, if set, at most `rate` calls per second.
+
+    Items are consumed lazily: only a few more than `concurrency` are held at
+    once, so `items` can stream a large file.
+
+    :return: (item, result, error) tuples, as the calls complete; errors don't
+    interrupt the other calls.
+    """
+    pacer = Pacer(rate) if rate else None
+
+    def call(item: Item) -> Any:
+        if pacer:
+            pacer.wait()
+        return operation(item)
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < 2 * concurrency:
+                item = next(items, None)
+                if item is None:
+                    exhausted = True
+                    break
+                pending[executor.submit(call, item)] = item
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, None if error else future.result(), error
+
+
+def start(workflow_type: WorkflowType, workflow_class: type[Workflow]) -> Callable[[Item], WorkflowExecution]:
+    """
+    Operation starting an execution of `workflow_type` per item. Items may set
+    workflow_id, input, tags, task_list, execution_timeout and
+    decision_tasks_timeout, like the options of `simpleflow workflow.start`.
+    """
+
+    def operation(item: Item) -> WorkflowExecution:
+        wf_input = transform_input(item["input"]) if item.get("input") is not None else {}
+        set_workflow_class_name(wf_input, workflow_class)
+        return workflow_type.start_execution(
+            workflow_id=item.get("workflow_id"),
+            task_list=item.get("task_list") or workflow_class.task_list,
+            execution_timeout=item.get("execution_timeout"),
+            input=wf_input,
+            tag_list=item.get("tags"),
+            decision_tasks_timeout=item.get("decision_tasks_timeout"),
+        )
+
+    return operation
+
+
+def _execution(domain: simpleflow.swf.mapper.models.Domain, item: Item) -> WorkflowExecution:
+    # no run ID: SWF targets the current run of the workflow ID
+    return simpleflow.swf.mapper.models.WorkflowExecution(domain, item["workflow_id"], run_id=item.get("run_id"))
+
+
+def signal(domain_name: str, signal_name: str) -> Callable[[Item], None]:
+    """
+    Operation sending `signal_name` to the execution of each item, with the
+    item's input.
+    """
+    domain = simpleflow.swf.mapper.models.Domain(domain_name)
+
+    def operation(item: Item) -> None:
+        _execution(domain, item).signal(signal_name, input=item.get("input"))
+
+    return operation
+
+
+def cancel(domain_name: str) -> Callable[[Item], None]:
+    """
+    Operation requesting the cancellation of the execution of each item.
+    """
+    domain = simpleflow.swf.mapper.models.Domain(domain_name)
+
+    def operation(item: Item) -> None:
+        _execution(domain, item).request_cancel()
+
+    return operation
+
+
+def terminate(domain_name: str, reason: str | None = None) -> Callable[[Item], None]:
+    """
+    Operation terminating the execution of each item.
+    """
+    domain = simpleflow.swf.mapper.models.Domain(domain_name)
+
+    def operation(item: Item) -> None:
+        _execution(domain, item).terminate(reason=item.get("reason", reason))
+
+    return operation
+
+
+def results(outcomes: Iterable[tuple[Item, Any, Exception | None]]) -> tuple[tuple[str, ...], Iterator[tuple]]:
+    """
+    Header and rows of the outcomes of `run()`, for `pretty.streamed()`.
+    """
+    header = "Workflow ID", "Run ID", "Status", "Error"
+
+    def rows():
+        for item, result, error in outcomes:
+            run_id = getattr(result, "run_id", None) or item.get("run_id")
+            workflow_id = getattr(result, "workflow_id", None) or item.get("workflow_id")
+            yield workflow_id, run_id, "error" if error else "ok", str(error) if error else None
+
+    return header, rows()
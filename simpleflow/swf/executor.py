@@ -14,9 +14,10 @@ import simpleflow.task as base_task
 import simpleflow.swf.mapper.exceptions
 import simpleflow.swf.mapper.models
 import simpleflow.swf.mapper.models.decision
-from simpleflow import exceptions, executor, format, futures, logger, task
+from simpleflow import exceptions, executor, format, futures, logger, settings, task
 from simpleflow.activity import PRIORITY_NOT_SET, Activity
 from simpleflow.base import Submittable
+from simpleflow.constants import CONCURRENCY_LIMIT_REASON
 from simpleflow.history import History
 from simpleflow.marker import Marker
 from simpleflow.signal import WaitForSignal
@@ -598,6 +599,21 @@ class Executor(executor.Executor):
             else:  # TODO: handle
                 logger.warning(f'Unexpected timer state for timer "{timer["id"]}": {timer["state"]}')
 
+        if event.get("state") == "failed" and event.get("reason") == CONCURRENCY_LIMIT_REASON:
+            # Released by a worker at the activity's concurrency limit: reschedule
+            # it after a while, this doesn't count as a retry.
+            logger.info(f"handle_failure: {swf_task.id} hit its concurrency limit on a worker, rescheduling")
+            if not settings.ACTIVITY_CONCURRENCY_LIMIT_RETRY_DELAY:
+                return None, swf_task
+            return (
+                None,
+                TimerTask(
+                    self.get_retry_task_timer_id(swf_task),
+                    settings.ACTIVITY_CONCURRENCY_LIMIT_RETRY_DELAY,
+                    swf_task.get_input(),
+                ),
+            )
+
         failure_context = base_task.TaskFailureContext(
             a_task=swf_task, event=event, future=future, exception_class=exception_class, history=self._history
         )
@@ -931,8 +947,15 @@ class Executor(executor.Executor):
 
         # noinspection PyUnresolvedReferences
         history = decision_response.history
-        self._history = History(history)
-        self._history.parse()
+        parsed_history = getattr(decision_response, "parsed_history", None)
+        if parsed_history is None or parsed_history.swf_history is not history:
+            format.prefetch_jumbo_fields(
+                value for event in history.events for value in event.raw.get(event._attributes_key, {}).values()
+            )
+            parsed_history = History(history)
+        # parsed while polling: only the events not parsed yet, if any
+        parsed_history.parse()
+        self._history = parsed_history
         self.build_run_context(decision_response)
         # noinspection PyUnresolvedReferences
         self._execution = decision_response.execution
@@ -85,7 +85,7 @@ def show_workflow_status(domain_name, workflow_id, run_id=None, nb_tasks=None):
 def list_workflow_executions(domain_name, *args, **kwargs):
     domain = simpleflow.swf.mapper.models.Domain(domain_name)
     query = simpleflow.swf.mapper.querysets.WorkflowExecutionQuerySet(domain)
-    executions = query.all(*args, **kwargs)
+    executions = query.iter_all(*args, **kwargs)
 
     return pretty.list_executions(executions)
 
@@ -102,7 +102,7 @@ def filter_workflow_executions(
 ):
     domain = simpleflow.swf.mapper.models.Domain(domain_name)
     query = simpleflow.swf.mapper.querysets.WorkflowExecutionQuerySet(domain)
-    executions = query.filter(
+    executions = query.iter_filter(
         status,
         tag,
         workflow_id,
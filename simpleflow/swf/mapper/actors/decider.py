@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
 
 from botocore.exceptions import ClientError
 
@@ -21,6 +22,7 @@ from simpleflow.swf.mapper.responses import Response
 
 if TYPE_CHECKING:
     from simpleflow.swf.mapper.models.domain import Domain
+    from simpleflow.swf.mapper.models.event.base import Event
 
 
 class Decider(Actor):
@@ -66,11 +68,22 @@ class Decider(Actor):
         finally:
             logging_context.reset()
 
-    def poll(self, task_list=None, identity=None, **kwargs):
+    def poll(
+        self,
+        task_list=None,
+        identity=None,
+        history: History | None = None,
+        on_page: Callable[[list[Event]], Any] | None = None,
+        all_pages: bool = True,
+        **kwargs,
+    ):
         """
         Polls a decision task and returns the token and the full history of the
         workflow's events.
 
+        The history is built page by page: the events of a page are built (and
+        handed to `on_page`) while the next page downloads, see `fetch_history()`.
+
         :param task_list: task list to poll for decision tasks from.
         :type task_list: str
 
@@ -79,12 +92,24 @@ class Decider(Actor):
         workflow history.
         :type identity: str
 
+        :param history: empty history to fill, e.g. one wrapped by a
+        simpleflow.history.History; defaults to a new History.
+
+        :param on_page: called with the new events after each page, e.g. to
+        parse the history incrementally.
+
+        :param all_pages: if False, only poll the first page: the history of the
+        response stays empty until `fetch_history()` is called, e.g. by another
+        process.
+
         :returns: a Response object with history, token, and execution set
         :rtype:  simpleflow.swf.mapper.responses.Response
 
         """
         logging_context.reset()
         task_list = task_list or self.task_list
+        if history is None:
+            history = History()
 
         task = self.poll_for_decision_task(
             self.domain.name,
@@ -96,41 +121,10 @@ class Decider(Actor):
         if not token:
             raise PollTimeout("Decider poll timed out")
 
-        events = task["events"]
         logging_context.set("workflow_id", task["workflowExecution"]["workflowId"])
         logging_context.set("task_type", "decision")
         logging_context.set("event_id", task["startedEventId"])
 
-        next_page = task.get("nextPageToken")
-        while next_page:
-            try:
-                task = self.poll_for_decision_task(
-                    self.domain.name,
-                    task_list=task_list,
-                    identity=format.identity(identity),
-                    next_page_token=next_page,
-                    **kwargs,
-                )
-            except ClientError as e:
-                error_code = extract_error_code(e)
-                message = extract_message(e)
-                if error_code == "UnknownResourceFault":
-                    raise DoesNotExistError(
-                        "Unable to poll decision task",
-                        message,
-                    )
-
-                raise ResponseError(message)
-
-            token = task.get("taskToken")
-            if not token:
-                raise PollTimeout("Decider poll timed out")
-
-            events.extend(task["events"])
-            next_page = task.get("nextPageToken")
-
-        history = History.from_event_list(events)
-
         workflow_type = WorkflowType(
             domain=self.domain,
             name=task["workflowType"]["name"],
@@ -144,4 +138,69 @@ class Decider(Actor):
         )
 
         # TODO: move history into execution (needs refactoring on WorkflowExecution.history())
-        return Response(token=token, history=history, execution=execution)
+        response = Response(
+            token=token,
+            history=history,
+            execution=execution,
+            pending_page=task,
+            task_list=task_list,
+            identity=identity,
+            poll_kwargs=kwargs,
+        )
+        if all_pages:
+            self.fetch_history(response, on_page)
+        return response
+
+    def fetch_history(self, response: Response, on_page: Callable[[list[Event]], Any] | None = None) -> None:
+        """
+        Fill the history of a response polled with `all_pages=False`. The events
+        of a page are built (and handed to `on_page`) while the next page
+        downloads.
+        """
+        page, response.pending_page = response.pending_page, None
+        if page is None:
+            # already fetched
+            return
+        if page.get("nextPageToken"):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while page.get("nextPageToken"):
+                    next_page = executor.submit(
+                        self._poll_next_page,
+                        response.task_list,
+                        response.identity,
+                        page["nextPageToken"],
+                        **response.poll_kwargs,
+                    )
+                    self._add_page(response.history, page["events"], on_page)
+                    page = next_page.result()
+        self._add_page(response.history, page["events"], on_page)
+
+    @staticmethod
+    def _add_page(history: History, events: list[dict[str, Any]], on_page: Callable[[list[Event]], Any] | None) -> None:
+        new_events = history.feed(events)
+        if on_page:
+            on_page(new_events)
+
+    def _poll_next_page(self, task_list: str, identity: str | None, next_page_token: str, **kwargs) -> dict[str, Any]:
+        try:
+            page = self.poll_for_decision_task(
+                self.domain.name,
+                task_list=task_list,
+                identity=format.identity(identity),
+                next_page_token=next_page_token,
+                **kwargs,
+            )
+        except ClientError as e:
+            error_code = extract_error_code(e)
+            message = extract_message(e)
+            if error_code == "UnknownResourceFault":
+                raise DoesNotExistError(
+                    "Unable to poll decision task",
+                    message,
+                )
+
+            raise ResponseError(message)
+
+        if not page.get("taskToken"):
+            raise PollTimeout("Decider poll timed out")
+        return page
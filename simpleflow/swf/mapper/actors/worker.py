@@ -196,7 +196,7 @@ class ActivityWorker(Actor):
 
         activity_task = ActivityTask.from_poll(
             self.domain,
-            self.task_list,
+            task_list,
             task,
         )
 
@@ -4,17 +4,22 @@
 # See the file LICENSE for copying permission.
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
+import functools
 import os
+import threading
 from typing import Any
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError
 
 # NB: import logger directly from simpleflow so we benefit from the logging
 # config hosted in simpleflow. This wouldn't be the case with a standard
 # "logging.getLogger(__name__)" which would write logs under the "swf" namespace
 from simpleflow import logger
+from simpleflow.constants import LOCKS_DIR
+from simpleflow.process import HostRateLimiter
 from simpleflow.utils import remove_none, retry
 
 from . import settings
@@ -22,6 +27,100 @@ from . import settings
 SETTINGS = settings.get()
 RETRIES = int(os.environ.get("SWF_CONNECTION_RETRIES", "5"))
 DEFAULT_AWS_REGION = "us-east-1"
+MAX_POOL_CONNECTIONS = int(os.environ.get("SWF_MAX_POOL_CONNECTIONS", "32"))
+# Long polls last up to 60 seconds: don't time out before SWF answers
+READ_TIMEOUT = int(os.environ.get("SWF_READ_TIMEOUT", "70"))
+
+# Requests to each SWF API are rate limited host-wide, adapting to throttling:
+# see HostRateLimiter
+ADAPTIVE_THROTTLING = os.environ.get("SWF_ADAPTIVE_THROTTLING", "true").lower() in ("1", "true", "yes")
+MAX_RATE = float(os.environ.get("SWF_MAX_RATE", "1000"))
+THROTTLING_ERROR_CODES = ("ThrottlingException", "Throttling")
+
+# Clients are expensive to build (new session, credentials lookup, connection
+# pool, TLS handshakes): they are shared by all the objects and threads of a
+# process, per region and credentials. Connections can't be shared with
+# forked processes, which build their own clients.
+_CLIENTS: dict[tuple, boto3.client] = {}
+_clients_lock = threading.Lock()
+_RATE_LIMITERS: dict[tuple[str, str], HostRateLimiter | None] = {}
+
+
+def reset_clients() -> None:
+    global _clients_lock
+    _clients_lock = threading.Lock()
+    _CLIENTS.clear()
+
+
+os.register_at_fork(after_in_child=reset_clients)
+
+
+def get_rate_limiter(region: str, operation_name: str) -> HostRateLimiter | None:
+    key = (region, operation_name)
+    if key not in _RATE_LIMITERS:
+        path = os.path.join(LOCKS_DIR, "swf-rate-limits", f"{region}.{operation_name}")
+        _RATE_LIMITERS[key] = HostRateLimiter(path, MAX_RATE)
+    return _RATE_LIMITERS[key]
+
+
+def _call_rate_limiter(region: str, operation_name: str, method: str) -> None:
+    limiter = get_rate_limiter(region, operation_name)
+    if not limiter:
+        return
+    try:
+        getattr(limiter, method)()
+    except OSError as err:
+        # e.g. state file owned by another user: don't fail the requests
+        logger.warning(f"cannot rate limit {operation_name} requests: {err}")
+        _RATE_LIMITERS[(region, operation_name)] = None
+
+
+def _before_request(region: str, operation_name: str, **kwargs) -> None:
+    # called before each attempt, botocore's retries included
+    _call_rate_limiter(region, operation_name, "acquire")
+
+
+def _after_response(region: str, response, operation, **kwargs) -> None:
+    if response is None:
+        # connection error
+        return
+    http_response, parsed = response
+    if parsed.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES:
+        _call_rate_limiter(region, operation.name, "throttled")
+    elif http_response.status_code < 400:
+        _call_rate_limiter(region, operation.name, "succeeded")
+
+
+def get_client_config() -> Config:
+    return Config(
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        read_timeout=READ_TIMEOUT,
+        tcp_keepalive=True,
+    )
+
+
+def get_client(region: str, credentials: dict[str, str] | None = None) -> boto3.client:
+    """
+    SWF client of this process for a region and credentials (default
+    credentials chain if empty).
+    """
+    credentials = credentials or {}
+    key = (region, tuple(sorted(credentials.items())))
+    with _clients_lock:
+        client = _CLIENTS.get(key)
+        if client is None:
+            session = boto3.session.Session(region_name=region)
+            # raises EndpointConnectionError if region is wrong
+            client = session.client("swf", config=get_client_config(), **credentials)
+            # credentials are resolved once per client: don't keep one without
+            # them, they may be available later (e.g. from an instance profile)
+            if credentials or session.get_credentials() is not None:
+                _CLIENTS[key] = client
+            if ADAPTIVE_THROTTLING:
+                client.meta.events.register("request-created.swf", functools.partial(_before_request, region))
+                client.meta.events.register("needs-retry.swf", functools.partial(_after_response, region))
+            logger.debug(f"initiated connection to region={region}")
+        return client
 
 
 class ConnectedSWFObject:
@@ -39,19 +138,22 @@ class ConnectedSWFObject:
     )
     def __init__(self, *args, **kwargs):
         self.region = SETTINGS.get("region") or kwargs.get("region") or DEFAULT_AWS_REGION
+        self.boto3_client = kwargs.pop("boto3_client", None) or get_client(self.region, self._credentials())
+
+    @staticmethod
+    def _credentials() -> dict[str, str]:
         # Use settings-provided keys if available, otherwise pass empty
         # dictionary to boto SWF client, which will use its default credentials
         # chain provider.
         cred_keys = ["aws_access_key_id", "aws_secret_access_key"]
-        creds_ = {k: SETTINGS[k] for k in cred_keys if SETTINGS.get(k, None)}
-
-        self.boto3_client = kwargs.pop("boto3_client", None)
-        if not self.boto3_client:
-            session = boto3.session.Session(region_name=self.region)
-            # raises EndpointConnectionError if region is wrong
-            self.boto3_client = session.client("swf", **creds_)
+        return {k: SETTINGS[k] for k in cred_keys if SETTINGS.get(k, None)}
 
-        logger.debug(f"initiated connection to region={self.region}")
+    def reset_client(self) -> None:
+        """
+        Use a client of the current process: to call in a forked process, whose
+        parent may keep using the inherited client and its connections.
+        """
+        self.boto3_client = get_client(self.region, self._credentials())
 
     # Mimics https://boto.cloudhackers.com/en/latest/ref/swf.html#boto.swf.layer1.Layer1.list_open_workflow_executions
     def list_open_workflow_executions(
@@ -70,8 +172,8 @@ class ConnectedSWFObject:
         kwargs = {
             "domain": domain,
             "startTimeFilter": {
-                "oldestDate": datetime.fromtimestamp(oldest_date),
-                "latestDate": datetime.fromtimestamp(latest_date) if latest_date is not None else None,
+                "oldestDate": datetime.fromtimestamp(oldest_date, tz=timezone.utc),
+                "latestDate": datetime.fromtimestamp(latest_date, tz=timezone.utc) if latest_date is not None else None,
             },
             "nextPageToken": next_page_token,
             "maximumPageSize": maximum_page_size,
@@ -84,7 +186,7 @@ class ConnectedSWFObject:
             }
         if tag:
             kwargs["tagFilter"] = {
-                "name": tag,
+                "tag": tag,
             }
         if workflow_id:
             kwargs["executionFilter"] = {
@@ -120,13 +222,21 @@ class ConnectedSWFObject:
         }
         if start_oldest_date is not None:
             kwargs["startTimeFilter"] = {
-                "oldestDate": datetime.fromtimestamp(start_oldest_date),
-                "latestDate": datetime.fromtimestamp(start_latest_date) if start_latest_date is not None else None,
+                "oldestDate": datetime.fromtimestamp(start_oldest_date, tz=timezone.utc),
+                "latestDate": (
+                    datetime.fromtimestamp(start_latest_date, tz=timezone.utc)
+                    if start_latest_date is not None
+                    else None
+                ),
             }
         if close_oldest_date is not None:
             kwargs["closeTimeFilter"] = {
-                "oldestDate": datetime.fromtimestamp(close_oldest_date),
-                "latestDate": datetime.fromtimestamp(close_latest_date) if close_latest_date is not None else None,
+                "oldestDate": datetime.fromtimestamp(close_oldest_date, tz=timezone.utc),
+                "latestDate": (
+                    datetime.fromtimestamp(close_latest_date, tz=timezone.utc)
+                    if close_latest_date is not None
+                    else None
+                ),
             }
         if close_status:
             kwargs["closeStatusFilter"] = {
@@ -139,7 +249,7 @@ class ConnectedSWFObject:
             }
         if tag:
             kwargs["tagFilter"] = {
-                "name": tag,
+                "tag": tag,
             }
         if workflow_id:
             kwargs["executionFilter"] = {
@@ -5,7 +5,7 @@ from collections.abc import Sequence
 from functools import partial, wraps
 from typing import Any, Callable
 
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
 
 
 class SWFError(Exception):
@@ -323,3 +323,43 @@ def extract_message(error: Exception) -> str | None:
     if hasattr(error, "response"):
         return error.response["Error"]["Message"]
     return None
+
+
+# Error codes of throttled or transient failures, worth retrying
+RETRYABLE_ERROR_CODES = frozenset(
+    (
+        "InternalFailure",
+        "RequestTimeout",
+        "ServiceUnavailable",
+        "SlowDown",
+        "Throttling",
+        "ThrottlingException",
+    )
+)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Whether a failed AWS call may succeed if retried: throttling, server and
+    connection errors are; missing or duplicate resources and invalid
+    parameters aren't.
+
+    >>> is_retryable_error(RateLimitExceededError("slow down"))
+    True
+    >>> is_retryable_error(DoesNotExistError("no such domain"))
+    False
+    >>> is_retryable_error(ValueError("bug"))
+    False
+    """
+    if isinstance(error, (PollTimeout, DoesNotExistError, AlreadyExistsError, InvalidKeywordArgumentError)):
+        return False
+    if isinstance(error, RateLimitExceededError):
+        return True
+    if isinstance(error, ResponseError):
+        # the mapper raises ResponseError while handling the ClientError
+        cause = error.__cause__ or error.__context__
+        return is_retryable_error(cause) if isinstance(cause, ClientError) else True
+    if isinstance(error, ClientError):
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return status >= 500 or extract_error_code(error) in RETRYABLE_ERROR_CODES
+    return isinstance(error, (ConnectionError, HTTPClientError))
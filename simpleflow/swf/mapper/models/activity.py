@@ -19,6 +19,7 @@ from simpleflow.swf.mapper.exceptions import (
     extract_message,
     extract_error_code,
 )
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.base import BaseModel, ModelDiff
 from simpleflow.swf.mapper.utils import immutable
 
@@ -212,6 +213,7 @@ class ActivityType(BaseModel):
     )
     def delete(self):
         """Deprecates the domain amazon side"""
+        registration_cache.forget(registration_cache.ACTIVITY_TYPE, self.domain.name, self.name, self.version)
         self.deprecate_activity_type(self.domain.name, self.name, self.version)
 
     def upstream(self):
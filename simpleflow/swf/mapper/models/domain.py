@@ -19,6 +19,7 @@ from simpleflow.swf.mapper.exceptions import (
     extract_error_code,
     extract_message,
 )
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.base import BaseModel, ModelDiff
 from simpleflow.swf.mapper.utils import immutable
 
@@ -156,6 +157,7 @@ class Domain(BaseModel):
     )
     def delete(self) -> None:
         """Deprecates the domain amazon side"""
+        registration_cache.forget(registration_cache.DOMAIN, self.name)
         self.deprecate_domain(self.name)
 
     def upstream(self) -> Domain:
@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 from itertools import groupby
-from typing import Any, Iterator
+from typing import Any, Iterable, Iterator
 
 from simpleflow.swf.mapper.models.event.compiler import CompiledEvent
 from simpleflow.swf.mapper.models.event.base import Event
@@ -223,7 +223,7 @@ class History:
         return self.compile()
 
     @classmethod
-    def from_event_list(cls, data: list[dict[str, Any]]) -> History:
+    def from_event_list(cls, data: Iterable[dict[str, Any]]) -> History:
         """Instantiates a new ``simpleflow.swf.mapper.models.history.History`` instance
         from amazon service response.
 
@@ -231,14 +231,29 @@ class History:
         subclasses instances, exposing their type, state, and so on to
         facilitate decisions according to the history.
 
-        :param  data: event history description (typically, an amazon response)
+        :param  data: event history description (typically, an amazon response);
+                      can be an iterator, e.g. yielding events while
+                      downloading the next pages
 
         :returns: History model instance built upon data description
         """
-        events_history: list[Event] = []
+        history = cls(events=[], raw=[])
+        history.feed(data)
+        return history
 
-        for index, d in enumerate(data):
-            event = EventFactory(d)
-            events_history.append(event)
+    def feed(self, data: Iterable[dict[str, Any]]) -> list[Event]:
+        """Appends events to the history, e.g. a page of a history being
+        downloaded.
 
-        return cls(events=events_history, raw=data)
+        :param  data: events description, following the ones already stored
+
+        :returns: the new events
+        """
+        if self.raw is None:
+            self.raw = []
+        events: list[Event] = []
+        for d in data:
+            events.append(EventFactory(d))
+            self.raw.append(d)
+        self.events.extend(events)
+        return events
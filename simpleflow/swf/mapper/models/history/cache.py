@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import zlib
+from datetime import datetime, timezone
+from sqlite3 import OperationalError
+from typing import Any
+
+from diskcache import Cache
+
+from simpleflow import constants, logger, settings
+from simpleflow.utils import json_dumps, json_loads_or_raw
+
+# Last event of a closed execution: its history won't change anymore
+CLOSING_EVENT_TYPES = frozenset(
+    (
+        "WorkflowExecutionCanceled",
+        "WorkflowExecutionCompleted",
+        "WorkflowExecutionContinuedAsNew",
+        "WorkflowExecutionFailed",
+        "WorkflowExecutionTerminated",
+        "WorkflowExecutionTimedOut",
+    )
+)
+
+_disk_cache: Cache | None = None
+
+
+def _reset_after_fork() -> None:
+    global _disk_cache
+    _disk_cache = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_disk_cache() -> Cache:
+    # NB: cache objects do not survive forks, see DiskCache docs
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = Cache(
+            constants.HISTORY_CACHE_DIR,
+            size_limit=settings.SIMPLEFLOW_HISTORY_CACHE_SIZE_LIMIT,
+            eviction_policy="least-recently-used",
+        )
+    return _disk_cache
+
+
+def _cache_key(domain: str, workflow_id: str, run_id: str) -> str:
+    return f"histories/{domain}/{workflow_id}/{run_id}"
+
+
+def is_closed(events: list[dict[str, Any]]) -> bool:
+    """
+    Whether a complete history, in chronological order, is the one of a
+    closed execution.
+    """
+    return bool(events) and events[-1]["eventType"] in CLOSING_EVENT_TYPES
+
+
+def get_events(domain: str, workflow_id: str, run_id: str | None) -> list[dict[str, Any]] | None:
+    """
+    Raw events of a closed execution, if cached.
+    """
+    if not settings.SIMPLEFLOW_HISTORY_CACHE or not run_id:
+        return None
+    try:
+        content = _get_disk_cache().get(_cache_key(domain, workflow_id, run_id))
+    except (OperationalError, OSError) as err:
+        logger.warning(f"history cache: cannot read from {constants.HISTORY_CACHE_DIR}: {err}")
+        return None
+    if content is None:
+        return None
+    events = json_loads_or_raw(zlib.decompress(content))
+    for event in events:
+        event["eventTimestamp"] = datetime.fromtimestamp(event["eventTimestamp"], tz=timezone.utc)
+    return events
+
+
+def set_events(domain: str, workflow_id: str, run_id: str | None, events: list[dict[str, Any]]) -> None:
+    """
+    Cache the complete history of an execution, in chronological order, if it
+    is closed.
+    """
+    if not settings.SIMPLEFLOW_HISTORY_CACHE or not run_id or not is_closed(events):
+        return
+    content = json_dumps([dict(event, eventTimestamp=_timestamp(event["eventTimestamp"])) for event in events])
+    try:
+        _get_disk_cache().set(_cache_key(domain, workflow_id, run_id), zlib.compress(content.encode()))
+    except (OperationalError, OSError) as err:
+        logger.warning(f"history cache: cannot write to {constants.HISTORY_CACHE_DIR}: {err}")
+
+
+def _timestamp(value: datetime | float) -> float:
+    return value.timestamp() if isinstance(value, datetime) else value
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from sqlite3 import OperationalError
+from typing import Any
+
+from diskcache import Cache
+
+from simpleflow import constants, logger, settings
+
+# Kinds of registered objects
+ACTIVITY_TYPE = "activity_type"
+DOMAIN = "domain"
+WORKFLOW_TYPE = "workflow_type"
+
+_disk_cache: Cache | None = None
+
+# In-process descriptions: key -> (expiration time, description)
+_descriptions: dict[str, tuple[float, dict[str, Any]]] = {}
+_descriptions_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    global _disk_cache
+    _disk_cache = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_disk_cache() -> Cache:
+    # NB: cache objects do not survive forks, see DiskCache docs
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = Cache(constants.REGISTRATION_CACHE_DIR)
+    return _disk_cache
+
+
+def _cache_key(kind: str, domain: str, name: str, version: str) -> str:
+    return f"{kind}/{domain}/{name}/{version}"
+
+
+def _description_key(kind: str, *parts: str) -> str:
+    return "/".join(("descriptions", kind) + parts)
+
+
+def is_registered(kind: str, domain: str, name: str, version: str) -> bool:
+    """
+    Whether the type is known to be registered in the domain.
+    """
+    if not settings.SIMPLEFLOW_REGISTRATION_CACHE:
+        return False
+    try:
+        return _cache_key(kind, domain, name, version) in _get_disk_cache()
+    except (OperationalError, OSError) as err:
+        logger.warning(f"registration cache: cannot read from {constants.REGISTRATION_CACHE_DIR}: {err}")
+        return False
+
+
+def set_registered(kind: str, domain: str, name: str, version: str) -> None:
+    """
+    Remember that the type is registered in the domain, for
+    SIMPLEFLOW_REGISTRATION_CACHE_TTL seconds (it may be deprecated meanwhile).
+    """
+    if not settings.SIMPLEFLOW_REGISTRATION_CACHE:
+        return
+    try:
+        _get_disk_cache().set(
+            _cache_key(kind, domain, name, version), True, expire=settings.SIMPLEFLOW_REGISTRATION_CACHE_TTL or None
+        )
+    except (OperationalError, OSError) as err:
+        logger.warning(f"registration cache: cannot write to {constants.REGISTRATION_CACHE_DIR}: {err}")
+
+
+def get_description(kind: str, *parts: str) -> dict[str, Any] | None:
+    """
+    Cached Describe* response of a domain (parts: name) or a type (parts:
+    domain, name, version), if it is less than
+    SIMPLEFLOW_REGISTRATION_CACHE_TTL seconds old. Returns a copy: callers
+    may modify it.
+    """
+    if not settings.SIMPLEFLOW_REGISTRATION_CACHE_TTL:
+        return None
+    key = _description_key(kind, *parts)
+    with _descriptions_lock:
+        expire_time, description = _descriptions.get(key, (0.0, None))
+    if expire_time > time.time():
+        return copy.deepcopy(description)
+    if not settings.SIMPLEFLOW_REGISTRATION_CACHE_ON_DISK:
+        return None
+    try:
+        description, expire_time = _get_disk_cache().get(key, expire_time=True)
+    except (OperationalError, OSError) as err:
+        logger.warning(f"registration cache: cannot read from {constants.REGISTRATION_CACHE_DIR}: {err}")
+        return None
+    if description is None:
+        return None
+    with _descriptions_lock:
+        _descriptions[key] = expire_time, description
+    return copy.deepcopy(description)
+
+
+def set_description(kind: str, *parts: str, description: dict[str, Any]) -> None:
+    """
+    Cache the Describe* response of a domain or a type.
+    """
+    ttl = settings.SIMPLEFLOW_REGISTRATION_CACHE_TTL
+    if not ttl:
+        return
+    key = _description_key(kind, *parts)
+    # without the response metadata
+    description = copy.deepcopy({k: v for k, v in description.items() if k != "ResponseMetadata"})
+    with _descriptions_lock:
+        _descriptions[key] = time.time() + ttl, description
+    if not settings.SIMPLEFLOW_REGISTRATION_CACHE_ON_DISK:
+        return
+    try:
+        _get_disk_cache().set(key, description, expire=ttl)
+    except (OperationalError, OSError) as err:
+        logger.warning(f"registration cache: cannot write to {constants.REGISTRATION_CACHE_DIR}: {err}")
+
+
+def forget(kind: str, *parts: str) -> None:
+    """
+    Forget what is known of a domain or a type, e.g. once deprecated.
+    """
+    keys = [_description_key(kind, *parts)]
+    if kind != DOMAIN:
+        keys.append(_cache_key(kind, *parts))
+    with _descriptions_lock:
+        _descriptions.pop(keys[0], None)
+    if not settings.SIMPLEFLOW_REGISTRATION_CACHE and not settings.SIMPLEFLOW_REGISTRATION_CACHE_ON_DISK:
+        return
+    try:
+        cache = _get_disk_cache()
+        for key in keys:
+            cache.delete(key)
+    except (OperationalError, OSError) as err:
+        logger.warning(f"registration cache: cannot write to {constants.REGISTRATION_CACHE_DIR}: {err}")
+
+
+def clear() -> None:
+    """
+    Forget the in-process descriptions.
+    """
+    with _descriptions_lock:
+        _descriptions.clear()
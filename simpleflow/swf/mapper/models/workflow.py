@@ -22,8 +22,10 @@ from simpleflow.swf.mapper.exceptions import (
     extract_error_code,
     extract_message,
 )
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.base import BaseModel, ModelDiff
 from simpleflow.swf.mapper.models.domain import Domain
+from simpleflow.swf.mapper.models.history import cache as history_cache
 from simpleflow.swf.mapper.models.history.base import History
 from simpleflow.swf.mapper.utils import immutable
 
@@ -210,6 +212,7 @@ class WorkflowType(BaseModel):
 
     def delete(self) -> None:
         """Deprecates the workflow type amazon-side"""
+        registration_cache.forget(registration_cache.WORKFLOW_TYPE, self.domain.name, self.name, self.version)
         try:
             self.deprecate_workflow_type(self.domain.name, self.name, self.version)
         except ClientError as e:
@@ -449,15 +452,46 @@ class WorkflowExecution(BaseModel):
         qs = WorkflowExecutionQuerySet(self.domain)
         return qs.get(self.workflow_id, self.run_id)
 
-    def history(self, *args, **kwargs) -> History:
+    def history(self, *args, concurrent: bool = True, **kwargs) -> History:
         """Returns workflow execution history report
 
+        The histories of closed executions don't change: they are cached on
+        disk, see the SIMPLEFLOW_HISTORY_CACHE setting.
+
+        :param  concurrent: fetch the history from both ends concurrently, see
+                            `simpleflow.swf.mapper.querysets.history.iter_events_from_both_ends()`
         :returns: The workflow execution complete events history
         """
+        from simpleflow.swf.mapper.querysets.history import iter_events_from_both_ends
+
         domain = kwargs.pop("domain", self.domain)
         if not isinstance(domain, str):
             domain = domain.name
 
+        chronological = not kwargs.get("reverse_order")
+        if chronological:
+            events = history_cache.get_events(domain, self.workflow_id, self.run_id)
+            if events is not None:
+                return History.from_event_list(events)
+
+        if concurrent and chronological and "next_page_token" not in kwargs:
+            kwargs.pop("reverse_order", None)
+
+            def get_page(next_page_token, reverse_order):
+                return self.get_workflow_execution_history(
+                    domain,
+                    self.run_id,
+                    self.workflow_id,
+                    next_page_token=next_page_token,
+                    reverse_order=reverse_order,
+                    **kwargs,
+                )
+
+            # events are built while the next pages are downloaded
+            history = History.from_event_list(iter_events_from_both_ends(get_page))
+            history_cache.set_events(domain, self.workflow_id, self.run_id, history.raw)
+            return history
+
         response = self.get_workflow_execution_history(domain, self.run_id, self.workflow_id, **kwargs)
 
         events: list[dict[str, Any]] = response["events"]
@@ -474,6 +508,8 @@ class WorkflowExecution(BaseModel):
             events.extend(response["events"])
             next_page = response.get("nextPageToken")
 
+        if chronological:
+            history_cache.set_events(domain, self.workflow_id, self.run_id, events)
         return History.from_event_list(events)
 
     @exceptions.translate(ClientError, to=ResponseError)
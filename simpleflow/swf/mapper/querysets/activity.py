@@ -11,6 +11,7 @@ from botocore.exceptions import ClientError
 
 from simpleflow.swf.mapper.constants import REGISTERED
 from simpleflow.swf.mapper.exceptions import DoesNotExistError, ResponseError, extract_error_code, extract_message
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.activity import ActivityType
 from simpleflow.swf.mapper.querysets.base import BaseQuerySet
 from simpleflow.swf.mapper.utils import get_subkey
@@ -100,15 +101,20 @@ class ActivityTypeQuerySet(BaseQuerySet):
                 }
             }
         """
-        try:
-            response = self.describe_activity_type(self.domain.name, name, version)
-        except ClientError as e:
-            error_code = extract_error_code(e)
-            message = extract_message(e)
-            if error_code == "UnknownResourceFault":
-                raise DoesNotExistError(message)
-
-            raise ResponseError(message)
+        response = registration_cache.get_description(registration_cache.ACTIVITY_TYPE, self.domain.name, name, version)
+        if response is None:
+            try:
+                response = self.describe_activity_type(self.domain.name, name, version)
+            except ClientError as e:
+                error_code = extract_error_code(e)
+                message = extract_message(e)
+                if error_code == "UnknownResourceFault":
+                    raise DoesNotExistError(message)
+
+                raise ResponseError(message)
+            registration_cache.set_description(
+                registration_cache.ACTIVITY_TYPE, self.domain.name, name, version, description=response
+            )
 
         activity_info = response[self._infos]
         activity_config = response["configuration"]
@@ -9,6 +9,7 @@ from botocore.exceptions import ClientError
 
 from simpleflow.swf.mapper.constants import REGISTERED
 from simpleflow.swf.mapper.exceptions import DoesNotExistError, ResponseError
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.domain import Domain
 from simpleflow.swf.mapper.querysets.base import BaseQuerySet
 
@@ -39,14 +40,17 @@ class DomainQuerySet(BaseQuerySet):
                 }
             }
         """
-        try:
-            response = self.describe_domain(name)
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            if error_code == "UnknownResourceFault":
-                raise DoesNotExistError("No such domain: %s" % name)
-            # Any other errors should raise
-            raise ResponseError(e.args[0])
+        response = registration_cache.get_description(registration_cache.DOMAIN, name)
+        if response is None:
+            try:
+                response = self.describe_domain(name)
+            except ClientError as e:
+                error_code = e.response["Error"]["Code"]
+                if error_code == "UnknownResourceFault":
+                    raise DoesNotExistError("No such domain: %s" % name)
+                # Any other errors should raise
+                raise ResponseError(e.args[0])
+            registration_cache.set_description(registration_cache.DOMAIN, name, description=response)
 
         domain_info = response["domainInfo"]
         domain_config = response["configuration"]
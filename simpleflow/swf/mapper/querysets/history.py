@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
+from simpleflow import logger
+from simpleflow.swf.mapper.models.history import cache as history_cache
 from simpleflow.swf.mapper.models.history.base import History
 from simpleflow.swf.mapper.querysets.base import BaseQuerySet
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
     from simpleflow.swf.mapper.models.domain import Domain
 
 
@@ -23,6 +29,7 @@ class HistoryQuerySet(BaseQuerySet):
         max_results: int | None = None,
         page_size: int | None = 100,
         reverse: bool = False,
+        concurrent: bool = False,
     ) -> History:
         """Retrieves a WorkflowExecution history
 
@@ -35,12 +42,27 @@ class HistoryQuerySet(BaseQuerySet):
                            max_results history size is reached, next pages will be
                            requested.
         :param  reverse: Should the history events be retrieved in reverse order.
+        :param  concurrent: Fetch the whole history from both ends concurrently
+                            (see `iter_events()`); it is then truncated to
+                            max_results.
         """
         max_results = max_results or page_size
 
         if max_results < page_size:
             page_size = max_results
 
+        events = history_cache.get_events(self.domain.name, workflow_id, run_id)
+        if events is not None:
+            if reverse:
+                events = events[::-1]
+            return History.from_event_list(events[:max_results])
+
+        if concurrent:
+            events = list(self.iter_events(run_id, workflow_id))
+            if reverse:
+                events = events[::-1]
+            return History.from_event_list(events[:max_results])
+
         response = self.get_workflow_execution_history(
             self.domain.name,
             run_id,
@@ -63,4 +85,95 @@ class HistoryQuerySet(BaseQuerySet):
             events.extend(response["events"])
             next_page = response.get("nextPageToken")
 
+        if next_page is None and not reverse:
+            history_cache.set_events(self.domain.name, workflow_id, run_id, events)
         return History.from_event_list(events)
+
+    def iter_events(self, run_id: str, workflow_id: str, page_size: int | None = None) -> Iterator[dict[str, Any]]:
+        """Yields the raw events of a WorkflowExecution history in chronological
+        order, fetching its pages from both ends concurrently (see
+        `iter_events_from_both_ends()`).
+
+        The complete histories of closed executions are cached, see
+        `simpleflow.swf.mapper.models.history.cache`.
+        """
+        cached = history_cache.get_events(self.domain.name, workflow_id, run_id)
+        if cached is not None:
+            yield from cached
+            return
+
+        def get_page(next_page_token: str | None, reverse_order: bool | None) -> dict[str, Any]:
+            return self.get_workflow_execution_history(
+                self.domain.name,
+                run_id,
+                workflow_id,
+                maximum_page_size=page_size,
+                next_page_token=next_page_token,
+                reverse_order=reverse_order,
+            )
+
+        events = []
+        for event in iter_events_from_both_ends(get_page):
+            events.append(event)
+            yield event
+        history_cache.set_events(self.domain.name, workflow_id, run_id, events)
+
+
+def iter_events_from_both_ends(
+    get_page: Callable[[str | None, bool | None], dict[str, Any]],
+) -> Iterator[dict[str, Any]]:
+    """Yields the raw events of a history in chronological order, given a
+    function returning a page of it from a `next_page_token` and a
+    `reverse_order` flag.
+
+    Pages can't be fetched in parallel (each needs the token of the previous
+    one), but a history can be read from both ends: a thread pages backwards
+    while this one pages forwards, until they meet on an event id. Forward
+    events are yielded as their page arrives, the backward ones once the
+    pagers met. The backward pager only starts if the history has more than
+    one page.
+    """
+    lock = threading.Lock()
+    # last event id kept forwards, first event id kept backwards
+    state = {"forward": 0, "backward": float("inf")}
+    backward_events: list[dict[str, Any]] = []
+
+    def page_backwards() -> None:
+        next_page = None
+        while True:
+            response = get_page(next_page, True)
+            with lock:
+                for event in response["events"]:
+                    if event["eventId"] <= state["forward"]:
+                        return
+                    backward_events.append(event)
+                    state["backward"] = event["eventId"]
+            next_page = response.get("nextPageToken")
+            if next_page is None:
+                return
+
+    executor = None
+    next_page = None
+    try:
+        while True:
+            response = get_page(next_page, None)
+            next_page = response.get("nextPageToken")
+            if executor is None and next_page is not None:
+                executor = ThreadPoolExecutor(max_workers=1)
+                backward = executor.submit(page_backwards)
+            with lock:
+                page = [event for event in response["events"] if event["eventId"] < state["backward"]]
+                if page:
+                    state["forward"] = page[-1]["eventId"]
+                met = state["forward"] + 1 >= state["backward"]
+                if met:
+                    page.extend(reversed(backward_events))
+            yield from page
+            if met or next_page is None:
+                return
+    finally:
+        if executor is not None:
+            # don't wait for a backward page that isn't needed anymore
+            executor.shutdown(wait=False)
+            if backward.done() and backward.exception() is not None:
+                logger.debug(f"backward paging failed, paged forwards only: {backward.exception()!r}")
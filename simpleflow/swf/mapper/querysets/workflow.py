@@ -5,7 +5,12 @@
 
 from __future__ import annotations
 
-from typing import Any
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
 
 from botocore.exceptions import ClientError
 
@@ -18,11 +23,18 @@ from simpleflow.swf.mapper.exceptions import (
     extract_error_code,
     extract_message,
 )
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.domain import Domain
 from simpleflow.swf.mapper.models.workflow import CHILD_POLICIES, WorkflowExecution, WorkflowType
 from simpleflow.swf.mapper.querysets.base import BaseQuerySet
 from simpleflow.swf.mapper.utils import datetime_timestamp, get_subkey, past_day
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Sentinel marking the end of a time slice
+_SLICE_DONE = object()
+
 
 class BaseWorkflowQuerySet(BaseQuerySet):
     """Base domain bounded workflow queryset objects
@@ -119,15 +131,20 @@ class WorkflowTypeQuerySet(BaseWorkflowQuerySet):
                 }
             }
         """
-        try:
-            response = self.describe_workflow_type(self.domain.name, name, version)
-        except ClientError as e:
-            error_code = extract_error_code(e)
-            message = extract_message(e)
-            if error_code == "UnknownResourceFault":
-                raise DoesNotExistError(message)
-
-            raise ResponseError(message)
+        response = registration_cache.get_description(registration_cache.WORKFLOW_TYPE, self.domain.name, name, version)
+        if response is None:
+            try:
+                response = self.describe_workflow_type(self.domain.name, name, version)
+            except ClientError as e:
+                error_code = extract_error_code(e)
+                message = extract_message(e)
+                if error_code == "UnknownResourceFault":
+                    raise DoesNotExistError(message)
+
+                raise ResponseError(message)
+            registration_cache.set_description(
+                registration_cache.WORKFLOW_TYPE, self.domain.name, name, version, description=response
+            )
 
         wt_info = response[self._infos]
         wt_config = response["configuration"]
@@ -507,6 +524,7 @@ class WorkflowExecutionQuerySet(BaseWorkflowQuerySet):
         workflow_type_name=None,
         workflow_type_version=None,
         *args,
+        slices: int = 1,
         **kwargs,
     ):
         """Filters workflow executions based on kwargs provided criteras
@@ -531,6 +549,10 @@ class WorkflowExecutionQuerySet(BaseWorkflowQuerySet):
                                        of the provided version will be kept
         :type   workflow_type_version: String
 
+        :param  slices: split the time window in that many slices, listed
+                        concurrently; see `iter_filter()`
+        :type   slices: int
+
         **Be aware that** querying over status allows the usage of statuses specific
         kwargs
 
@@ -571,6 +593,36 @@ class WorkflowExecutionQuerySet(BaseWorkflowQuerySet):
             :returns: workflow executions objects list
             :rtype: list
         """
+        return list(
+            self.iter_filter(
+                status,
+                tag,
+                workflow_id,
+                workflow_type_name,
+                workflow_type_version,
+                *args,
+                slices=slices,
+                **kwargs,
+            )
+        )
+
+    def iter_filter(
+        self,
+        status=WorkflowExecution.STATUS_OPEN,
+        tag=None,
+        workflow_id=None,
+        workflow_type_name=None,
+        workflow_type_version=None,
+        *args,
+        slices: int = 1,
+        **kwargs,
+    ) -> Iterator[WorkflowExecution]:
+        """Like `filter()`, but yield the workflow executions as they are listed.
+
+        With `slices` > 1, the time window is split in as many slices, paged
+        concurrently: the executions are then yielded as they arrive, not
+        ordered by date.
+        """
         # As WorkflowTypeQuery has to be built against a specific domain
         # name, domain filter is disposable, but not mandatory.
         invalid_kwargs = self._validate_status_parameters(status, kwargs)
@@ -603,20 +655,90 @@ class WorkflowExecutionQuerySet(BaseWorkflowQuerySet):
         else:
             start_oldest_date = None
 
-        return [
-            self.to_WorkflowExecution(self.domain, wfe)
-            for wfe in self._list_items(
-                *args,
-                domain=self.domain.name,
-                status=status,
-                workflow_id=workflow_id,
-                workflow_name=workflow_type_name,
-                workflow_version=workflow_type_version,
-                start_oldest_date=start_oldest_date,
-                tag=tag,
-                **kwargs,
-            )
-        ]
+        return self._iter_executions(
+            slices,
+            *args,
+            domain=self.domain.name,
+            status=status,
+            workflow_id=workflow_id,
+            workflow_name=workflow_type_name,
+            workflow_version=workflow_type_version,
+            start_oldest_date=start_oldest_date,
+            tag=tag,
+            **kwargs,
+        )
+
+    def _iter_executions(self, slices: int, *args, **kwargs) -> Iterator[WorkflowExecution]:
+        if slices > 1:
+            items = self._list_items_sliced(slices, *args, **kwargs)
+        else:
+            items = self._list_items(*args, **kwargs)
+        for wfe in items:
+            yield self.to_WorkflowExecution(self.domain, wfe)
+
+    def _list_items_sliced(self, slices: int, *args, **kwargs) -> Iterator[dict[str, Any]]:
+        """
+        Split the time filter of the listing in `slices` windows, page them
+        concurrently and yield the execution infos as they arrive (so not in
+        order).
+
+        The windows share their bounds, which SWF includes: an execution on a
+        bound is only kept by the window starting there.
+        """
+        if kwargs["status"] == WorkflowExecution.STATUS_OPEN:
+            oldest_key, latest_key, timestamp_key = "start_oldest_date", "latest_date", "startTimestamp"
+        elif kwargs.get("start_oldest_date") is not None:
+            oldest_key, latest_key, timestamp_key = "start_oldest_date", "start_latest_date", "startTimestamp"
+        else:
+            oldest_key, latest_key, timestamp_key = "close_oldest_date", "close_latest_date", "closeTimestamp"
+        oldest = kwargs.get(oldest_key)
+        if oldest is None:
+            # no window to split
+            yield from self._list_items(*args, **kwargs)
+            return
+        latest = kwargs.get(latest_key) or int(time.time())
+        # integral bounds: older botocore versions truncate timestamps
+        bounds = sorted({oldest + (latest - oldest) * i // slices for i in range(slices)} | {latest})
+        if len(bounds) < 2:
+            bounds.append(latest)
+
+        items: queue.Queue = queue.Queue(maxsize=1000)
+        stopped = threading.Event()
+
+        def list_slice(slice_oldest, slice_latest, is_last):
+            try:
+                for info in self._list_items(
+                    *args, **dict(kwargs, **{oldest_key: slice_oldest, latest_key: slice_latest})
+                ):
+                    if stopped.is_set():
+                        return
+                    if is_last or _timestamp(info[timestamp_key]) < slice_latest:
+                        items.put(info)
+            except Exception as err:
+                items.put(err)
+            finally:
+                items.put(_SLICE_DONE)
+
+        nb_slices = len(bounds) - 1
+        with ThreadPoolExecutor(max_workers=nb_slices) as executor:
+            for i in range(nb_slices):
+                executor.submit(list_slice, bounds[i], bounds[i + 1], i == nb_slices - 1)
+            running = nb_slices
+            try:
+                while running:
+                    item = items.get()
+                    if item is _SLICE_DONE:
+                        running -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                # unblock the remaining slices
+                stopped.set()
+                while running:
+                    if items.get() is _SLICE_DONE:
+                        running -= 1
 
     def _list(self, *args, **kwargs):
         return self.list_workflow_executions(*args, **kwargs)
@@ -626,6 +748,7 @@ class WorkflowExecutionQuerySet(BaseWorkflowQuerySet):
         status=WorkflowExecution.STATUS_OPEN,
         start_oldest_date=MAX_WORKFLOW_AGE,
         *args,
+        slices: int = 1,
         **kwargs,
     ):
         """Fetch every workflow executions during the last `start_oldest_date`
@@ -637,6 +760,10 @@ class WorkflowExecutionQuerySet(BaseWorkflowQuerySet):
         :param  start_oldest_date: Specifies the oldest start/close date to return.
         :type   start_oldest_date: integer (days)
 
+        :param  slices: split the time window in that many slices, listed
+                        concurrently; see `iter_all()`
+        :type   slices: int
+
         :returns: workflow executions objects list
         :rtype: list
 
@@ -672,9 +799,26 @@ class WorkflowExecutionQuerySet(BaseWorkflowQuerySet):
                 "nextPageToken": "string"
             }
         """
+        return list(self.iter_all(status, start_oldest_date, slices=slices))
+
+    def iter_all(
+        self,
+        status=WorkflowExecution.STATUS_OPEN,
+        start_oldest_date=MAX_WORKFLOW_AGE,
+        slices: int = 1,
+    ) -> Iterator[WorkflowExecution]:
+        """Like `all()`, but yield the workflow executions as they are listed.
+
+        With `slices` > 1, the time window is split in as many slices, paged
+        concurrently: the executions are then yielded as they arrive, not
+        ordered by date.
+        """
         start_oldest_date = datetime_timestamp(past_day(start_oldest_date))
 
-        return [
-            self.to_WorkflowExecution(self.domain, wfe)
-            for wfe in self._list_items(status, self.domain.name, start_oldest_date=int(start_oldest_date))
-        ]
+        return self._iter_executions(
+            slices, status=status, domain=self.domain.name, start_oldest_date=int(start_oldest_date)
+        )
+
+
+def _timestamp(value: datetime | float) -> float:
+    return value.timestamp() if isinstance(value, datetime) else value
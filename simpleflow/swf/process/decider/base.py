@@ -9,6 +9,7 @@ import simpleflow.swf.mapper.actors
 import simpleflow.swf.mapper.exceptions
 import simpleflow.swf.mapper.models.decision
 from simpleflow import format, logger
+from simpleflow.history import History
 from simpleflow.process import Supervisor, with_state
 from simpleflow.swf.process.poller import Poller
 from simpleflow.swf.utils import DecisionsAndContext, get_name_from_event
@@ -28,11 +29,13 @@ class Decider(Supervisor):
     :type _poller: DeciderPoller
     """
 
-    def __init__(self, poller, nb_children=None):
+    def __init__(self, poller, nb_children=None, max_tasks_per_child=None, max_rss_per_child=None):
         self._poller = poller
         super().__init__(
             payload=self._poller.start,
             nb_children=nb_children,
+            max_tasks_per_child=max_tasks_per_child,
+            max_rss_per_child=max_rss_per_child,
         )
 
 
@@ -134,7 +137,32 @@ class DeciderPoller(Poller, simpleflow.swf.mapper.actors.Decider):
 
     @with_state("polling")
     def poll(self, task_list=None, identity=None, **kwargs):
-        return simpleflow.swf.mapper.actors.Decider.poll(self, task_list, identity, **kwargs)
+        """
+        Poll the first page of a decision task: the history is fetched by the
+        process taking the decision, see `fetch_history()`.
+        """
+        return simpleflow.swf.mapper.actors.Decider.poll(self, task_list, identity, all_pages=False, **kwargs)
+
+    def fetch_history(self, decision_response, on_page=None):
+        """
+        Fetch the history of a decision task, parsing it while the next pages
+        download. The parsed history is set as `parsed_history` on the response.
+
+        NB: called by the forked process taking the decision, so the poller
+        process doesn't keep the jumbo fields nor the parsed histories.
+        """
+        parsed_history = History(decision_response.history)
+
+        def parse_page(events):
+            format.prefetch_jumbo_fields(
+                value for event in events for value in event.raw.get(event._attributes_key, {}).values()
+            )
+            parsed_history.parse()
+            if on_page:
+                on_page(events)
+
+        simpleflow.swf.mapper.actors.Decider.fetch_history(self, decision_response, on_page=parse_page)
+        decision_response.parsed_history = parsed_history
 
     @with_state("completing")
     def complete(
@@ -182,6 +210,7 @@ class DeciderPoller(Poller, simpleflow.swf.mapper.actors.Decider):
         :return: the decisions.
         :rtype: Union[List[simpleflow.swf.mapper.models.decision.base.Decision], DecisionsAndContext]
         """
+        self.fetch_history(decision_response)
         worker = DeciderWorker(self.domain, self._workflow_executors)
         decisions = worker.decide(decision_response, self.task_list if self.is_standalone else None)
         return decisions
@@ -244,9 +273,16 @@ def process_decision(poller: DeciderPoller, decision_response: Response) -> None
     workflow_id = decision_response.execution.workflow_id
     workflow_str = f"workflow {workflow_id} ({poller.workflow_name})"
     logger.debug(f"process_decision() pid={os.getpid()}")
+    # The poller process keeps using its SWF client: don't share its
+    # connection pool.
+    poller.reset_client()
     logger.info(f"taking decision for {workflow_str}")
-    format.JUMBO_FIELDS_MEMORY_CACHE.clear()
-    decisions = poller.decide(decision_response)
+    try:
+        decisions = poller.decide(decision_response)
+    except Exception as err:
+        # e.g. cannot fetch the history: the decision task will time out
+        logger.error(f"cannot take decision for {workflow_str}: {err}")
+        return
     try:
         logger.info(f"completing decision for {workflow_str}")
         poller.complete_with_retry(decision_response.token, decisions)
@@ -16,6 +16,8 @@ def start(
     is_standalone=False,
     repair_workflow_id=None,
     repair_run_id=None,
+    max_tasks_per_child=None,
+    max_rss_per_child=None,
 ):
     """
     Start a decider.
@@ -39,6 +41,10 @@ def start(
     :type repair_workflow_id: Optional[str]
     :param repair_run_id: run ID to repair
     :type repair_run_id: Optional[str]
+    :param max_tasks_per_child: replace a poller process after it processed this many decisions
+    :type max_tasks_per_child: Optional[int]
+    :param max_rss_per_child: replace a poller process when its memory usage exceeds this many MB
+    :type max_rss_per_child: Optional[int]
     """
     if log_level:
         logger.warning("Deprecated: --log-level will be removed, use LOG_LEVEL environment variable instead")
@@ -52,6 +58,8 @@ def start(
         is_standalone=is_standalone,
         repair_workflow_id=repair_workflow_id,
         repair_run_id=repair_run_id,
+        max_tasks_per_child=max_tasks_per_child,
+        max_rss_per_child=max_rss_per_child,
     )
     decider.is_alive = True
     decider.start()
@@ -5,6 +5,7 @@ from simpleflow import logger
 from simpleflow.swf.executor import Executor
 from simpleflow.utils import import_from_module
 
+from . import registration
 from .base import Decider, DeciderPoller
 
 
@@ -104,6 +105,8 @@ def make_decider_poller(
         )
         for workflow in workflows
     ]
+    # register the types before the first decision needs them
+    registration.register_types(domain, registration.discover_types(ex.workflow_class for ex in executors))
     return DeciderPoller(executors, domain, task_list, is_standalone)
 
 
@@ -117,6 +120,8 @@ def make_decider(
     is_standalone=False,
     repair_workflow_id=None,
     repair_run_id=None,
+    max_tasks_per_child=None,
+    max_rss_per_child=None,
 ):
     """
     Instantiate a Decider.
@@ -138,6 +143,10 @@ def make_decider(
     :type repair_workflow_id: Optional[str]
     :param repair_run_id: run ID to repair
     :type repair_run_id: Optional[str]
+    :param max_tasks_per_child: replace a poller process after it processed this many decisions
+    :type max_tasks_per_child: Optional[int]
+    :param max_rss_per_child: replace a poller process when its memory usage exceeds this many MB
+    :type max_rss_per_child: Optional[int]
     :return:
     :rtype: Decider
     """
@@ -151,4 +160,9 @@ def make_decider(
         repair_workflow_id=repair_workflow_id,
         repair_run_id=repair_run_id,
     )
-    return Decider(poller, nb_children=nb_children)
+    return Decider(
+        poller,
+        nb_children=nb_children,
+        max_tasks_per_child=max_tasks_per_child,
+        max_rss_per_child=max_rss_per_child,
+    )
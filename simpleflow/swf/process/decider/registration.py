@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable
+
+import simpleflow.swf.mapper.exceptions
+import simpleflow.swf.mapper.models
+from simpleflow import logger, settings
+from simpleflow.activity import Activity
+from simpleflow.swf.mapper.models import registration_cache
+from simpleflow.utils import issubclass_
+from simpleflow.workflow import Workflow
+
+if TYPE_CHECKING:
+    TypeKey = tuple[str, str, str]  # kind, name, version
+
+
+def discover_types(workflow_classes: Iterable[type[Workflow]]) -> set[TypeKey]:
+    """
+    Activity and workflow types the workflows may schedule: the activities and
+    workflows defined in, or imported by, the modules of `workflow_classes`.
+
+    Activities only reachable otherwise (e.g. as attributes of an imported
+    module) are registered by the executor when it first fails to schedule
+    them.
+    """
+    types = set()
+    for workflow_class in workflow_classes:
+        module = sys.modules.get(workflow_class.__module__)
+        for value in vars(module).values() if module else ():
+            if isinstance(value, Activity) and value.version:
+                types.add((registration_cache.ACTIVITY_TYPE, value.name, value.version))
+            elif issubclass_(value, Workflow) and value is not Workflow and value.version:
+                # same name as the child workflows, see WorkflowTask.schedule()
+                types.add((registration_cache.WORKFLOW_TYPE, f"{value.__module__}.{value.__name__}", value.version))
+    return types
+
+
+def register_types(domain: simpleflow.swf.mapper.models.Domain, types: Iterable[TypeKey]) -> None:
+    """
+    Register the types missing in the domain, concurrently. Types known to be
+    registered, from a previous start, are skipped. Errors are only logged: the
+    executor registers the types it fails to schedule, too.
+    """
+    missing = [key for key in types if not registration_cache.is_registered(key[0], domain.name, key[1], key[2])]
+    if not missing or not settings.DECIDER_REGISTER_TYPES_WORKERS:
+        return
+
+    def register(key: TypeKey) -> None:
+        kind, name, version = key
+        model_class = (
+            simpleflow.swf.mapper.models.ActivityType
+            if kind == registration_cache.ACTIVITY_TYPE
+            else simpleflow.swf.mapper.models.WorkflowType
+        )
+        try:
+            model_class(domain, name, version=version).save()
+            logger.info(f"registered {kind} {name} (version {version}) in domain {domain.name}")
+        except simpleflow.swf.mapper.exceptions.AlreadyExistsError:
+            pass
+        except Exception as err:
+            logger.warning(f"cannot register {kind} {name} (version {version}) in domain {domain.name}: {err}")
+            return
+        registration_cache.set_registered(kind, domain.name, name, version)
+
+    logger.debug(f"registering {len(missing)} types in domain {domain.name}")
+    with ThreadPoolExecutor(min(len(missing), settings.DECIDER_REGISTER_TYPES_WORKERS)) as executor:
+        list(executor.map(register, missing))
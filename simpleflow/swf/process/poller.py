@@ -8,7 +8,7 @@ from typing import TYPE_CHECKING, Any
 import simpleflow.swf.mapper.actors
 import simpleflow.swf.mapper.exceptions
 from simpleflow import logger, utils
-from simpleflow.process import NamedMixin, with_state
+from simpleflow.process import NamedMixin, record_task_processed, with_state
 from simpleflow.swf.helpers import swf_identity
 
 if TYPE_CHECKING:
@@ -76,6 +76,7 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
             except simpleflow.swf.mapper.exceptions.PollTimeout:
                 continue
             self.process(response)
+            record_task_processed()
 
     @with_state("running")
     def run_once(self):
@@ -102,21 +103,25 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
         logger.info("stopping %s", self.name)
         self.is_alive = False  # No longer take requests.
 
+    @property
+    def retry_policy(self) -> utils.retry.RetryPolicy:
+        """
+        Retries of the SWF calls: throttling, server and connection errors
+        are retried with jittered delays, within the retry budget of the process.
+        """
+        return utils.retry.RetryPolicy(
+            max_attempts=self.nb_retries,
+            is_retryable=simpleflow.swf.mapper.exceptions.is_retryable_error,
+            log_with=logger.exception,
+        )
+
     def complete_with_retry(self, token: str, response: Any) -> None:
         """
         Complete with retry.
         response: decision list, JSON result, ...
         """
         try:
-            complete = utils.retry.with_delay(
-                nb_times=self.nb_retries,
-                delay=utils.retry.exponential,
-                log_with=logger.exception,
-                except_on=simpleflow.swf.mapper.exceptions.DoesNotExistError,
-            )(
-                self.complete
-            )  # Exponential backoff on errors.
-            complete(token, response)
+            self.retry_policy.call(self.complete, token, response)
         except Exception as err:
             # This is embarrassing because the decider cannot notify SWF of the
             # task completion. As it will not try again, the task will
@@ -143,11 +148,13 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
         """
         return f"{self.__class__.__name__}()"
 
-    def poll_with_retry(self):
+    def poll_with_retry(self, task_list: str | None = None):
         """
         Polls a task represented by its token and data. It uses long-polling
         with a timeout of one minute.
 
+        :param task_list: task list to poll; defaults to self.task_list
+
         See also
         http://docs.aws.amazon.com/amazonswf/latest/apireference/API_PollForDecisionTask.html#API_PollForDecisionTask_RequestSyntax
         http://docs.aws.amazon.com/amazonswf/latest/apireference/API_PollForActivityTask.html#API_PollForActivityTask_RequestSyntax
@@ -155,17 +162,11 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
         :returns:
         :rtype:  simpleflow.swf.mapper.responses.Response
         """
-        task_list = self.task_list
+        task_list = task_list or self.task_list
         identity = self.identity
 
         logger.debug("polling task on %s", task_list)
-        poll = utils.retry.with_delay(
-            nb_times=self.nb_retries,
-            delay=utils.retry.exponential,
-            log_with=logger.exception,
-            on_exceptions=simpleflow.swf.mapper.exceptions.ResponseError,
-        )(self.poll)
-        response = poll(task_list, identity=identity)
+        response = self.retry_policy.call(self.poll, task_list, identity=identity)
         return response
 
     @abc.abstractmethod
@@ -174,11 +175,4 @@ class Poller(simpleflow.swf.mapper.actors.Actor, NamedMixin):
         raise NotImplementedError
 
     def fail_with_retry(self, *args, **kwargs):
-        fail = utils.retry.with_delay(
-            nb_times=self.nb_retries,
-            delay=utils.retry.exponential,
-            log_with=logger.exception,
-            on_exceptions=simpleflow.swf.mapper.exceptions.ResponseError,
-        )(self.fail)
-        response = fail(*args, **kwargs)
-        return response
+        return self.retry_policy.call(self.fail, *args, **kwargs)
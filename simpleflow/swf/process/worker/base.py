@@ -3,8 +3,11 @@ from __future__ import annotations
 import json
 import os
 import sys
+import threading
+import time
 import traceback
 from base64 import b64decode
+from collections import deque
 from typing import TYPE_CHECKING, Any
 
 import multiprocess
@@ -12,12 +15,13 @@ import psutil
 
 import simpleflow.swf.mapper.actors
 import simpleflow.swf.mapper.exceptions
-from simpleflow import format, logger, settings
+from simpleflow import constants, format, logger, logging_context, settings
 from simpleflow.dispatch import dynamic_dispatcher
 from simpleflow.download import download_binaries
 from simpleflow.exceptions import ExecutionError
-from simpleflow.process import Supervisor, with_state
+from simpleflow.process import FileSemaphore, Supervisor, record_task_processed, with_state
 from simpleflow.swf.process.poller import Poller
+from simpleflow.swf.process.worker.task_lists import TaskListSelector, TaskListSpec
 from simpleflow.swf.task import ActivityTask
 from simpleflow.swf.utils import sanitize_activity_context
 from simpleflow.utils import format_exc, format_exc_type, json_dumps
@@ -30,11 +34,13 @@ if TYPE_CHECKING:
 
 
 class Worker(Supervisor):
-    def __init__(self, poller, nb_children=None):
+    def __init__(self, poller, nb_children=None, max_tasks_per_child=None, max_rss_per_child=None):
         self._poller = poller
         super().__init__(
             payload=self._poller.start,
             nb_children=nb_children,
+            max_tasks_per_child=max_tasks_per_child,
+            max_rss_per_child=max_rss_per_child,
         )
 
 
@@ -50,10 +56,17 @@ class ActivityPoller(Poller, simpleflow.swf.mapper.actors.ActivityWorker):
         middlewares: dict[str, str] | None = None,
         heartbeat: int = 60,
         poll_data: str | None = None,
+        prefetch: int = 0,
+        task_lists: list[TaskListSpec] | None = None,
+        concurrency_limits: dict[str, int] | None = None,
     ) -> None:
         """
         :param middlewares: Paths to middleware functions to execute before and after any Activity
         :param process_mode: Whether to process locally (default)
+        :param prefetch: Number of tasks to poll ahead while the current one is processed (0 to disable)
+        :param task_lists: Several task lists to poll, instead of task_list
+        :param concurrency_limits: Maximum number of tasks processed at once on this host, by activity name;
+            overrides the activities' own max_concurrency_per_host
         """
         self.nb_retries = 3
         # heartbeat=0 is a special value to disable heartbeating. We want to
@@ -63,12 +76,191 @@ class ActivityPoller(Poller, simpleflow.swf.mapper.actors.ActivityWorker):
         self.middlewares = middlewares
 
         self.poll_data = poll_data
+        self.prefetch = prefetch
+        self._task_list_selector = None
+        self._task_list_slots = {}
+        self.concurrency_limits = concurrency_limits or {}
+        self._concurrency_semaphores = {}
+        # held by background threads while they use state a forked task
+        # process could inherit in an inconsistent state, and while forking
+        self._fork_lock = threading.Lock()
+        if task_lists:
+            if task_list:
+                raise ValueError("task_list and task_lists are mutually exclusive")
+            self._task_list_selector = TaskListSelector(task_lists)
+            task_list = ",".join(spec.name for spec in task_lists)
         super().__init__(domain, task_list)
 
     @property
     def name(self):
         return f"{self.__class__.__name__}(task_list={self.task_list})"
 
+    def start(self):
+        if self.prefetch and not self.poll_data:
+            return self.start_with_prefetch()
+        return super().start()
+
+    @with_state("running")
+    def start_with_prefetch(self):
+        """
+        Like start(), but a background thread polls up to `self.prefetch` tasks
+        ahead, so the next task is ready as soon as the current one finishes.
+
+        Queued tasks are already started on SWF: another thread heartbeats them
+        (a poll can last 60 seconds), so prefetching should only be used with
+        heartbeats enabled or with a start-to-close timeout leaving room for the
+        queueing delay.
+        """
+        logger.info("starting %s on domain %s with prefetch=%d", self.name, self.domain.name, self.prefetch)
+        self.bind_signal_handlers()
+        self.is_alive = True
+        self.set_process_name()
+
+        self._prefetched = deque()
+        self._prefetched_condition = threading.Condition()
+        self._prefetcher = threading.Thread(target=self._prefetch_loop, name="prefetch", daemon=True)
+        self._prefetcher.start()
+        self._prefetch_heartbeater = threading.Thread(
+            target=self._prefetch_heartbeat_loop, name="prefetch-heartbeat", daemon=True
+        )
+        self._prefetch_heartbeater.start()
+
+        # when stopping, tasks already polled are processed before exiting
+        while True:
+            response = self._next_prefetched()
+            if response is None:
+                break
+            self._set_logging_context(response)
+            self.process(response)
+            record_task_processed()
+
+    def _next_prefetched(self) -> Response | None:
+        """
+        Wait for a prefetched task. Returns None once the poller is stopped and
+        there is nothing left to process.
+        """
+        with self._prefetched_condition:
+            while not self._prefetched:
+                if not self.is_alive and not self._prefetcher.is_alive():
+                    return None
+                # NB: short timeout so we notice signals and a dead prefetcher
+                self._prefetched_condition.wait(timeout=1)
+            response = self._prefetched.popleft()[0]
+            self._prefetched_condition.notify_all()
+            return response
+
+    def _prefetch_loop(self) -> None:
+        """
+        Prefetching thread: keep the queue filled.
+
+        NB: task processes may be forked while this thread polls. Its client is
+        replaced in the children (see `process_task()`), which don't use any
+        other state of this thread.
+        """
+        while self.is_alive:
+            with self._prefetched_condition:
+                if len(self._prefetched) >= self.prefetch:
+                    self._prefetched_condition.wait(timeout=1)
+                    continue
+            try:
+                response = self.poll_with_retry()
+            except simpleflow.swf.mapper.exceptions.PollTimeout:
+                continue
+            except Exception:
+                # Like an exception in the main polling loop, this stops the
+                # process; the supervisor will start a new one.
+                logger.exception("prefetch: cannot poll, stopping %s", self.name)
+                self.is_alive = False
+                break
+            with self._prefetched_condition:
+                self._prefetched.append([response, time.monotonic()])
+                self._prefetched_condition.notify_all()
+
+    def _prefetch_heartbeat_loop(self) -> None:
+        """
+        Heartbeating thread: heartbeat queued tasks until they are all processed.
+        """
+        while self.is_alive or self._prefetched:
+            with self._fork_lock:
+                self._heartbeat_prefetched()
+            with self._prefetched_condition:
+                self._prefetched_condition.wait(timeout=1)
+
+    def _heartbeat_prefetched(self) -> None:
+        """
+        Heartbeat queued tasks that were not heartbeated for `self._heartbeat`
+        seconds, dropping those that are gone or cancelled.
+        """
+        if not self._heartbeat:
+            return
+        now = time.monotonic()
+        with self._prefetched_condition:
+            due = [item for item in self._prefetched if now - item[1] >= self._heartbeat]
+        dropped = []
+        for item in due:
+            response = item[0]
+            try:
+                heartbeat_response = self.heartbeat(response.task_token)
+            except simpleflow.swf.mapper.exceptions.DoesNotExistError as error:
+                logger.warning(f"prefetch: dropping task {response.activity_task.activity_id}: {error}")
+                dropped.append(item)
+                continue
+            except Exception as error:
+                logger.warning(f"prefetch: cannot heartbeat task {response.activity_task.activity_id}: {error}")
+                continue
+            item[1] = now
+            if heartbeat_response and heartbeat_response.get("cancelRequested"):
+                logger.info(f"prefetch: task {response.activity_task.activity_id} cancelled before it started")
+                dropped.append(item)
+                try:
+                    self.cancel(response.task_token)
+                except Exception as error:
+                    logger.warning(f"prefetch: cannot cancel task {response.activity_task.activity_id}: {error}")
+        if dropped:
+            with self._prefetched_condition:
+                for item in dropped:
+                    if item in self._prefetched:
+                        self._prefetched.remove(item)
+                        self._release_task_list_slot(item[0].task_token)
+                self._prefetched_condition.notify_all()
+
+    @staticmethod
+    def _set_logging_context(response: Response) -> None:
+        # The prefetching thread overwrites the (process-wide) logging context
+        # when polling: restore the one of the task we are about to process.
+        task = response.raw_response
+        logging_context.reset()
+        logging_context.set("workflow_id", task["workflowExecution"]["workflowId"])
+        logging_context.set("task_type", "activity")
+        logging_context.set("event_id", task["startedEventId"])
+        logging_context.set("activity_id", task["activityId"])
+
+    def poll_with_retry(self, task_list: str | None = None):
+        """
+        When polling several task lists, select one (and reserve a slot on it
+        if it has a concurrency limit) before polling it.
+        """
+        if task_list or not self._task_list_selector:
+            return super().poll_with_retry(task_list)
+
+        selected = self._task_list_selector.acquire()
+        if not selected:
+            # all task lists are at their concurrency limit: wait a bit
+            time.sleep(1)
+            raise simpleflow.swf.mapper.exceptions.PollTimeout("all task lists are at their concurrency limit")
+        task_list, slot = selected
+        try:
+            response = super().poll_with_retry(task_list)
+        except simpleflow.swf.mapper.exceptions.PollTimeout:
+            self._task_list_selector.mark_idle(task_list)
+            self._task_list_selector.release(task_list, slot)
+            raise
+        except Exception:
+            self._task_list_selector.release(task_list, slot)
+            raise
+        self._task_list_slots[response.task_token] = (task_list, slot)
+        return response
+
     @with_state("polling")
     def poll(self, task_list: str | None = None, identity: str | None = None) -> Response:
         if self.poll_data:
@@ -98,7 +290,53 @@ class ActivityPoller(Poller, simpleflow.swf.mapper.actors.ActivityWorker):
         """
         token = response.task_token
         task = response.activity_task
-        spawn(self, token, task, self.middlewares, self._heartbeat)
+        semaphore = self._get_concurrency_semaphore(task.activity_type.name)
+        slot = semaphore.try_acquire() if semaphore else None
+        try:
+            if semaphore and slot is None:
+                # Hand the task back instead of waiting for a slot: the decider
+                # reschedules it later, maybe on another host.
+                logger.info(f"activity {task.activity_type.name} is at its concurrency limit, releasing task")
+                self.fail_with_retry(token, task, reason=constants.CONCURRENCY_LIMIT_REASON)
+                return
+            spawn(self, token, task, self.middlewares, self._heartbeat)
+        finally:
+            if slot is not None:
+                semaphore.release(slot)
+            self._release_task_list_slot(token)
+
+    def _get_concurrency_semaphore(self, activity_name: str) -> FileSemaphore | None:
+        """
+        Host-wide semaphore enforcing the concurrency limit of an activity, if any.
+
+        The poller process doesn't import activities, whose code it would keep
+        (see `Dispatcher`): the limit declared by an activity is only known here
+        if it was preloaded, else see `_get_declared_concurrency_semaphore()`.
+        """
+        if activity_name not in self._concurrency_semaphores:
+            activity = dynamic_dispatcher.Dispatcher.cached_activity(activity_name)
+            limit = self.concurrency_limits.get(activity_name, getattr(activity, "max_concurrency_per_host", None))
+            self._concurrency_semaphores[activity_name] = _concurrency_semaphore(activity_name, limit)
+        return self._concurrency_semaphores[activity_name]
+
+    def _get_declared_concurrency_semaphore(self, activity_name: str) -> FileSemaphore | None:
+        """
+        Semaphore of the limit declared by an activity that `process()` couldn't
+        check. Called by the process handling the task, which imports the
+        activity anyway.
+        """
+        if activity_name in self.concurrency_limits or dynamic_dispatcher.Dispatcher.cached_activity(activity_name):
+            return None
+        try:
+            activity = dynamic_dispatcher.Dispatcher.dispatch_activity(activity_name)
+        except Exception:
+            # The error is reported when the task is processed
+            return None
+        return _concurrency_semaphore(activity_name, getattr(activity, "max_concurrency_per_host", None))
+
+    def _release_task_list_slot(self, token: str) -> None:
+        if token in self._task_list_slots:
+            self._task_list_selector.release(*self._task_list_slots.pop(token))
 
     @with_state("completing")
     def complete(self, token: str, result: str | None = None) -> None:
@@ -180,11 +418,29 @@ class ActivityWorker:
             poller.fail_with_retry(token, task, reason)
 
 
+def _concurrency_semaphore(activity_name: str, limit: int | None) -> FileSemaphore | None:
+    if not limit:
+        return None
+    return FileSemaphore(os.path.join(constants.LOCKS_DIR, "activities", activity_name), limit)
+
+
 def process_task(poller, token: str, task: ActivityTask, middlewares: dict[str, str] | None = None) -> None:
     logger.debug("process_task()")
-    format.JUMBO_FIELDS_MEMORY_CACHE.clear()
-    worker = ActivityWorker()
-    worker.process(poller, token, task, middlewares)
+    # The parent process keeps using its SWF client (heartbeats, prefetching
+    # thread): don't share its connection pool.
+    poller.reset_client()
+    semaphore = poller._get_declared_concurrency_semaphore(task.activity_type.name)
+    slot = semaphore.try_acquire() if semaphore else None
+    if semaphore and slot is None:
+        logger.info(f"activity {task.activity_type.name} is at its concurrency limit, releasing task")
+        poller.fail_with_retry(token, task, reason=constants.CONCURRENCY_LIMIT_REASON)
+        return
+    try:
+        worker = ActivityWorker()
+        worker.process(poller, token, task, middlewares)
+    finally:
+        if slot is not None:
+            semaphore.release(slot)
 
 
 def reap_process_tree(pid: int, wait_timeout: float = settings.ACTIVITY_SIGTERM_WAIT_SEC) -> None:
@@ -237,7 +493,8 @@ def spawn(
     """
     logger.info("spawning new activity id=%s worker heartbeat=%s", task.activity_id, heartbeat)
     worker = multiprocess.Process(target=process_task, args=(poller, token, task, middlewares))
-    worker.start()
+    with poller._fork_lock:
+        worker.start()
 
     def worker_alive():
         return psutil.pid_exists(worker.pid)
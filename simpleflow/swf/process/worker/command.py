@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import simpleflow.swf.mapper.models
+from simpleflow.dispatch import dynamic_dispatcher
 
 from .base import ActivityPoller, Worker
+from .task_lists import TaskListSpec
 
 
 def make_worker_poller(
@@ -11,6 +13,9 @@ def make_worker_poller(
     middlewares: dict[str, str] | None,
     heartbeat: int,
     poll_data: str,
+    prefetch: int = 0,
+    task_lists: list[TaskListSpec] | None = None,
+    concurrency_limits: dict[str, int] | None = None,
 ) -> ActivityPoller:
     """
     Make a worker poller for the domain and task list.
@@ -22,17 +27,26 @@ def make_worker_poller(
         middlewares=middlewares,
         heartbeat=heartbeat,
         poll_data=poll_data,
+        prefetch=prefetch,
+        task_lists=task_lists,
+        concurrency_limits=concurrency_limits,
     )
 
 
 def start(
     domain: str,
-    task_list: str,
+    task_list: str | None,
     middlewares: dict[str, str] | None = None,
     nb_processes: int | None = None,
     heartbeat: int = 60,
     one_task: bool = False,
     poll_data: str | None = None,
+    max_tasks_per_child: int | None = None,
+    max_rss_per_child: int | None = None,
+    prefetch: int = 0,
+    task_lists: list[TaskListSpec] | None = None,
+    concurrency_limits: dict[str, int] | None = None,
+    preload: list[str] | None = None,
 ):
     """
     Start a worker for the given domain and task_list.
@@ -41,13 +55,25 @@ def start(
     heartbeat: heartbeat frequency in seconds
     one_task: Process only one task then shutdown
     poll_data: Base64 encoded poll data from SWF, in case you don't want to poll directly.
+    max_tasks_per_child: Replace a poller process after it processed this many tasks
+    max_rss_per_child: Replace a poller process when its memory usage exceeds this many MB
+    prefetch: Number of tasks each poller process polls ahead of the one it processes
+    task_lists: Several task lists to poll with their scheduling options, instead of task_list
+    concurrency_limits: Maximum number of tasks processed at once on this host, by activity name
+    preload: Modules to import before forking the poller processes
     """
+    for module_name in preload or ():
+        dynamic_dispatcher.Dispatcher.preload(module_name)
+
     poller = make_worker_poller(
         domain=domain,
         task_list=task_list,
         middlewares=middlewares,
         heartbeat=heartbeat,
         poll_data=poll_data,
+        prefetch=prefetch,
+        task_lists=task_lists,
+        concurrency_limits=concurrency_limits,
     )
 
     if poll_data:
@@ -57,6 +83,11 @@ def start(
     if one_task:
         poller.run_once()
     else:
-        worker = Worker(poller, nb_processes)
+        worker = Worker(
+            poller,
+            nb_processes,
+            max_tasks_per_child=max_tasks_per_child,
+            max_rss_per_child=max_rss_per_child,
+        )
         worker.is_alive = True
         worker.start()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+import weakref
+
+import attr
+import multiprocess
+
+from simpleflow import constants
+from simpleflow.process import FileSemaphore
+
+# How long a task list is deprioritized after a poll on it timed out (seconds).
+IDLE_DELAY = 30
+
+
+@attr.s
+class TaskListSpec:
+    """
+    A task list polled by an ActivityPoller, with its scheduling options:
+
+    - weight: share of the polls among task lists of the same priority
+    - priority: task lists with a higher priority are polled first, unless
+      they are idle or at their concurrency limit
+    - max_concurrency: maximum number of tasks from this task list processed
+      at once by all the processes of a worker
+    """
+
+    name: str = attr.ib()
+    weight: int = attr.ib(default=1)
+    priority: int = attr.ib(default=0)
+    max_concurrency: int | None = attr.ib(default=None)
+
+    @property
+    def has_options(self) -> bool:
+        return (self.weight, self.priority, self.max_concurrency) != (1, 0, None)
+
+
+def parse_task_list(value: str) -> TaskListSpec:
+    """
+    Parse a task list specification: `name[:weight=N,priority=N,max=N]`.
+
+    >>> parse_task_list("foo")
+    TaskListSpec(name='foo', weight=1, priority=0, max_concurrency=None)
+    >>> parse_task_list("foo:weight=3,max=2")
+    TaskListSpec(name='foo', weight=3, priority=0, max_concurrency=2)
+    """
+    name, _, options = value.partition(":")
+    if not name:
+        raise ValueError(f"missing task list name in {value!r}")
+    keys = {"weight": "weight", "priority": "priority", "max": "max_concurrency"}
+    kwargs = {}
+    for option in filter(None, options.split(",")):
+        key, _, number = option.partition("=")
+        if key not in keys:
+            raise ValueError(f"invalid option {key!r} for task list {name!r}, expected one of {', '.join(keys)}")
+        try:
+            kwargs[keys[key]] = int(number)
+        except ValueError:
+            raise ValueError(f"invalid value {number!r} for option {key!r} of task list {name!r}, expected an integer")
+    return TaskListSpec(name, **kwargs)
+
+
+class TaskListSelector:
+    """
+    Chooses which task list an ActivityPoller polls next.
+
+    Task lists of the highest priority are served with a smooth weighted
+    round-robin (as in nginx); task lists whose last poll timed out are skipped
+    for a while, and those at their concurrency limit are skipped until a slot
+    frees up. Idle marks and concurrency slots are shared by all the processes
+    forked after the selector was created, i.e. the children of a supervisor.
+    """
+
+    def __init__(self, specs: list[TaskListSpec]) -> None:
+        if not specs:
+            raise ValueError("at least one task list is needed")
+        self.specs = specs
+        parent_dir = os.path.join(constants.LOCKS_DIR, "task-lists")
+        os.makedirs(parent_dir, exist_ok=True)
+        lock_dir = tempfile.mkdtemp(dir=parent_dir)
+        weakref.finalize(self, _remove_lock_dir, lock_dir, os.getpid())
+        self._semaphores = {
+            spec.name: FileSemaphore(os.path.join(lock_dir, spec.name), spec.max_concurrency)
+            for spec in specs
+            if spec.max_concurrency
+        }
+        self._idle_until = multiprocess.Array("d", len(specs))
+        self._current_weights = [0] * len(specs)
+
+    def acquire(self) -> tuple[str, int | None] | None:
+        """
+        Select a task list and reserve a concurrency slot on it. Returns the
+        task list name and slot (to pass to `release()`), or None if all task
+        lists are at their limit.
+        """
+        now = time.time()
+        candidates = list(range(len(self.specs)))
+        active = [i for i in candidates if self._idle_until[i] <= now] or candidates
+        while active:
+            index = self._next_index(active)
+            spec = self.specs[index]
+            semaphore = self._semaphores.get(spec.name)
+            if not semaphore:
+                return spec.name, None
+            slot = semaphore.try_acquire()
+            if slot is not None:
+                return spec.name, slot
+            active.remove(index)
+        return None
+
+    def release(self, name: str, slot: int | None) -> None:
+        if slot is not None:
+            self._semaphores[name].release(slot)
+
+    def mark_idle(self, name: str) -> None:
+        for index, spec in enumerate(self.specs):
+            if spec.name == name:
+                self._idle_until[index] = time.time() + IDLE_DELAY
+
+    def _next_index(self, indexes: list[int]) -> int:
+        top_priority = max(self.specs[i].priority for i in indexes)
+        tier = [i for i in indexes if self.specs[i].priority == top_priority]
+        for i in tier:
+            self._current_weights[i] += self.specs[i].weight
+        selected = max(tier, key=lambda i: self._current_weights[i])
+        self._current_weights[selected] -= sum(self.specs[i].weight for i in tier)
+        return selected
+
+
+def _remove_lock_dir(path: str, pid: int) -> None:
+    # not from the forked processes, which share it
+    if os.getpid() == pid:
+        shutil.rmtree(path, ignore_errors=True)
@@ -4,7 +4,7 @@ import operator
 from datetime import datetime
 from functools import partial, wraps
 from itertools import chain
-from typing import TYPE_CHECKING, Any, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
 
 from tabulate import tabulate
 
@@ -196,7 +196,7 @@ def formatted(with_header: bool = False, fmt: callable = DEFAULT_FORMAT) -> call
         def wrapped(*args, **kwargs):
             header, rows = func(*args, **kwargs)
             return fmt(
-                rows,
+                rows if isinstance(rows, (list, tuple)) else list(rows),
                 headers=header if (with_header or fmt == human) else [],
             )
 
@@ -208,21 +208,58 @@ def formatted(with_header: bool = False, fmt: callable = DEFAULT_FORMAT) -> call
     return formatter
 
 
-def list_executions(workflow_executions: list[WorkflowExecution]) -> tuple[Sequence, Sequence]:
+def streamed(with_header: bool = False, fmt: str | callable = DEFAULT_FORMAT) -> callable:
+    """
+    Like `formatted()`, but the decorated function returns an iterator of
+    output chunks, and its rows can be an iterator too: with the csv, tsv
+    and json formats, rows are formatted as they come. Other formats need
+    all the rows, e.g. to compute the width of the columns.
+    """
+    fmt_name = fmt if isinstance(fmt, str) else None
+
+    def formatter(func):
+        @wraps(func)
+        def wrapped(*args, **kwargs) -> Iterator[str]:
+            header, rows = func(*args, **kwargs)
+            if fmt_name in ("csv", "tsv"):
+                for row in rows:
+                    yield FORMATS[fmt_name]([row], headers=[])
+            elif fmt_name == "json":
+                yield from _stream_json(rows, header if with_header else None)
+            else:
+                yield formatted(with_header, fmt)(lambda: (header, list(rows)))()
+
+        return wrapped
+
+    return formatter
+
+
+def _stream_json(rows: Iterable[Sequence[Any]], headers: Sequence[str] | None) -> Iterator[str]:
+    """
+    Chunks of `jsonify(rows, headers)`.
+    """
+    yield "["
+    for i, row in enumerate(rows):
+        value = dict(zip(headers, row)) if headers else row
+        yield ("," if i else "") + json_dumps(value)
+    yield "]"
+
+
+def list_executions(workflow_executions: Iterable[WorkflowExecution]) -> tuple[Sequence, Iterable]:
     header = "Workflow ID", "Workflow Type", "Status"
-    rows = [
+    rows = (
         (
             execution.workflow_id,
             execution.workflow_type.name,
             execution.status,
         )
         for execution in workflow_executions
-    ]
+    )
 
     return header, rows
 
 
-def list_details(workflow_executions: list[WorkflowExecution]) -> tuple[Sequence, Sequence]:
+def list_details(workflow_executions: Iterable[WorkflowExecution]) -> tuple[Sequence, Iterable]:
     header = (
         "Workflow ID",
         "Workflow Type",
@@ -240,7 +277,7 @@ def list_details(workflow_executions: list[WorkflowExecution]) -> tuple[Sequence
         "Tags",
         "Decision Tasks Timeout",
     )
-    rows = [
+    rows = (
         (
             execution.workflow_id,
             execution.workflow_type.name,
@@ -259,7 +296,7 @@ def list_details(workflow_executions: list[WorkflowExecution]) -> tuple[Sequence
             execution.decision_tasks_timeout,
         )
         for execution in workflow_executions
-    ]
+    )
 
     return header, rows
 
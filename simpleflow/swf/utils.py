@@ -133,3 +133,19 @@ def add_workflow_class_name(wf_input: dict, workflow_or_class: type) -> dict:
     rc = wf_input.copy()
     set_workflow_class_name(rc, workflow_or_class)
     return rc
+
+
+def transform_input(wf_input):
+    if isinstance(wf_input, dict):
+        return wf_input
+    if isinstance(wf_input, list):
+        wf_input = {
+            "args": wf_input,
+            "kwargs": {},
+        }
+    else:
+        wf_input = {
+            "args": [wf_input],
+            "kwargs": {},
+        }
+    return wf_input
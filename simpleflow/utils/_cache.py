@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
+
+class LRUCache:
+    """
+    Thread-safe mapping evicting its least recently used items once the total
+    size of the values exceeds `max_size`. Values larger than `max_size` are
+    not stored.
+
+    >>> cache = LRUCache(max_size=6)
+    >>> cache["a"] = "abc"
+    >>> cache["b"] = "def"
+    >>> _ = cache.get("a")
+    >>> cache["c"] = "ghi"
+    >>> sorted(cache.keys()), cache.hits, cache.misses
+    (['a', 'c'], 1, 0)
+    """
+
+    def __init__(self, max_size: int, sizeof: Callable[[Any], int] = len) -> None:
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[Any, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(max_size={self.max_size}, size={self.size}, items={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._items
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            value, _ = self._items[key]
+            self._items.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._items:
+                self.size -= self._items.pop(key)[1]
+            if size > self.max_size:
+                return
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_size:
+                self.size -= self._items.popitem(last=False)[1][1]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def keys(self) -> list[Any]:
+        return list(self._items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
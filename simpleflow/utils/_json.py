@@ -1,16 +1,47 @@
 from __future__ import annotations
 
 import datetime
+import enum
 import json
+import json.encoder
+import math
+import re
 import types
+from collections.abc import Iterator
 from uuid import UUID
 
 import lazy_object_proxy
 
+from simpleflow import settings
 from simpleflow.futures import Future
 
+try:
+    import orjson
+except ImportError:  # optional, see the "fast-json" extra
+    orjson = None
+
+if orjson:
+    # datetimes go through serialize_complex_object (milliseconds, "Z");
+    # dataclasses too, which raises like json.dumps
+    ORJSON_DUMPS_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+# orjson formats some floats differently ("1e16" vs "1e+16", "0.00001" vs "1e-05")
+# and dumps NaN and infinities as null: such outputs are redone with json.dumps().
+# Plain substring searches are much faster than a single regex; null may also
+# be a None, so NaN and infinities are looked for in the object.
+_ORJSON_EXPONENT_RE = re.compile(rb"e-?[0-9]+(?:[],}]|$)")
+# orjson loads integers that don't fit in 64 bits as floats: documents with
+# 19 digits in a row are loaded with json.loads()
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+
+# json.dumps() escapes everything but printable ASCII characters
+_NON_ASCII_RE = re.compile("[^\x00-\x7e]")
+
 
 def serialize_complex_object(obj):
+    if isinstance(obj, lazy_object_proxy.Proxy):
+        # the encoder calls us again if the wrapped object needs it
+        return obj.__wrapped__
     if isinstance(obj, bytes):  # Python 3 only (serialize_complex_object not called here in Python 2)
         return obj.decode("utf-8", errors="replace")
     if isinstance(obj, datetime.datetime):
@@ -33,10 +64,12 @@ def serialize_complex_object(obj):
         return obj.result
     elif isinstance(obj, UUID):
         return str(obj)
-    elif isinstance(obj, lazy_object_proxy.Proxy):
-        return obj.__wrapped__
     elif isinstance(obj, (set, frozenset)):
         return list(obj)
+    elif isinstance(obj, enum.Enum):
+        # like orjson, which doesn't call `default` on enums (int and str
+        # enums don't get here)
+        return obj.value
     raise TypeError(
         f"Type {type(obj).__name__} couldn't be serialized. This may be a bug in simpleflow,"
         f" please file a new issue on GitHub!"
@@ -44,15 +77,73 @@ def serialize_complex_object(obj):
 
 
 def _resolve_proxy(obj):
+    if isinstance(obj, lazy_object_proxy.Proxy):
+        return _resolve_proxy(obj.__wrapped__)
     if isinstance(obj, dict):
         return {k: _resolve_proxy(v) for k, v in obj.items()}
     if isinstance(obj, (list, tuple)):
         return [_resolve_proxy(v) for v in obj]
-    if isinstance(obj, lazy_object_proxy.Proxy):
-        return str(obj)
     return obj
 
 
+def _has_non_finite_float(obj) -> bool:
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, float):
+            if not math.isfinite(obj):
+                return True
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return False
+
+
+def _escape_non_ascii(match):
+    n = ord(match.group(0))
+    if n < 0x10000:
+        return f"\\u{n:04x}"
+    # surrogate pair
+    n -= 0x10000
+    return f"\\u{0xD800 | (n >> 10):04x}\\u{0xDC00 | (n & 0x3FF):04x}"
+
+
+def _orjson_dumps(obj, default):
+    """
+    Compact dump with sorted keys, as ASCII bytes, or None if orjson can't
+    produce the same output as json.dumps().
+    """
+
+    defaults = []
+
+    def safe_default(o):
+        if isinstance(o, Iterator):
+            # don't consume what json.dumps() would see if we fall back to it
+            raise TypeError("iterator")
+        value = default(o)
+        defaults.append(value)
+        return value
+
+    try:
+        data = orjson.dumps(obj, default=safe_default, option=ORJSON_DUMPS_OPTIONS)
+    except orjson.JSONEncodeError:
+        # unsupported type, integer overflow, exception raised by `default`, ...
+        return None
+    if b"0.0000" in data or _ORJSON_EXPONENT_RE.search(data):
+        return None
+    if b"null" in data and (_has_non_finite_float(obj) or _has_non_finite_float(defaults)):
+        return None
+    if not data.isascii() or b"\x7f" in data:
+        # non-ASCII characters are only found in strings
+        data = _NON_ASCII_RE.sub(_escape_non_ascii, data.decode()).encode()
+    return data
+
+
+def use_orjson():
+    return orjson is not None and settings.SIMPLEFLOW_FAST_JSON
+
+
 def json_dumps(obj, pretty=False, compact=True, **kwargs):
     """
     JSON dump to string.
@@ -67,6 +158,11 @@ def json_dumps(obj, pretty=False, compact=True, **kwargs):
     """
     if "default" not in kwargs:
         kwargs["default"] = serialize_complex_object
+    # orjson serializes enums natively, whatever `default` does with them
+    if compact and not pretty and kwargs == {"default": serialize_complex_object} and use_orjson():
+        data = _orjson_dumps(obj, kwargs["default"])
+        if data is not None:
+            return data.decode("ascii")
     if pretty:
         kwargs["indent"] = 4
         kwargs["sort_keys"] = True
@@ -75,13 +171,16 @@ def json_dumps(obj, pretty=False, compact=True, **kwargs):
         kwargs["separators"] = (",", ":")
         kwargs["sort_keys"] = True
 
-    try:
-        return json.dumps(obj, **kwargs)
-    except TypeError:
-        # lazy_object_proxy.Proxy subclasses basestring: serialize_complex_object isn't called on python2
-        # and some versions of pypy
-        obj = _resolve_proxy(obj)
+    if kwargs.get("indent") is None and json.encoder.c_make_encoder is not None:
+        # The C encoder calls `default` on proxies, futures, datetimes, sets
+        # and generators as it meets them: one pass, no copy. Only a proxy at
+        # the top would be taken for a string.
+        while isinstance(obj, lazy_object_proxy.Proxy):
+            obj = obj.__wrapped__
         return json.dumps(obj, **kwargs)
+    # The pure Python encoder, used to indent and on PyPy, takes proxies of
+    # strings or numbers for the real thing.
+    return json.dumps(_resolve_proxy(obj), **kwargs)
 
 
 def json_loads_or_raw(data):
@@ -93,6 +192,13 @@ def json_loads_or_raw(data):
     """
     if not data:
         return None
+    if isinstance(data, str) and use_orjson():
+        try:
+            raw = data.encode()
+            if b"0" * 19 not in raw.translate(_DIGITS_TO_ZERO):
+                return orjson.loads(raw)
+        except (UnicodeEncodeError, orjson.JSONDecodeError):
+            pass
     try:
         return json.loads(data)
     except Exception:
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import functools
+import os
+import random
+import threading
 import time
 from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
 from simpleflow import logger
 
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
 
 def _to_tuple(exceptions):
     if not isinstance(exceptions, Sequence):
@@ -88,3 +95,138 @@ def with_delay(
     except_on = _to_tuple(except_on)
 
     return decorate
+
+
+class RetryBudget:
+    """
+    Limits the retries of a process to a fraction (`ratio`) of its recent
+    successful calls, plus `min_per_second`, so that a widespread outage
+    doesn't multiply the load by the number of attempts.
+
+    >>> budget = RetryBudget(ratio=0.5, min_per_second=0, max_balance=1)
+    >>> budget.try_withdraw(), budget.try_withdraw()
+    (True, False)
+    >>> budget.deposit(); budget.deposit()
+    >>> budget.try_withdraw(), budget.try_withdraw()
+    (True, False)
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1.0, max_balance: float = 10.0) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Full balance, new lock: e.g. in a forked process, whose lock may have
+        been held by another thread of the parent.
+        """
+        self.balance = self.max_balance
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.balance = min(self.max_balance, self.balance + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.balance = min(self.max_balance, self.balance + (now - self._updated_at) * self.min_per_second)
+            self._updated_at = now
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+# Shared by the retry policies of a process
+RETRY_BUDGET = RetryBudget()
+
+os.register_at_fork(after_in_child=RETRY_BUDGET.reset)
+
+
+class RetryPolicy:
+    """
+    Retry a function on retryable errors, waiting between attempts with
+    "decorrelated jitter": each delay is drawn between `base_delay` and three
+    times the previous one, capped to `max_delay`. Unlike plain exponential
+    delays, processes that failed together don't retry in lockstep.
+
+    Retries stop after `max_attempts` calls, when the next attempt would
+    start after `max_elapsed` seconds, or when the retry `budget` is spent.
+
+    >>> policy = RetryPolicy(max_attempts=3, base_delay=0, is_retryable=lambda e: isinstance(e, KeyError))
+    >>> calls = []
+    >>> def flaky():
+    ...     calls.append(1)
+    ...     if len(calls) < 3:
+    ...         raise KeyError("boom")
+    ...     return len(calls)
+    >>> policy.call(flaky)
+    3
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        max_elapsed: float | None = 120.0,
+        is_retryable: Callable[[Exception], bool] | None = None,
+        budget: RetryBudget | None = RETRY_BUDGET,
+        log_with: Callable[..., Any] | None = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.is_retryable = is_retryable or (lambda error: True)
+        self.budget = budget
+        self.log_with = log_with or logger.info
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(max_attempts={self.max_attempts}, base_delay={self.base_delay},"
+            f" max_delay={self.max_delay}, max_elapsed={self.max_elapsed})"
+        )
+
+    def next_delay(self, delay: float) -> float:
+        return min(self.max_delay, random.uniform(self.base_delay, delay * 3))  # nosec
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        start = time.monotonic()
+        attempt = 1
+        delay = self.base_delay
+        while True:
+            try:
+                result = func(*args, **kwargs)
+            except Exception as error:
+                delay = self.next_delay(delay)
+                if not self._should_retry(error, attempt, time.monotonic() - start + delay):
+                    raise
+                self.log_with('error "%r": retrying in %.2f seconds', error, delay)
+                time.sleep(delay)
+                attempt += 1
+            else:
+                if self.budget:
+                    self.budget.deposit()
+                return result
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def decorated(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+
+        return decorated
+
+    def _should_retry(self, error: Exception, attempt: int, elapsed: float) -> bool:
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return False
+        if self.max_elapsed is not None and elapsed > self.max_elapsed:
+            return False
+        if self.budget and not self.budget.try_withdraw():
+            logger.warning(f"retry budget exhausted, not retrying after {error!r}")
+            return False
+        return True
@@ -34,6 +34,11 @@ def increment_retry(x):
     return x + 1
 
 
+@activity.with_attributes(version=DEFAULT_VERSION, max_concurrency_per_host=2)
+def limited(x):
+    return x
+
+
 @activity.with_attributes(version=DEFAULT_VERSION)
 def print_message(msg):
     print(f"MESSAGE: {msg}")
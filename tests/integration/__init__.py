@@ -10,6 +10,7 @@ from sure import expect
 from vcr import VCR
 
 import simpleflow.command
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.utils import json_dumps
 from tests.utils import IntegrationTestCase
 
@@ -49,6 +50,10 @@ WORKFLOW_ID = "test-simpleflow-workflow"
 
 
 class VCRIntegrationTest(IntegrationTestCase):
+    def setUp(self):
+        # cached descriptions would skip the recorded Describe* calls
+        registration_cache.clear()
+
     @property
     def region(self):
         return os.environ["AWS_DEFAULT_REGION"]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from simpleflow.activity import Activity
+from simpleflow.dispatch.dynamic_dispatcher import Dispatcher
+from simpleflow.dispatch.exceptions import DispatchError
+from tests.data import activities
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    with patch.dict(Dispatcher._activities, clear=True):
+        yield
+
+
+def test_dispatch_activity():
+    assert Dispatcher.dispatch_activity("tests.data.activities.increment") is activities.increment
+
+    activity = Dispatcher.dispatch_activity("json.dumps")
+    assert isinstance(activity, Activity)
+    assert activity.callable is json.dumps
+
+
+def test_dispatch_activity_is_not_cached():
+    # code redeployed on disk is picked up
+    Dispatcher.dispatch_activity("json.loads")
+    with patch("simpleflow.dispatch.dynamic_dispatcher.import_object_from_module") as import_mock:
+        Dispatcher.dispatch_activity("json.loads")
+    import_mock.assert_called_once()
+    assert Dispatcher.cached_activity("json.loads") is None
+
+
+def test_dispatch_activity_unknown():
+    with pytest.raises(DispatchError):
+        Dispatcher.dispatch_activity("activity.does.not.exist")
+
+
+def test_preload():
+    Dispatcher.preload("tests.data.activities")
+    with patch("simpleflow.dispatch.dynamic_dispatcher.import_object_from_module") as import_mock:
+        assert Dispatcher.dispatch_activity("tests.data.activities.double") is activities.double
+    import_mock.assert_not_called()
+    assert Dispatcher.cached_activity("tests.data.activities.double") is activities.double
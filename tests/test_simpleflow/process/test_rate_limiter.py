@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import multiprocess
+import pytest
+
+from simpleflow.process import HostRateLimiter
+
+
+def test_acquire_spreads_requests(tmp_path):
+    limiter = HostRateLimiter(str(tmp_path / "limiter"), max_rate=10)
+    # frozen clock: no tokens refill between the calls
+    with patch("time.sleep") as sleep, patch("time.time", return_value=1000.0):
+        for _ in range(10):
+            assert limiter.acquire() == 0.0
+        sleep.assert_not_called()
+
+        # the bucket is empty: the next callers wait their turn
+        assert limiter.acquire() == pytest.approx(0.1)
+        assert limiter.acquire() == pytest.approx(0.2)
+
+
+def test_clock_going_backwards_resets_the_bucket(tmp_path):
+    limiter = HostRateLimiter(str(tmp_path / "limiter"), max_rate=10)
+    # e.g. a state file saved with the timestamps of another clock
+    with patch("time.sleep"), patch("time.time", return_value=1000.0):
+        for _ in range(20):
+            limiter.acquire()
+    with patch("time.sleep") as sleep, patch("time.time", return_value=10.0):
+        assert limiter.acquire() == 0.0
+        sleep.assert_not_called()
+
+
+def test_rate_adapts_to_throttling(tmp_path):
+    limiter = HostRateLimiter(str(tmp_path / "limiter"), max_rate=100, min_rate=20, cooldown=60)
+    assert limiter.rate == 100
+
+    limiter.throttled()
+    assert limiter.rate == 50
+    # a burst of throttles only decreases the rate once
+    limiter.throttled()
+    assert limiter.rate == 50
+
+    for _ in range(50):
+        limiter.succeeded()
+    assert limiter.rate == pytest.approx(51, abs=0.05)
+
+    limiter.cooldown = 0
+    for _ in range(5):
+        limiter.throttled()
+    assert limiter.rate == 20
+
+    for _ in range(10000):
+        limiter.succeeded()
+    assert limiter.rate == 100
+
+
+def test_state_is_shared_by_processes(tmp_path):
+    limiter = HostRateLimiter(str(tmp_path / "limiter"), max_rate=100)
+    limiter.acquire()
+
+    process = multiprocess.Process(target=limiter.throttled)
+    process.start()
+    process.join()
+
+    assert HostRateLimiter(str(tmp_path / "limiter"), max_rate=100).rate == 50
+    assert limiter.rate == 50
+
+
+def test_threads_are_serialized(tmp_path):
+    limiter = HostRateLimiter(str(tmp_path / "limiter"), max_rate=1000)
+    opened = []
+    real_open = os.open
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return real_open(*args, **kwargs)
+
+    with patch("os.open", side_effect=counting_open), patch("time.sleep"), patch("time.time", return_value=1000.0):
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: limiter.acquire(), range(800)))
+        with limiter._state() as state:
+            # no update lost
+            assert state[1] == 200
+    assert len(opened) == 1
+
+
+def test_lock_held_by_a_thread_while_forking(tmp_path):
+    limiter = HostRateLimiter(str(tmp_path / "limiter"), max_rate=100)
+    with limiter._lock:
+        process = multiprocess.Process(target=limiter.throttled)
+        process.start()
+    process.join(timeout=10)
+    assert process.exitcode == 0
+    assert limiter.rate == 50
+
+
+def test_invalid_rates(tmp_path):
+    with pytest.raises(ValueError):
+        HostRateLimiter(str(tmp_path / "limiter"), max_rate=1, min_rate=2)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+
+import multiprocess
+
+from simpleflow.process import FileSemaphore
+
+
+def test_try_acquire_and_release(tmp_path):
+    semaphore = FileSemaphore(str(tmp_path / "sem"), 2)
+    first = semaphore.try_acquire()
+    second = semaphore.try_acquire()
+    assert first is not None and second is not None
+    assert semaphore.try_acquire() is None
+
+    semaphore.release(first)
+    assert semaphore.try_acquire() is not None
+
+
+def test_slots_of_dead_processes_are_released(tmp_path):
+    semaphore = FileSemaphore(str(tmp_path / "sem"), 1)
+
+    def hold_and_die():
+        semaphore.try_acquire()
+        os._exit(0)
+
+    process = multiprocess.Process(target=hold_and_die)
+    process.start()
+    process.join()
+
+    assert semaphore.try_acquire() is not None
@@ -4,6 +4,7 @@ import os
 import signal
 import sys
 import time
+from unittest import mock
 
 import multiprocess
 from flaky import flaky
@@ -12,7 +13,7 @@ from pytest import mark
 from setproctitle import setproctitle
 from sure import expect
 
-from simpleflow.process import Supervisor, reset_signal_handlers
+from simpleflow.process import Supervisor, record_task_processed, reset_signal_handlers
 from tests.utils import IntegrationTestCase
 
 TIME_STORE = {}
@@ -160,3 +161,67 @@ class TestSupervisor(IntegrationTestCase):
         os.kill(p.pid, signal.SIGTERM)
         p.join()
         expect(p.exitcode).to.equal(-15)
+
+
+class TestSupervisorRecycling:
+    @staticmethod
+    def make_supervisor(**kwargs):
+        def noop():
+            pass
+
+        supervisor = Supervisor(noop, nb_children=1, **kwargs)
+        child = mock.Mock(pid=42)
+        child.memory_info.return_value = mock.Mock(rss=10 * 1024**2)
+        supervisor._processes[42] = child
+        supervisor._tasks_counters[42] = multiprocess.Value("i", 0)
+        return supervisor, child
+
+    def test_no_limits(self):
+        supervisor, child = self.make_supervisor()
+        supervisor._tasks_counters[42].value = 1000
+        supervisor._recycle_worker_processes()
+        expect(supervisor._draining).to.be.empty
+        expect(child.terminate.called).to.be.false
+
+    def test_max_tasks_per_child(self):
+        supervisor, child = self.make_supervisor(max_tasks_per_child=3)
+        supervisor._tasks_counters[42].value = 2
+        supervisor._recycle_worker_processes()
+        expect(supervisor._draining).to.be.empty
+
+        supervisor._tasks_counters[42].value = 3
+        supervisor._recycle_worker_processes()
+        expect(supervisor._draining).to.equal({42})
+        expect(child.terminate.call_count).to.equal(1)
+
+        # a draining process is only signaled once
+        supervisor._recycle_worker_processes()
+        expect(child.terminate.call_count).to.equal(1)
+
+    def test_max_rss_per_child(self):
+        supervisor, child = self.make_supervisor(max_rss_per_child=20)
+        supervisor._recycle_worker_processes()
+        expect(supervisor._draining).to.be.empty
+
+        child.memory_info.return_value = mock.Mock(rss=21 * 1024**2)
+        supervisor._recycle_worker_processes()
+        expect(supervisor._draining).to.equal({42})
+
+    def test_draining_process_is_replaced(self):
+        supervisor, child = self.make_supervisor(max_tasks_per_child=1)
+        supervisor._tasks_counters[42].value = 1
+        supervisor._recycle_worker_processes()
+        with mock.patch("multiprocess.Process") as process_class, mock.patch("psutil.Process"):
+            process_class.return_value.pid = 43
+            supervisor._start_worker_processes()
+        expect(sorted(supervisor._processes)).to.equal([42, 43])
+
+    def test_record_task_processed(self):
+        counter = multiprocess.Value("i", 0)
+        with mock.patch("simpleflow.process._supervisor._tasks_counter", counter):
+            record_task_processed()
+            record_task_processed()
+        expect(counter.value).to.equal(2)
+
+        # no-op outside a supervised process
+        record_task_processed()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import unittest
+from unittest.mock import patch
 
 import boto3
 from moto import mock_swf
 
+from simpleflow.history import History
 from simpleflow.swf.mapper.actors import Decider
 from simpleflow.swf.mapper.exceptions import PollTimeout
 from simpleflow.swf.mapper.models.domain import Domain
+from simpleflow.swf.mapper.models.history import History as SwfHistory
 
 
 class TestActor(unittest.TestCase):
@@ -56,3 +59,66 @@ class TestActor(unittest.TestCase):
         )
         self.assertEqual(response.execution.workflow_id, "wfe-1234")
         self.assertIsNotNone(response.execution.run_id)
+
+    @staticmethod
+    def make_pages():
+        events = [
+            {
+                "eventId": i,
+                "eventType": "MarkerRecorded",
+                "eventTimestamp": 1365177769.585 + i,
+                "markerRecordedEventAttributes": {"markerName": f"marker-{i}", "decisionTaskCompletedEventId": 0},
+            }
+            for i in range(1, 8)
+        ]
+        pages = [
+            {
+                "taskToken": "token",
+                "startedEventId": 7,
+                "workflowType": {"name": "test-workflow", "version": "v1.2"},
+                "workflowExecution": {"workflowId": "wfe-1234", "runId": "run-id"},
+                "events": events[i : i + 3],
+                **({"nextPageToken": str(i + 3)} if i + 3 < len(events) else {}),
+            }
+            for i in range(0, len(events), 3)
+        ]
+
+        def poll_for_decision_task(domain, task_list, identity=None, next_page_token=None, **_):
+            return pages[int(next_page_token or 0) // 3]
+
+        return poll_for_decision_task
+
+    def test_poll_pages_are_parsed_incrementally(self):
+        poll_for_decision_task = self.make_pages()
+        parsed_history = History(SwfHistory())
+        markers_seen = []
+
+        def on_page(new_events):
+            parsed_history.parse()
+            markers_seen.append(len(parsed_history.markers))
+
+        with patch.object(self.actor, "poll_for_decision_task", side_effect=poll_for_decision_task):
+            response = self.actor.poll(history=parsed_history.swf_history, on_page=on_page)
+
+        self.assertEqual(list(range(1, 8)), [event.id for event in response.history])
+        self.assertIs(parsed_history.swf_history, response.history)
+        self.assertEqual([3, 6, 7], markers_seen)
+        self.assertEqual(7, parsed_history.last_event_id)
+        self.assertEqual("run-id", response.execution.run_id)
+
+    def test_poll_first_page_only(self):
+        poll_for_decision_task = self.make_pages()
+        with patch.object(self.actor, "poll_for_decision_task", side_effect=poll_for_decision_task) as poll_mock:
+            response = self.actor.poll(all_pages=False)
+        poll_mock.assert_called_once()
+        self.assertEqual([], list(response.history))
+        self.assertEqual("wfe-1234", response.execution.workflow_id)
+
+        pages_seen = []
+        with patch.object(self.actor, "poll_for_decision_task", side_effect=poll_for_decision_task) as poll_mock:
+            self.actor.fetch_history(response, on_page=lambda events: pages_seen.append(len(events)))
+            # already fetched
+            self.actor.fetch_history(response)
+        self.assertEqual(2, poll_mock.call_count)
+        self.assertEqual([3, 3, 1], pages_seen)
+        self.assertEqual(list(range(1, 8)), [event.id for event in response.history])
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -8,11 +9,14 @@ import pytest
 from botocore.exceptions import ClientError
 from moto import mock_swf
 
+from simpleflow import constants
 from simpleflow.swf.mapper.core import ConnectedSWFObject
 from simpleflow.swf.mapper.exceptions import AlreadyExistsError, DoesNotExistError, ResponseError
 from simpleflow.swf.mapper.models.domain import Domain
+from simpleflow.swf.mapper.models.history import cache as history_cache
 from simpleflow.swf.mapper.models.history.base import History
 from simpleflow.swf.mapper.models.workflow import WorkflowExecution, WorkflowType
+from simpleflow.swf.mapper.querysets.history import HistoryQuerySet
 
 from ..mocks.event import mock_get_workflow_execution_history
 from ..mocks.workflow import mock_describe_workflow_execution, mock_describe_workflow_type
@@ -380,6 +384,46 @@ class TestWorkflowExecution(unittest.TestCase, CustomAssertions):
             history = self.we.history()
             self.assertIsInstance(history, History)
 
+    @mock_swf
+    def test_history_of_closed_executions_is_cached(self):
+        client = boto3.client("swf", region_name="us-east-1")
+        client.register_domain(name="test-domain", workflowExecutionRetentionPeriodInDays="1")
+        client.register_workflow_type(
+            domain="test-domain",
+            name="test-workflow-type",
+            version="1.0",
+            defaultTaskList={"name": "test-task-list"},
+            defaultChildPolicy="TERMINATE",
+            defaultExecutionStartToCloseTimeout="300",
+            defaultTaskStartToCloseTimeout="300",
+        )
+        run_id = client.start_workflow_execution(
+            domain="test-domain",
+            workflowId="test-workflow-execution",
+            workflowType={"name": "test-workflow-type", "version": "1.0"},
+        )["runId"]
+        execution = WorkflowExecution(Domain("test-domain"), "test-workflow-execution", run_id=run_id)
+
+        with tempfile.TemporaryDirectory() as cache_dir, patch.object(constants, "HISTORY_CACHE_DIR", cache_dir):
+            history_cache._reset_after_fork()
+            # open: not cached
+            self.assertEqual(2, len(execution.history()))
+            self.assertIsNone(history_cache.get_events("test-domain", "test-workflow-execution", run_id))
+
+            execution.terminate()
+            events = execution.history().raw
+            with patch.object(ConnectedSWFObject, "get_workflow_execution_history", side_effect=AssertionError):
+                cached = execution.history()
+                self.assertEqual(events, cached.raw)
+                self.assertEqual(cached[-1].timestamp, History.from_event_list(events)[-1].timestamp)
+
+                last_events = HistoryQuerySet(Domain("test-domain")).get(
+                    run_id, "test-workflow-execution", reverse=True
+                )
+                self.assertEqual("WorkflowExecutionTerminated", last_events[0].raw["eventType"])
+            history_cache._get_disk_cache().close()
+            history_cache._reset_after_fork()
+
     @mock_swf
     def test_terminate(self):
         client = boto3.client("swf", region_name="us-east-1")
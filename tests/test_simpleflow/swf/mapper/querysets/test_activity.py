@@ -8,6 +8,7 @@ from botocore.exceptions import ClientError
 import simpleflow.swf.mapper.settings
 from simpleflow.swf.mapper.core import ConnectedSWFObject
 from simpleflow.swf.mapper.exceptions import DoesNotExistError, ResponseError
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.activity import ActivityType
 from simpleflow.swf.mapper.models.domain import Domain
 from simpleflow.swf.mapper.querysets.activity import ActivityTypeQuerySet
@@ -21,6 +22,7 @@ class TestActivityTypeQuerySet(unittest.TestCase):
     def setUp(self):
         self.domain = Domain("TestDomain")
         self.atq = ActivityTypeQuerySet(self.domain)
+        registration_cache.clear()
 
     def tearDown(self):
         pass
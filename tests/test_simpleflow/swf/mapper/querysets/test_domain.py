@@ -8,6 +8,7 @@ from botocore.exceptions import ClientError
 import simpleflow.swf.mapper.settings
 from simpleflow.swf.mapper.core import ConnectedSWFObject
 from simpleflow.swf.mapper.exceptions import DoesNotExistError, ResponseError
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.domain import Domain
 from simpleflow.swf.mapper.querysets.domain import DomainQuerySet
 
@@ -20,6 +21,7 @@ class TestDomainQuerySet(unittest.TestCase):
     def setUp(self):
         self.domain = Domain("test-domain")
         self.qs = DomainQuerySet()
+        registration_cache.clear()
 
     def tearDown(self):
         pass
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import random
+import time
+import unittest
+from unittest.mock import patch
+
+from simpleflow.swf.mapper.models.domain import Domain
+from simpleflow.swf.mapper.querysets.history import HistoryQuerySet, iter_events_from_both_ends
+
+
+class FakeHistory:
+    """
+    Pages of a history of `size` events, like GetWorkflowExecutionHistory.
+    """
+
+    def __init__(self, size, page_size, delay=0.0, fail_backwards=False):
+        self.events = [
+            {
+                "eventId": i,
+                "eventType": "MarkerRecorded",
+                "eventTimestamp": 1365177769.585 + i,
+                "markerRecordedEventAttributes": {"markerName": "marker"},
+            }
+            for i in range(1, size + 1)
+        ]
+        self.page_size = page_size
+        self.delay = delay
+        self.fail_backwards = fail_backwards
+        self.calls = []
+
+    def get_page(self, next_page_token, reverse_order):
+        self.calls.append((next_page_token, reverse_order))
+        if self.delay:
+            time.sleep(random.uniform(0, self.delay))
+        if reverse_order and self.fail_backwards:
+            raise RuntimeError("boom")
+        events = self.events[::-1] if reverse_order else self.events
+        start = next_page_token or 0
+        response = {"events": events[start : start + self.page_size]}
+        if start + self.page_size < len(events):
+            response["nextPageToken"] = start + self.page_size
+        return response
+
+
+class TestIterEventsFromBothEnds(unittest.TestCase):
+    def assertComplete(self, history, events):
+        self.assertEqual([event["eventId"] for event in history.events], [event["eventId"] for event in events])
+
+    def test_pagers_meet_in_the_middle(self):
+        for size, page_size in ((1, 10), (10, 10), (11, 10), (100, 7), (1000, 100)):
+            history = FakeHistory(size, page_size, delay=0.002)
+            self.assertComplete(history, iter_events_from_both_ends(history.get_page))
+
+    def test_single_page(self):
+        history = FakeHistory(5, 10)
+        self.assertComplete(history, iter_events_from_both_ends(history.get_page))
+        self.assertEqual([(None, None)], history.calls)
+
+    def test_backward_pages_are_fetched_concurrently(self):
+        history = FakeHistory(1000, 100, delay=0.01)
+        self.assertComplete(history, iter_events_from_both_ends(history.get_page))
+        backward_calls = [call for call in history.calls if call[1]]
+        self.assertTrue(backward_calls)
+        # at most one page in flight on each side when the pagers meet
+        self.assertLessEqual(len(history.calls), 10 + 2)
+
+    def test_backward_errors_are_not_fatal(self):
+        history = FakeHistory(100, 10, fail_backwards=True)
+        self.assertComplete(history, iter_events_from_both_ends(history.get_page))
+
+
+class TestHistoryQuerySet(unittest.TestCase):
+    def test_get_concurrently(self):
+        history = FakeHistory(50, 10)
+        queryset = HistoryQuerySet(Domain("test-domain"))
+
+        def get_workflow_execution_history(domain, run_id, workflow_id, next_page_token=None, reverse_order=None, **_):
+            return history.get_page(next_page_token, reverse_order)
+
+        with patch.object(queryset, "get_workflow_execution_history", side_effect=get_workflow_execution_history):
+            result = queryset.get("run-id", "workflow-id", max_results=None, page_size=1000, concurrent=True)
+            self.assertEqual(list(range(1, 51)), [event.id for event in result])
+
+            result = queryset.get("run-id", "workflow-id", max_results=5, reverse=True, concurrent=True)
+            self.assertEqual([50, 49, 48, 47, 46], [event.id for event in result])
@@ -5,9 +5,11 @@ from unittest.mock import Mock, patch
 
 from botocore.exceptions import ClientError
 
+from simpleflow import settings
 from simpleflow.swf.mapper.constants import REGISTERED
 from simpleflow.swf.mapper.core import ConnectedSWFObject
 from simpleflow.swf.mapper.exceptions import DoesNotExistError, ResponseError
+from simpleflow.swf.mapper.models import registration_cache
 from simpleflow.swf.mapper.models.domain import Domain
 from simpleflow.swf.mapper.models.workflow import WorkflowExecution, WorkflowType
 from simpleflow.swf.mapper.querysets.workflow import (
@@ -60,6 +62,7 @@ class TestWorkflowTypeQuerySet(unittest.TestCase):
     def setUp(self):
         self.domain = Domain("TestDomain")
         self.wtq = WorkflowTypeQuerySet(self.domain)
+        registration_cache.clear()
 
     def tearDown(self):
         pass
@@ -115,6 +118,45 @@ class TestWorkflowTypeQuerySet(unittest.TestCase):
 
                 self.assertIsInstance(workflow_type, WorkflowType)
 
+    def test_get_caches_the_description(self):
+        mock = Mock(side_effect=mock_describe_workflow_type)
+        with patch.object(self.wtq, "describe_workflow_type", mock):
+            self.wtq.get("TestType", "0.1")
+            wt = self.wtq.get("TestType", "0.1")
+            self.assertIsInstance(wt, WorkflowType)
+            self.assertEqual(1, mock.call_count)
+
+            self.wtq.get("TestType", "0.2")
+            self.assertEqual(2, mock.call_count)
+
+    def test_cached_description_is_a_copy(self):
+        with patch.object(self.wtq, "describe_workflow_type", mock_describe_workflow_type):
+            self.wtq.get("TestType", "0.1")
+            description = registration_cache.get_description(
+                registration_cache.WORKFLOW_TYPE, self.domain.name, "TestType", "0.1"
+            )
+            description["configuration"].clear()
+            wt = self.wtq.get("TestType", "0.1")
+            self.assertEqual("mocked-tasklist", wt.task_list)
+
+    def test_delete_forgets_the_description(self):
+        mock = Mock(side_effect=mock_describe_workflow_type)
+        with patch.object(self.wtq, "describe_workflow_type", mock):
+            self.wtq.get("TestType", "0.1")
+            with patch.object(ConnectedSWFObject, "deprecate_workflow_type"):
+                WorkflowType(self.domain, "TestType", "0.1").delete()
+            self.wtq.get("TestType", "0.1")
+            self.assertEqual(2, mock.call_count)
+
+    def test_get_without_cache(self):
+        mock = Mock(side_effect=mock_describe_workflow_type)
+        with patch.object(self.wtq, "describe_workflow_type", mock), patch.object(
+            settings, "SIMPLEFLOW_REGISTRATION_CACHE_TTL", 0
+        ):
+            self.wtq.get("TestType", "0.1")
+            self.wtq.get("TestType", "0.1")
+            self.assertEqual(2, mock.call_count)
+
     def test__list_non_empty_workflow_types(self):
         with patch.object(self.wtq, "list_workflow_types", mock_list_workflow_types):
             wt = self.wtq._list()
@@ -308,3 +350,51 @@ class TestWorkflowExecutionQuerySet(unittest.TestCase):
         kwargs = self.weq._list_items.call_args[1]
         self.assertIsNone(kwargs["start_oldest_date"])
         self.assertIsInstance(kwargs["close_latest_date"], int)
+
+    def test_filter_with_slices(self):
+        def list_items(*args, **kwargs):
+            oldest, latest = kwargs["close_oldest_date"], kwargs["close_latest_date"]
+            # SWF includes both bounds
+            for timestamp in (100, 140, 150, 175, 200):
+                if oldest <= timestamp <= latest:
+                    yield {
+                        "execution": {"workflowId": f"wf-{timestamp}", "runId": "run"},
+                        "workflowType": {"name": "TestType", "version": "0.1"},
+                        "closeTimestamp": timestamp,
+                    }
+
+        self.weq._list_items = Mock(side_effect=list_items)
+        executions = self.weq.filter(
+            status=WorkflowExecution.STATUS_CLOSED,
+            close_oldest_date=100,
+            close_latest_date=200,
+            slices=4,
+        )
+        self.assertEqual(
+            ["wf-100", "wf-140", "wf-150", "wf-175", "wf-200"],
+            sorted(execution.workflow_id for execution in executions),
+        )
+        windows = sorted(
+            (call[1]["close_oldest_date"], call[1]["close_latest_date"]) for call in self.weq._list_items.call_args_list
+        )
+        self.assertEqual([(100, 125), (125, 150), (150, 175), (175, 200)], windows)
+
+    def test_filter_with_slices_errors(self):
+        latest_date = int(datetime_timestamp(past_day(0)))
+
+        def list_items(*args, **kwargs):
+            if kwargs["latest_date"] < latest_date:
+                raise ResponseError("boom")
+            yield from ()
+
+        self.weq._list_items = Mock(side_effect=list_items)
+        with self.assertRaises(ResponseError):
+            self.weq.filter(oldest_date=1, latest_date=latest_date, slices=2)
+
+    def test_all_with_slices(self):
+        self.weq._list_items = Mock(return_value=[])
+        self.assertEqual([], self.weq.all(slices=3))
+        self.assertEqual(3, self.weq._list_items.call_count)
+        for call in self.weq._list_items.call_args_list:
+            self.assertEqual(WorkflowExecution.STATUS_OPEN, call[1]["status"])
+            self.assertIn("latest_date", call[1])
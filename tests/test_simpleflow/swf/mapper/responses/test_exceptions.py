@@ -1,9 +1,15 @@
 import boto3
 import pytest
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, EndpointConnectionError
 from moto import mock_swf
 
-from simpleflow.swf.mapper.exceptions import is_unknown
+from simpleflow.swf.mapper.exceptions import (
+    DoesNotExistError,
+    PollTimeout,
+    ResponseError,
+    is_retryable_error,
+    is_unknown,
+)
 
 
 @mock_swf
@@ -41,3 +47,31 @@ def test_is_unknown():
     with pytest.raises(ClientError) as exception:
         client.terminate_workflow_execution(domain="existent", workflowId="non-existent")
     assert is_unknown("workflowId")(exception.value)
+
+
+def make_client_error(code, status):
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "PollForActivityTask")
+
+
+def test_is_retryable_error():
+    assert is_retryable_error(make_client_error("ThrottlingException", 400))
+    assert is_retryable_error(make_client_error("InternalFailure", 500))
+    assert not is_retryable_error(make_client_error("UnknownResourceFault", 400))
+    assert is_retryable_error(EndpointConnectionError(endpoint_url="https://swf.us-east-1.amazonaws.com"))
+    assert not is_retryable_error(PollTimeout("timeout"))
+    assert not is_retryable_error(DoesNotExistError("no such domain"))
+    assert not is_retryable_error(KeyError("bug"))
+
+    # the mapper translates the ClientError while handling it
+    for client_error, expected in (
+        (make_client_error("ThrottlingException", 400), True),
+        (make_client_error("ValidationException", 400), False),
+    ):
+        try:
+            try:
+                raise client_error
+            except ClientError as error:
+                raise ResponseError(error.args[0])
+        except ResponseError as error:
+            assert is_retryable_error(error) is expected
+    assert is_retryable_error(ResponseError("unexpected response"))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest.mock import Mock, patch
+
+from moto import mock_swf
+
+from simpleflow.swf.mapper import core
+from simpleflow.swf.mapper.core import ConnectedSWFObject
+
+
+class TestClientRegistry(unittest.TestCase):
+    def setUp(self):
+        core.reset_clients()
+        env = patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "KEY_ID", "AWS_SECRET_ACCESS_KEY": "SECRET"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def tearDown(self):
+        core.reset_clients()
+
+    def test_clients_are_shared(self):
+        first = ConnectedSWFObject()
+        second = ConnectedSWFObject()
+        assert first.boto3_client is second.boto3_client
+
+    def test_clients_per_region_and_credentials(self):
+        client = core.get_client("us-east-1")
+        assert core.get_client("us-east-1", {}) is client
+        assert core.get_client("eu-west-1") is not client
+        other_credentials = {"aws_access_key_id": "KEY", "aws_secret_access_key": "SECRET"}
+        assert core.get_client("us-east-1", other_credentials) is not client
+        assert core.get_client("us-east-1", dict(other_credentials)) is core.get_client("us-east-1", other_credentials)
+
+    def test_clients_without_credentials_are_not_shared(self):
+        with patch("boto3.session.Session.get_credentials", return_value=None):
+            client = core.get_client("us-east-1")
+        assert core.get_client("us-east-1") is not client
+
+    def test_client_config(self):
+        config = core.get_client("us-east-1").meta.config
+        assert config.max_pool_connections == core.MAX_POOL_CONNECTIONS
+        assert config.read_timeout == core.READ_TIMEOUT
+        assert config.tcp_keepalive
+
+    @mock_swf
+    def test_client_requests_are_rate_limited(self):
+        limiter = Mock()
+        with patch.object(core, "get_rate_limiter", return_value=limiter) as get_rate_limiter:
+            core.get_client("us-east-1").list_domains(registrationStatus="REGISTERED")
+        get_rate_limiter.assert_called_with("us-east-1", "ListDomains")
+        limiter.acquire.assert_called_once_with()
+        limiter.succeeded.assert_called_once_with()
+        limiter.throttled.assert_not_called()
+
+    def test_throttled_requests_decrease_the_rate(self):
+        limiter = Mock()
+        operation = Mock()
+        operation.name = "ListDomains"
+        response = (Mock(status_code=400), {"Error": {"Code": "ThrottlingException"}})
+        with patch.object(core, "get_rate_limiter", return_value=limiter):
+            core._after_response("us-east-1", response=response, operation=operation)
+        limiter.throttled.assert_called_once_with()
+        limiter.succeeded.assert_not_called()
+
+    def test_rate_limiter_errors_are_not_fatal(self):
+        limiter = Mock()
+        limiter.acquire.side_effect = PermissionError("not yours")
+        with patch.dict(core._RATE_LIMITERS, {("us-east-1", "ListDomains"): limiter}):
+            core._before_request("us-east-1", "ListDomains")
+            assert core._RATE_LIMITERS[("us-east-1", "ListDomains")] is None
+            core._before_request("us-east-1", "ListDomains")
+
+    def test_explicit_client(self):
+        client = object()
+        assert ConnectedSWFObject(boto3_client=client).boto3_client is client
+
+    def test_clients_are_not_shared_with_forked_processes(self):
+        core.get_client("us-east-1")
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if not pid:
+            os.write(write_fd, b"1" if core._CLIENTS else b"0")
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert os.read(read_fd, 1) == b"0"
+        os.close(read_fd)
+        os.close(write_fd)
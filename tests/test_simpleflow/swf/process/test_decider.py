@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import tempfile
+import time
+from unittest.mock import patch
+
+from simpleflow import activity, constants, settings
+from simpleflow.swf.mapper.models import registration_cache
+from simpleflow.swf.process.decider import registration
+from simpleflow.workflow import Workflow
+from tests.data import activities
+from tests.data.constants import DEFAULT_VERSION
+from tests.utils import MockSWFTestCase
+
+
+@activity.with_attributes(version="registration-test")
+def registered_activity():
+    pass
+
+
+class ChildWorkflow(Workflow):
+    name = "child"
+    version = "registration-test"
+
+
+class ParentWorkflow(Workflow):
+    name = "parent"
+    version = "registration-test"
+
+
+class TestRegisterTypes(MockSWFTestCase):
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch.object(constants, "REGISTRATION_CACHE_DIR", cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        registration_cache._reset_after_fork()
+        self.addCleanup(registration_cache._reset_after_fork)
+
+    def test_discover_types(self):
+        types = registration.discover_types([ParentWorkflow])
+        self.assertIn((registration_cache.ACTIVITY_TYPE, registered_activity.name, "registration-test"), types)
+        self.assertIn((registration_cache.WORKFLOW_TYPE, f"{__name__}.ChildWorkflow", "registration-test"), types)
+        self.assertIn((registration_cache.WORKFLOW_TYPE, f"{__name__}.ParentWorkflow", "registration-test"), types)
+        # not used by the modules of the workflows
+        self.assertNotIn((registration_cache.ACTIVITY_TYPE, activities.increment.name, DEFAULT_VERSION), types)
+
+    def test_register_types(self):
+        types = {
+            (registration_cache.ACTIVITY_TYPE, registered_activity.name, "registration-test"),
+            (registration_cache.WORKFLOW_TYPE, f"{__name__}.ChildWorkflow", "registration-test"),
+            # already registered by MockSWFTestCase
+            (registration_cache.WORKFLOW_TYPE, self.workflow_type_name, self.workflow_type_version),
+        }
+        registration.register_types(self.domain, types)
+
+        activity_types = self.swf_conn.list_activity_types(domain=self.domain.name, registrationStatus="REGISTERED")
+        self.assertEqual(
+            [registered_activity.name], [info["activityType"]["name"] for info in activity_types["typeInfos"]]
+        )
+        workflow_types = self.swf_conn.list_workflow_types(domain=self.domain.name, registrationStatus="REGISTERED")
+        self.assertEqual(
+            {f"{__name__}.ChildWorkflow", self.workflow_type_name},
+            {info["workflowType"]["name"] for info in workflow_types["typeInfos"]},
+        )
+        for kind, name, version in types:
+            self.assertTrue(registration_cache.is_registered(kind, self.domain.name, name, version))
+
+        # known types are not registered again
+        with patch("simpleflow.swf.mapper.models.ActivityType.save", side_effect=AssertionError):
+            registration.register_types(self.domain, types)
+
+    def test_registered_types_expire(self):
+        key = (registration_cache.ACTIVITY_TYPE, registered_activity.name, "registration-test")
+        registration_cache.set_registered(key[0], self.domain.name, key[1], key[2])
+        self.assertTrue(registration_cache.is_registered(key[0], self.domain.name, key[1], key[2]))
+        with patch("time.time", return_value=time.time() + settings.SIMPLEFLOW_REGISTRATION_CACHE_TTL + 1):
+            self.assertFalse(registration_cache.is_registered(key[0], self.domain.name, key[1], key[2]))
+
+    def test_errors_are_not_fatal(self):
+        key = (registration_cache.ACTIVITY_TYPE, registered_activity.name, "registration-test")
+        with patch("simpleflow.swf.mapper.models.ActivityType.save", side_effect=RuntimeError("boom")):
+            registration.register_types(self.domain, [key])
+        self.assertFalse(registration_cache.is_registered(key[0], self.domain.name, key[1], key[2]))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import gc
+import os
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+
+from simpleflow import constants
+from simpleflow.swf.process.worker.task_lists import TaskListSelector, TaskListSpec, parse_task_list
+
+
+def select(selector, n):
+    selected = []
+    for _ in range(n):
+        name, slot = selector.acquire()
+        selector.release(name, slot)
+        selected.append(name)
+    return selected
+
+
+def test_parse_task_list():
+    assert parse_task_list("foo:weight=2,priority=1,max=3") == TaskListSpec("foo", 2, 1, 3)
+    assert not parse_task_list("foo").has_options
+    with pytest.raises(ValueError):
+        parse_task_list("foo:bar=1")
+    with pytest.raises(ValueError, match="'abc'"):
+        parse_task_list("foo:weight=abc")
+    with pytest.raises(ValueError, match="missing task list name"):
+        parse_task_list(":max=2")
+
+
+def test_weighted_round_robin():
+    selector = TaskListSelector([TaskListSpec("a", weight=3), TaskListSpec("b")])
+    selected = select(selector, 8)
+    assert Counter(selected) == {"a": 6, "b": 2}
+    # smooth: "b" isn't starved until "a" used all its share
+    assert selected[:4].count("b") == 1
+
+
+def test_priority_and_idle_task_lists():
+    selector = TaskListSelector([TaskListSpec("low"), TaskListSpec("high", priority=1)])
+    assert select(selector, 3) == ["high", "high", "high"]
+
+    selector.mark_idle("high")
+    assert select(selector, 2) == ["low", "low"]
+
+
+def test_concurrency_limit():
+    selector = TaskListSelector([TaskListSpec("heavy", priority=1, max_concurrency=2), TaskListSpec("light")])
+    first = selector.acquire()
+    second = selector.acquire()
+    assert [first[0], second[0]] == ["heavy", "heavy"]
+    assert selector.acquire()[0] == "light"
+
+    selector.release(*first)
+    assert selector.acquire()[0] == "heavy"
+
+
+def test_all_task_lists_at_limit():
+    selector = TaskListSelector([TaskListSpec("heavy", max_concurrency=1)])
+    assert selector.acquire() is not None
+    assert selector.acquire() is None
+
+
+def test_lock_files_are_removed(tmp_path):
+    with patch.object(constants, "LOCKS_DIR", str(tmp_path)):
+        selector = TaskListSelector([TaskListSpec("heavy", max_concurrency=1)])
+    assert selector.acquire() is not None
+    assert len(os.listdir(tmp_path / "task-lists")) == 1
+
+    del selector
+    gc.collect()
+    assert os.listdir(tmp_path / "task-lists") == []
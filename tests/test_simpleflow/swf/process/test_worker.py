@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import tempfile
+import threading
 import unittest
-from collections import namedtuple
+from collections import deque, namedtuple
 from unittest.mock import patch
 
 from moto import mock_swf
 
-from simpleflow.swf.process.worker.base import ActivityPoller, ActivityWorker
+import simpleflow.constants
+import simpleflow.swf.mapper.exceptions
+from simpleflow.dispatch.dynamic_dispatcher import Dispatcher
+from simpleflow.swf.process.poller import Poller
+from simpleflow.swf.process.worker.base import ActivityPoller, ActivityWorker, process_task
+from simpleflow.swf.process.worker.task_lists import TaskListSpec
 from simpleflow.swf.mapper.models.activity import ActivityTask
 from simpleflow.swf.mapper.models.domain import Domain
+from simpleflow.swf.mapper.responses import Response
 
 FakeActivityType = namedtuple("FakeActivityType", ["name"])
 
@@ -33,6 +41,194 @@ class TestActivityWorker(unittest.TestCase):
         self.assertEqual(mock.call_args[0], ("token", task))
         self.assertIn("unable to import ", mock.call_args[1]["reason"])
 
+    def test_swf_calls_are_retried_on_transient_errors(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list")
+        throttled = simpleflow.swf.mapper.exceptions.RateLimitExceededError("throttled")
+        with patch.object(poller, "poll", side_effect=[throttled, "response"]) as poll, patch("time.sleep"):
+            self.assertEqual("response", poller.poll_with_retry())
+        self.assertEqual(2, poll.call_count)
+
+        unknown = simpleflow.swf.mapper.exceptions.DoesNotExistError("unknown task")
+        with patch.object(poller, "complete", side_effect=unknown) as complete, patch("time.sleep"):
+            poller.complete_with_retry("token", "result")
+        self.assertEqual(1, complete.call_count)
+
+
+def make_response(token, activity_name="activity.does.not.exist"):
+    raw = {
+        "taskToken": token,
+        "activityId": f"activity-{token}",
+        "startedEventId": 1,
+        "workflowExecution": {"workflowId": "wf", "runId": "run"},
+    }
+    return Response(
+        task_token=token,
+        activity_task=ActivityTask(None, "task-list", activity_id=token, activity_type=FakeActivityType(activity_name)),
+        raw_response=raw,
+    )
+
+
+@mock_swf
+class TestActivityPollerPrefetch(unittest.TestCase):
+    def test_prefetched_tasks_are_all_processed(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list", prefetch=2)
+        responses = [make_response("t1"), make_response("t2"), make_response("t3")]
+
+        def poll_with_retry():
+            if responses:
+                return responses.pop(0)
+            # stop polling: already prefetched tasks must still be processed
+            poller.is_alive = False
+            raise simpleflow.swf.mapper.exceptions.PollTimeout("timeout")
+
+        processed = []
+        with patch.object(poller, "poll_with_retry", side_effect=poll_with_retry), patch.object(
+            poller, "process", side_effect=lambda response: processed.append(response.task_token)
+        ), patch.object(poller, "bind_signal_handlers"):
+            poller.start()
+
+        self.assertEqual(["t1", "t2", "t3"], processed)
+
+    def test_queued_tasks_are_heartbeated(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list", heartbeat=10, prefetch=3)
+        poller._prefetched_condition = threading.Condition()
+        poller._prefetched = deque(
+            [[make_response("fresh"), 1e12], [make_response("gone"), 0], [make_response("cancelled"), 0]]
+        )
+
+        def heartbeat(token):
+            if token == "gone":
+                raise simpleflow.swf.mapper.exceptions.DoesNotExistError("gone")
+            return {"cancelRequested": token == "cancelled"}
+
+        with patch.object(poller, "heartbeat", side_effect=heartbeat) as heartbeat_mock, patch.object(
+            poller, "cancel"
+        ) as cancel_mock:
+            poller._heartbeat_prefetched()
+
+        self.assertEqual(2, heartbeat_mock.call_count)
+        cancel_mock.assert_called_once_with("cancelled")
+        self.assertEqual(["fresh"], [item[0].task_token for item in poller._prefetched])
+
+    def test_queued_tasks_are_heartbeated_while_polling(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list", heartbeat=1, prefetch=2)
+        heartbeated = threading.Event()
+        polls = [make_response("t0"), make_response("t1")]
+
+        def poll_with_retry():
+            if polls:
+                return polls.pop(0)
+            # long poll, while t1 waits for t0 to be processed
+            heartbeated.wait(timeout=5)
+            poller.is_alive = False
+            raise simpleflow.swf.mapper.exceptions.PollTimeout("timeout")
+
+        def process(response):
+            # t1 is queued while t0 is processed
+            if response.task_token == "t0":
+                heartbeated.wait(timeout=5)
+
+        with patch.object(poller, "poll_with_retry", side_effect=poll_with_retry), patch.object(
+            poller, "process", side_effect=process
+        ), patch.object(
+            poller, "heartbeat", side_effect=lambda token: heartbeated.set()
+        ) as heartbeat_mock, patch.object(
+            poller, "bind_signal_handlers"
+        ):
+            poller.start()
+
+        self.assertTrue(heartbeated.is_set())
+        heartbeat_mock.assert_any_call("t1")
+
+
+@mock_swf
+class TestActivityPollerTaskLists(unittest.TestCase):
+    def test_slots_are_held_until_the_task_is_processed(self):
+        poller = ActivityPoller(Domain("test-domain"), None, task_lists=[TaskListSpec("heavy", max_concurrency=1)])
+        self.assertEqual("heavy", poller.task_list)
+
+        with patch.object(Poller, "poll_with_retry", return_value=make_response("t1")) as poll_mock:
+            response = poller.poll_with_retry()
+        poll_mock.assert_called_once_with("heavy")
+
+        # the only slot is taken
+        with patch("time.sleep"), self.assertRaises(simpleflow.swf.mapper.exceptions.PollTimeout):
+            poller.poll_with_retry()
+
+        with patch("simpleflow.swf.process.worker.base.spawn"):
+            poller.process(response)
+        with patch.object(Poller, "poll_with_retry", return_value=make_response("t2")):
+            self.assertEqual("t2", poller.poll_with_retry().task_token)
+
+    def test_slot_is_released_on_poll_timeout(self):
+        poller = ActivityPoller(Domain("test-domain"), None, task_lists=[TaskListSpec("heavy", max_concurrency=1)])
+        timeout = simpleflow.swf.mapper.exceptions.PollTimeout("timeout")
+        with patch.object(Poller, "poll_with_retry", side_effect=timeout):
+            with self.assertRaises(simpleflow.swf.mapper.exceptions.PollTimeout):
+                poller.poll_with_retry()
+        self.assertIsNotNone(poller._task_list_selector.acquire())
+
+
+@mock_swf
+class TestActivityPollerConcurrencyLimits(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("simpleflow.constants.LOCKS_DIR", tempfile.mkdtemp())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_task_is_released_at_concurrency_limit(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list", concurrency_limits={"heavy": 1})
+        semaphore = poller._get_concurrency_semaphore("heavy")
+        slot = semaphore.try_acquire()
+
+        with patch("simpleflow.swf.process.worker.base.spawn") as spawn_mock, patch.object(
+            poller, "fail_with_retry"
+        ) as fail_mock:
+            poller.process(make_response("t1", "heavy"))
+        spawn_mock.assert_not_called()
+        self.assertEqual(simpleflow.constants.CONCURRENCY_LIMIT_REASON, fail_mock.call_args[1]["reason"])
+
+        semaphore.release(slot)
+        with patch("simpleflow.swf.process.worker.base.spawn") as spawn_mock:
+            poller.process(make_response("t2", "heavy"))
+        spawn_mock.assert_called_once()
+        # the slot is freed once the task is processed
+        semaphore.release(semaphore.try_acquire())
+
+    def test_limit_declared_on_preloaded_activity(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list")
+        with patch.dict(Dispatcher._activities, clear=True):
+            Dispatcher.preload("tests.data.activities")
+            self.assertEqual(2, poller._get_concurrency_semaphore("tests.data.activities.limited").value)
+            self.assertIsNone(poller._get_concurrency_semaphore("tests.data.activities.increment"))
+            self.assertIsNone(poller._get_concurrency_semaphore("activity.does.not.exist"))
+            # already checked by the poller process
+            self.assertIsNone(poller._get_declared_concurrency_semaphore("tests.data.activities.limited"))
+
+    def test_limit_declared_on_activity_is_checked_by_task_process(self):
+        poller = ActivityPoller(Domain("test-domain"), "task-list")
+        with patch.dict(Dispatcher._activities, clear=True):
+            # not imported by the poller process
+            self.assertIsNone(poller._get_concurrency_semaphore("tests.data.activities.limited"))
+            semaphore = poller._get_declared_concurrency_semaphore("tests.data.activities.limited")
+        self.assertEqual(2, semaphore.value)
+
+        slots = [semaphore.try_acquire() for _ in range(2)]
+        task = make_response("t1", "tests.data.activities.limited").activity_task
+        with patch.object(ActivityWorker, "process") as process_mock, patch.object(
+            poller, "fail_with_retry"
+        ) as fail_mock:
+            process_task(poller, "t1", task)
+        process_mock.assert_not_called()
+        self.assertEqual(simpleflow.constants.CONCURRENCY_LIMIT_REASON, fail_mock.call_args[1]["reason"])
+
+        semaphore.release(slots.pop())
+        with patch.object(ActivityWorker, "process") as process_mock:
+            process_task(poller, "t2", task)
+        process_mock.assert_called_once()
+        # the slot is freed once the task is processed
+        semaphore.release(semaphore.try_acquire())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,7 +4,7 @@ import json
 import unittest
 
 from simpleflow.history import History
-from simpleflow.swf.stats.pretty import dump_history_to_json
+from simpleflow.swf.stats.pretty import dump_history_to_json, formatted, streamed
 from simpleflow.swf.mapper.models.history.base import History as BasicHistory
 
 
@@ -38,3 +38,14 @@ class TestSimpleflowSwfStatsPretty(unittest.TestCase):
             ],
             [t[0] for t in parsed],
         )
+
+    def test_streamed_formats(self):
+        header = ("id", "status")
+        rows = [("wf-1", "OPEN"), ("wf-2", "CLOSED")]
+        for fmt in ("csv", "tsv", "json", "tabular", "human"):
+            for with_header in (False, True):
+                chunks = list(streamed(with_header, fmt)(lambda: (header, iter(rows)))())
+                expected = formatted(with_header, fmt)(lambda: (header, rows))()
+                self.assertEqual(expected, "".join(chunks), fmt)
+                if fmt in ("csv", "tsv"):
+                    self.assertEqual(2, len(chunks))
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import io
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import boto3
+from click.testing import CliRunner
+from moto import mock_swf
+from moto.swf import swf_backend
+
+from simpleflow.command import cli
+from simpleflow.swf import bulk
+from simpleflow.workflow import Workflow
+
+
+class BulkWorkflow(Workflow):
+    name = "bulk-workflow"
+    task_list = "bulk-task-list"
+
+
+class TestRun(unittest.TestCase):
+    def test_bounded_concurrency(self):
+        in_flight = []
+        lock = threading.Lock()
+        running = 0
+
+        def operation(item):
+            nonlocal running
+            with lock:
+                running += 1
+                in_flight.append(running)
+            time.sleep(0.005)
+            with lock:
+                running -= 1
+            if item["workflow_id"] == "wf-3":
+                raise ValueError("boom")
+            return item["workflow_id"].upper()
+
+        items = ({"workflow_id": f"wf-{i}"} for i in range(20))
+        outcomes = {item["workflow_id"]: (result, error) for item, result, error in bulk.run(operation, items, 4)}
+
+        self.assertEqual(20, len(outcomes))
+        self.assertLessEqual(max(in_flight), 4)
+        self.assertEqual(("WF-0", None), outcomes["wf-0"])
+        self.assertIsNone(outcomes["wf-3"][0])
+        self.assertIsInstance(outcomes["wf-3"][1], ValueError)
+
+    def test_rate(self):
+        start = time.monotonic()
+        outcomes = list(bulk.run(lambda item: None, ({"workflow_id": i} for i in range(6)), 6, rate=100))
+        self.assertEqual(6, len(outcomes))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_read_items(self):
+        fp = io.StringIO('{"workflow_id": "wf-1"}\n\n{"workflow_id": "wf-2", "input": {"args": [1]}}\n')
+        self.assertEqual(
+            [{"workflow_id": "wf-1"}, {"workflow_id": "wf-2", "input": {"args": [1]}}],
+            list(bulk.read_items(fp)),
+        )
+        with self.assertRaisesRegex(ValueError, "line 1"):
+            list(bulk.read_items(io.StringIO("[1, 2]\n")))
+
+
+class TestOperations(unittest.TestCase):
+    def tearDown(self):
+        swf_backend.reset()
+
+    def make_swf_environment(self):
+        self.conn = boto3.client("swf", region_name="us-east-1")
+        self.conn.register_domain(name="TestDomain", workflowExecutionRetentionPeriodInDays="50")
+        self.conn.register_workflow_type(
+            domain="TestDomain",
+            name="test-workflow",
+            version="v1",
+            defaultTaskList={"name": "test-task-list"},
+            defaultChildPolicy="TERMINATE",
+            defaultExecutionStartToCloseTimeout="300",
+            defaultTaskStartToCloseTimeout="30",
+        )
+        for i in range(3):
+            self.conn.start_workflow_execution(
+                domain="TestDomain",
+                workflowId=f"wf-{i}",
+                workflowType={"name": "test-workflow", "version": "v1"},
+                tagList=["bulk"],
+            )
+
+    def open_executions(self):
+        response = self.conn.list_open_workflow_executions(
+            domain="TestDomain", startTimeFilter={"oldestDate": 0}, maximumPageSize=100
+        )
+        return sorted(info["execution"]["workflowId"] for info in response["executionInfos"])
+
+    def test_start_transforms_input(self):
+        workflow_type = MagicMock()
+        items = [
+            {"workflow_id": "list", "input": [1, 2]},
+            {"workflow_id": "scalar", "input": 3},
+            {"workflow_id": "none"},
+        ]
+        list(bulk.run(bulk.start(workflow_type, BulkWorkflow), items))
+        inputs = {call.kwargs["workflow_id"]: call.kwargs["input"] for call in workflow_type.start_execution.mock_calls}
+        extra = {"class": f"{__name__}.BulkWorkflow"}
+        self.assertEqual(
+            {
+                # like simpleflow workflow.start
+                "list": {"args": [1, 2], "kwargs": {}, "__extra": extra},
+                "scalar": {"args": [3], "kwargs": {}, "__extra": extra},
+                "none": {"__extra": extra},
+            },
+            inputs,
+        )
+
+    @mock_swf
+    def test_terminate(self):
+        self.make_swf_environment()
+        items = [{"workflow_id": "wf-0"}, {"workflow_id": "wf-1"}, {"workflow_id": "unknown"}]
+        header, rows = bulk.results(bulk.run(bulk.terminate("TestDomain", reason="bulk"), items))
+        statuses = {row[0]: row[2] for row in rows}
+        self.assertEqual(("Workflow ID", "Run ID", "Status", "Error"), header)
+        self.assertEqual({"wf-0": "ok", "wf-1": "ok", "unknown": "error"}, statuses)
+        self.assertEqual(["wf-2"], self.open_executions())
+
+    @mock_swf
+    def test_signal_filtered_items(self):
+        self.make_swf_environment()
+        items = list(bulk.filtered_items("TestDomain", tag="bulk"))
+        self.assertEqual(["wf-0", "wf-1", "wf-2"], sorted(item["workflow_id"] for item in items))
+        outcomes = list(bulk.run(bulk.signal("TestDomain", "ping"), items))
+        self.assertEqual([None, None, None], [error for _, _, error in outcomes])
+
+    @mock_swf
+    def test_cli(self):
+        self.make_swf_environment()
+        result = CliRunner().invoke(
+            cli,
+            ["--format", "csv", "bulk.terminate", "TestDomain", "--input-file", "-", "--concurrency", "2"],
+            input='{"workflow_id": "wf-0"}\n{"workflow_id": "wf-1"}\n',
+        )
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual(["wf-0", "wf-1"], sorted(line.split(",")[0] for line in result.output.split()))
+        self.assertEqual(["wf-2"], self.open_executions())
+
+        # wf-0 is already terminated
+        result = CliRunner().invoke(
+            cli,
+            ["--format", "csv", "bulk.terminate", "TestDomain", "--input-file", "-"],
+            input='{"workflow_id": "wf-0"}\n{"workflow_id": "wf-2"}\n',
+        )
+        self.assertEqual(1, result.exit_code, result.output)
+        self.assertEqual([], self.open_executions())
@@ -176,6 +176,21 @@ class TestSimpleflowSwfExecutorWithJumboFields(MockSWFTestCase):
 
         expect(result).to.match(r"^simpleflow\+s3://jumbo-bucket/[a-z0-9-]+ 90002$")
 
+    @mock.patch.dict("os.environ", {"SIMPLEFLOW_JUMBO_FIELDS_BUCKET": "jumbo-bucket"})
+    def test_jumbo_fields_are_prefetched_before_replay(self):
+        self.register_activity_type("tests.test_simpleflow.swf.test_executor.print_me_n_times", "default")
+        self.start_workflow_execution(input='{"args": ["012345679", 10000]}')
+        result = self.build_decisions(ExampleJumboWorkflow)
+        self.take_decisions(result.decisions, result.execution_context)
+        self.process_activity_task()
+
+        contents = []
+        with mock.patch.object(format, "prefetch_jumbo_fields", side_effect=contents.extend):
+            self.build_decisions(ExampleJumboWorkflow)
+
+        jumbo_fields = [c for c in contents if isinstance(c, str) and c.startswith("simpleflow+s3://")]
+        expect(jumbo_fields).to.have.length_of(1)
+
     @mock.patch.dict("os.environ", {"SIMPLEFLOW_JUMBO_FIELDS_BUCKET": "jumbo-bucket"})
     def test_jumbo_fields_in_task_failed_is_decoded(self):
         # prepare execution
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from simpleflow.command import cli
+from simpleflow.swf.process.worker.task_lists import TaskListSpec
+
+
+@patch("simpleflow.swf.process.worker.command.start")
+class TestStartWorker(unittest.TestCase):
+    def invoke(self, *args):
+        return CliRunner().invoke(cli, ["worker.start", "--domain", "TestDomain", *args])
+
+    def test_options(self, start):
+        result = self.invoke("-t", "light", "-t", "heavy:max=2", "--concurrency-limit", "my.module.render=2")
+        self.assertEqual(0, result.exit_code, result.output)
+        kwargs = start.call_args[1]
+        self.assertEqual([TaskListSpec("light"), TaskListSpec("heavy", max_concurrency=2)], kwargs["task_lists"])
+        self.assertEqual({"my.module.render": 2}, kwargs["concurrency_limits"])
+
+    def test_bad_task_list(self, start):
+        for value in ("q:weight=abc", "q:foo=1", ":max=2"):
+            result = self.invoke("-t", value)
+            self.assertEqual(2, result.exit_code, value)
+            self.assertIn("Invalid value for '--task-list'", result.output)
+        start.assert_not_called()
+
+    def test_bad_concurrency_limit(self, start):
+        for value in ("foo", "foo=x", "=2", "foo=0", "foo=-1"):
+            result = self.invoke("-t", "q", "--concurrency-limit", value)
+            self.assertEqual(2, result.exit_code, value)
+            self.assertIn(repr(value), result.output)
+        start.assert_not_called()
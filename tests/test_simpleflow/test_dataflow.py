@@ -11,6 +11,7 @@ import simpleflow.swf.mapper.models
 import simpleflow.swf.mapper.models.decision
 import simpleflow.swf.mapper.models.workflow
 from simpleflow import futures
+from simpleflow.constants import CONCURRENCY_LIMIT_REASON
 from simpleflow.history import History
 from simpleflow.swf import constants
 from simpleflow.swf.executor import Executor
@@ -1218,6 +1219,34 @@ def test_on_failure_callback(mock_decref_workflow):
     assert decisions[0] == workflow_failed
 
 
+@mock_swf
+@patch.object(Executor, "decref_workflow")
+def test_task_released_at_concurrency_limit_is_rescheduled_later(mock_decref_workflow):
+    workflow = ATestDefinitionActivityRaisesOnFailure
+    executor = Executor(DOMAIN, workflow)
+    history = builder.History(workflow)
+
+    history.add_activity_task(
+        raise_on_failure,
+        decision_id=history.last_id,
+        activity_id="activity-tests.data.activities.raise_on_failure-1",
+        last_state="failed",
+        reason=CONCURRENCY_LIMIT_REASON,
+    )
+
+    (history.add_decision_task_scheduled().add_decision_task_started())
+
+    decisions = executor.replay(Response(history=history, execution=None)).decisions
+
+    # Not a failure: no retry is consumed and the task is rescheduled after a timer
+    assert executor.workflow.failed is False
+    assert "retry" not in executor._history.activities["activity-tests.data.activities.raise_on_failure-1"]
+    assert decisions[0].type == "StartTimer"
+    assert decisions[0]["startTimerDecisionAttributes"]["timerId"] == (
+        "__simpleflow_task_activity-tests.data.activities.raise_on_failure-1"
+    )
+
+
 class ATestMultipleScheduledActivitiesDefinition(BaseTestWorkflow):
     def run(self):
         a = self.submit(increment, 1)
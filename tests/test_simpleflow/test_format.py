@@ -3,7 +3,9 @@ from __future__ import annotations
 import json
 import os
 import random
+import tempfile
 import unittest
+from unittest.mock import patch
 
 import boto3
 from moto import mock_s3
@@ -133,3 +135,141 @@ class TestFormat(unittest.TestCase):
 
         for case in cases:
             self.assertEqual(case[1], format.decode(case[0], parse_json=False))
+
+    @mock_s3
+    def test_prefetch_jumbo_fields(self):
+        self.setup_jumbo_fields("jumbo-bucket")
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        push_content("jumbo-bucket", "abc", '"first"')
+        push_content("jumbo-bucket", "def", '"second"')
+
+        format.prefetch_jumbo_fields(
+            [None, "foo", "simpleflow+s3://jumbo-bucket/abc 7", "simpleflow+s3://jumbo-bucket/def 8"]
+        )
+
+        with patch("simpleflow.storage.pull_content", side_effect=AssertionError("not prefetched")):
+            self.assertEqual("first", format.decode("simpleflow+s3://jumbo-bucket/abc 7"))
+            self.assertEqual("second", format.decode("simpleflow+s3://jumbo-bucket/def 8"))
+
+    @mock_s3
+    def test_prefetch_jumbo_fields_ignores_errors(self):
+        self.setup_jumbo_fields("jumbo-bucket")
+        format.prefetch_jumbo_fields(["simpleflow+s3://jumbo-bucket/does-not-exist 7"])
+
+    @mock_s3
+    def test_jumbo_fields_disk_cache(self):
+        self.setup_jumbo_fields("jumbo-bucket")
+        push_content("jumbo-bucket", "xyz", '"cached"')
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+
+        with tempfile.TemporaryDirectory() as cache_dir, patch.object(
+            format, "SIMPLEFLOW_ENABLE_DISK_CACHE", True
+        ), patch.object(constants, "CACHE_DIR", cache_dir):
+            format._reset_after_fork()
+            self.assertEqual("cached", format.decode("simpleflow+s3://jumbo-bucket/xyz 8"))
+
+            # another process of the host would only hit the disk cache
+            format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+            with patch("simpleflow.storage.pull_content", side_effect=AssertionError("not cached")):
+                self.assertEqual("cached", format.decode("simpleflow+s3://jumbo-bucket/xyz 8"))
+
+            stats = format.jumbo_fields_cache_stats()
+            self.assertEqual((1, 1), (stats["disk_hits"], stats["disk_misses"]))
+            format._get_disk_cache().close()
+            format._reset_after_fork()
+
+    @mock_s3
+    def test_content_addressed_jumbo_fields(self):
+        self.setup_jumbo_fields("jumbo-bucket")
+        message = "B" * 64000
+
+        with patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_CONTENT_ADDRESSED", True), patch(
+            "simpleflow.storage.push_content", wraps=push_content
+        ) as push:
+            encoded = format.result(message)
+            self.assertEqual(encoded, format.result(message))
+            # not in the local caches but already in the bucket
+            format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+            self.assertEqual(encoded, format.result(message))
+            self.assertNotEqual(encoded, format.result(message + "B"))
+
+        self.assertEqual(2, push.call_count)
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        self.assertEqual(message, format.decode(encoded))
+
+    @mock_s3
+    def test_compressed_fields(self):
+        message = {"key": "C" * 64000}
+        for codec in ("zlib", "lzma"):
+            with patch("simpleflow.settings.SIMPLEFLOW_COMPRESSED_FIELDS", codec):
+                encoded = format.result(message)
+            assert encoded.startswith(f"simpleflow+{codec}:")
+            self.assertLessEqual(len(encoded), constants.MAX_RESULT_LENGTH)
+            self.assertEqual(message, format.decode(encoded))
+            self.assertEqual(json.dumps(message, separators=(",", ":")), format.decode(encoded, parse_json=False))
+
+    def test_failure_fields_are_not_compressed(self):
+        with patch("simpleflow.settings.SIMPLEFLOW_COMPRESSED_FIELDS", "zlib"):
+            with self.assertRaises(JumboTooLargeError):
+                format.reason("R" * (constants.MAX_REASON_LENGTH + 1))
+            with self.assertRaises(JumboTooLargeError):
+                format.details("D" * (constants.MAX_DETAILS_LENGTH + 1))
+
+    @mock_s3
+    def test_compressed_fields_fallback_to_jumbo_fields(self):
+        self.setup_jumbo_fields("jumbo-bucket")
+        message = "".join(random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(64000))
+        with patch("simpleflow.settings.SIMPLEFLOW_COMPRESSED_FIELDS", "zlib"):
+            encoded = format.result(message)
+        assert encoded.startswith("simpleflow+s3://")
+
+    @mock_s3
+    def test_compressed_jumbo_fields(self):
+        self.setup_jumbo_fields("jumbo-bucket")
+        message = "D" * (constants.JUMBO_FIELDS_MAX_SIZE + 1)
+
+        with patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION", True):
+            encoded = format.result(message)
+
+        key = encoded.split()[0].replace("simpleflow+s3://jumbo-bucket/", "")
+        obj = self.client.get_object(Bucket="jumbo-bucket", Key=key)
+        self.assertEqual("gzip", obj["ContentEncoding"])
+        format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+        self.assertEqual(message, format.decode(encoded))
+
+    @mock_s3
+    def test_compressed_jumbo_fields_too_large(self):
+        self.setup_jumbo_fields("jumbo-bucket")
+        message = "".join(random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(constants.JUMBO_FIELDS_MAX_SIZE))
+        with patch("simpleflow.settings.SIMPLEFLOW_JUMBO_FIELDS_COMPRESSION", True), patch.object(
+            constants, "JUMBO_FIELDS_MAX_SIZE", constants.JUMBO_FIELDS_MAX_SIZE // 2
+        ):
+            with self.assertRaisesRegex(JumboTooLargeError, "compressed jumbo field"):
+                format.encode(message, constants.MAX_RESULT_LENGTH)
+
+    def test_jumbo_fields_in_local_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ["SIMPLEFLOW_JUMBO_FIELDS_BUCKET"] = f"file://{directory}/jumbo"
+            message = "E" * 64000
+            encoded = format.result(message)
+            assert encoded.startswith(f"simpleflow+file://{directory}/jumbo/")
+            self.assertEqual(encoded.split()[1], "64002")
+
+            format.JUMBO_FIELDS_MEMORY_CACHE.clear()
+            self.assertEqual(message, format.decode(encoded))
+
+    def test_local_jumbo_fields_outside_of_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(f"{directory}/secret", "w") as f:
+                f.write("secret")
+            for location in (
+                f"simpleflow+file://{directory}/secret 6",
+                f"simpleflow+file://{directory}/jumbo/../secret 6",
+            ):
+                os.environ["SIMPLEFLOW_JUMBO_FIELDS_BUCKET"] = ""
+                with self.assertRaisesRegex(ValueError, "not stored locally"):
+                    format.decode(location, use_proxy=False)
+
+                os.environ["SIMPLEFLOW_JUMBO_FIELDS_BUCKET"] = f"file://{directory}/jumbo"
+                with self.assertRaisesRegex(ValueError, "not in"):
+                    format.decode(location, use_proxy=False)
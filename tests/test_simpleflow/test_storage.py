@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import os
+import shutil
 import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import boto3
@@ -75,6 +77,26 @@ class TestGroup(unittest.TestCase):
 
         assert storage.pull_content(self.bucket, "mykey.txt") == "42"
 
+    @mock_s3
+    def test_exists(self):
+        self.create()
+        storage.push(self.bucket, "mykey.txt", self.tmp_filename)
+
+        assert storage.exists(self.bucket, "mykey.txt")
+        assert not storage.exists(self.bucket, "otherkey.txt")
+
+    @mock_s3
+    def test_push_and_pull_gzipped_content(self):
+        self.create()
+        content = "Hey Jude, don't make it bad " * 100000
+
+        storage.push_content(self.bucket, "mykey.txt", storage.gzip_content(content), content_encoding="gzip")
+
+        obj = self.conn.get_object(Bucket=self.bucket, Key="mykey.txt")
+        assert obj["ContentEncoding"] == "gzip"
+        assert obj["ContentLength"] < len(content) // 100
+        assert storage.pull_content(self.bucket, "mykey.txt") == content
+
     @mock_s3
     def test_list(self):
         self.create()
@@ -85,6 +107,67 @@ class TestGroup(unittest.TestCase):
         assert len(keys) == 1
         assert keys[0].key == "mykey.txt"
 
+    @mock_s3
+    def test_bulk_operations(self):
+        self.create()
+
+        pushed = storage.push_many(self.bucket, ((f"bulk/{i}", str(i)) for i in range(50)), max_workers=4)
+        assert all(result.ok for result in pushed)
+
+        keys = storage.iter_keys(self.bucket, "bulk/")
+        pulled = {result.path: result.value for result in storage.pull_many(self.bucket, (k.key for k in keys))}
+        assert pulled == {f"bulk/{i}": str(i) for i in range(50)}
+
+        deleted = list(storage.delete_many(self.bucket, [f"bulk/{i}" for i in range(25)]))
+        assert len(deleted) == 25
+        assert len(storage.list_keys(self.bucket, "bulk/")) == 25
+
+    @mock_s3
+    def test_bulk_errors_are_returned(self):
+        self.create()
+        storage.push_content(self.bucket, "exists", "yes")
+
+        results = {result.path: result for result in storage.pull_many(self.bucket, ["exists", "missing"])}
+
+        assert results["exists"].value == "yes"
+        assert not results["missing"].ok
+        assert isinstance(results["missing"].error, ClientError)
+
+    @patch("time.sleep")
+    def test_bulk_retries_transient_errors(self, sleep):
+        throttled = ClientError(
+            {"Error": {"Code": "SlowDown"}, "ResponseMetadata": {"HTTPStatusCode": 503}}, "GetObject"
+        )
+        backend = unittest.mock.Mock()
+        backend.pull_content.side_effect = [throttled, throttled, "content"]
+
+        with patch.object(storage, "get_backend", return_value=backend):
+            results = list(storage.pull_many("bucket", ["key"], retries=2))
+
+        assert results == [storage.BulkResult("key", value="content")]
+        assert sleep.call_count == 2
+
+        backend.pull_content.side_effect = [throttled, "content"]
+        with patch.object(storage, "get_backend", return_value=backend):
+            results = list(storage.pull_many("bucket", ["key"], retries=0))
+        assert results[0].error is throttled
+
+    @patch("time.sleep")
+    def test_retries_transient_errors(self, sleep):
+        throttled = ClientError(
+            {"Error": {"Code": "SlowDown"}, "ResponseMetadata": {"HTTPStatusCode": 503}}, "PutObject"
+        )
+        backend = unittest.mock.Mock()
+        backend.pull_content.side_effect = [throttled, "content"]
+        backend.push_content.side_effect = [throttled, None]
+
+        with patch.object(storage, "get_backend", return_value=backend):
+            assert storage.pull_content("bucket", "key") == "content"
+            storage.push_content("bucket", "key", "content")
+
+        assert backend.push_content.call_count == 2
+        assert sleep.call_count == 2
+
     @mock_s3
     def test_sanitize_bucket_and_host(self):
         self.create()
@@ -119,3 +202,115 @@ class TestGroup(unittest.TestCase):
         # bucket with too many "/": raise
         with self.assertRaises(ValueError):
             storage.sanitize_bucket_and_host("s3-eu-west-1.amazonaws.com/mybucket/subpath")
+
+    @mock_s3
+    def test_clients_are_reused(self):
+        self.create()
+        storage._reset_after_fork()
+
+        self.assertIs(storage.get_client(), storage.get_client())
+        self.assertIs(storage.get_resource("us-east-1"), storage.get_resource("us-east-1"))
+        self.assertIsNot(storage.get_resource("us-east-1"), storage.get_resource("eu-west-1"))
+
+        # clients are shared by the threads, resources are not
+        with ThreadPoolExecutor(1) as executor:
+            client, resource = executor.submit(
+                lambda: (storage.get_client(), storage.get_resource("us-east-1"))
+            ).result()
+        self.assertIs(storage.get_client(), client)
+        self.assertIsNot(storage.get_resource("us-east-1"), resource)
+        self.assertEqual(
+            storage.get_client().meta.config.max_pool_connections,
+            storage.settings.SIMPLEFLOW_S3_MAX_POOL_CONNECTIONS,
+        )
+
+    @mock_s3
+    def test_clients_are_not_shared_with_forked_processes(self):
+        self.create()
+        storage.get_bucket(self.bucket)
+        client = storage.get_client()
+
+        read, write = os.pipe()
+        pid = os.fork()
+        if not pid:  # child
+            os.close(read)
+            os.write(
+                write, b"1" if storage.get_client() is not client and not storage._thread_cache("buckets") else b"0"
+            )
+            os._exit(0)
+        os.close(write)
+        os.waitpid(pid, 0)
+        self.assertEqual(b"1", os.read(read, 1))
+        os.close(read)
+
+
+class TestLocalBackend(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.bucket = f"file://{self.root}"
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_get_backend(self):
+        backend = storage.get_backend(self.bucket)
+        assert isinstance(backend, storage.LocalBackend)
+        assert backend.root == self.root
+        assert isinstance(storage.get_backend("bucket"), storage.S3Backend)
+        assert storage.get_backend("s3://bucket").bucket == "bucket"
+        with self.assertRaises(ValueError):
+            storage.get_backend("ftp://bucket")
+
+    def test_push_and_pull_content(self):
+        storage.push_content(self.bucket, "dir/mykey.txt", "Hey Jude")
+
+        assert os.listdir(os.path.join(self.root, "dir")) == ["mykey.txt"]
+        assert storage.exists(self.bucket, "dir/mykey.txt")
+        assert not storage.exists(self.bucket, "dir/otherkey.txt")
+        assert storage.pull_content(self.bucket, "dir/mykey.txt") == "Hey Jude"
+        with storage.pull_stream(self.bucket, "dir/mykey.txt") as stream:
+            assert stream.read() == b"Hey Jude"
+
+    def test_push_and_pull_files(self):
+        src = os.path.join(self.root, "src")
+        with open(src, "w") as f:
+            f.write("42")
+        storage.push(self.bucket, "mykey.txt", src)
+
+        dest = os.path.join(self.root, "dest")
+        storage.pull(self.bucket, "mykey.txt", dest)
+        with open(dest) as f:
+            assert f.read() == "42"
+
+    def test_pull_gzipped_and_empty_content(self):
+        storage.push_content(self.bucket, "gzipped", storage.gzip_content("Hey Jude"), content_encoding="gzip")
+        storage.push_content(self.bucket, "empty", "")
+
+        assert storage.pull_content(self.bucket, "gzipped") == "Hey Jude"
+        assert storage.pull_content(self.bucket, "empty") == ""
+
+    def test_list_keys(self):
+        for key in ("steps/a", "steps/b", "stepsfoo", "other/c"):
+            storage.push_content(self.bucket, key, "x")
+
+        assert [obj.key for obj in storage.list_keys(self.bucket, "steps")] == ["steps/a", "steps/b", "stepsfoo"]
+        assert [obj.key for obj in storage.list_keys(self.bucket, "steps/")] == ["steps/a", "steps/b"]
+        assert len(storage.list_keys(self.bucket)) == 4
+
+    def test_paths_stay_in_root(self):
+        with self.assertRaises(ValueError):
+            storage.push_content(self.bucket, "../escaped", "x")
+
+    def test_delete_and_bulk_operations(self):
+        results = storage.push_many(self.bucket, [("dir/a", "1"), ("dir/sub/b", "2"), ("dir/c", "3")])
+        assert sorted(result.path for result in results) == ["dir/a", "dir/c", "dir/sub/b"]
+
+        assert [obj.key for obj in storage.iter_keys(self.bucket, "dir/")] == ["dir/a", "dir/c", "dir/sub/b"]
+        pulled = {result.path: result.value for result in storage.pull_many(self.bucket, ["dir/a", "dir/sub/b"])}
+        assert pulled == {"dir/a": "1", "dir/sub/b": "2"}
+
+        storage.delete(self.bucket, "dir/a")
+        storage.delete(self.bucket, "dir/a")
+        assert not storage.exists(self.bucket, "dir/a")
+        assert all(result.ok for result in storage.delete_many(self.bucket, ["dir/c", "dir/sub/b"]))
+        assert storage.list_keys(self.bucket) == []
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from simpleflow.utils import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=10)
+    cache["a"] = "a" * 4
+    cache["b"] = "b" * 4
+    assert cache.get("a") == "aaaa"
+
+    cache["c"] = "c" * 4
+    assert "b" not in cache
+    assert cache.keys() == ["a", "c"]
+    assert cache.size == 8
+
+
+def test_lru_cache_replaces_values():
+    cache = LRUCache(max_size=10)
+    cache["a"] = "a" * 4
+    cache["a"] = "a" * 6
+    assert cache.size == 6
+    assert len(cache) == 1
+
+
+def test_lru_cache_skips_values_too_large():
+    cache = LRUCache(max_size=10)
+    cache["a"] = "a" * 11
+    assert "a" not in cache
+    assert cache.size == 0
+
+
+def test_lru_cache_counters():
+    cache = LRUCache(max_size=10)
+    cache["a"] = "a"
+    cache.get("a")
+    cache.get("b")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.clear()
+    assert len(cache) == 0 and cache.size == 0
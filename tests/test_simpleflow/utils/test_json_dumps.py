@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import dataclasses
 import datetime
+import enum
 import json
+import random
 import unittest
+import uuid
+from unittest.mock import patch
 
 import pytz
+from lazy_object_proxy import Proxy
 
+from simpleflow import settings
 from simpleflow.exceptions import ExecutionBlocked
 from simpleflow.futures import Future
-from simpleflow.utils import json_dumps
+from simpleflow.utils import _json, json_dumps, json_loads_or_raw
 
 
 class TestJsonDumps(unittest.TestCase):
@@ -91,6 +98,25 @@ class TestJsonDumps(unittest.TestCase):
         actual = json_dumps(data)
         self.assertEqual(expected, actual)
 
+    def test_proxy_top_level_and_pretty(self):
+        self.assertEqual(json_dumps(Proxy(lambda: "foo")), '"foo"')
+        self.assertEqual(json_dumps(Proxy(lambda: Proxy(lambda: 1))), "1")
+        data = {"args": [Proxy(lambda: 1), Proxy(lambda: {"b": Proxy(lambda: "c")})]}
+        self.assertEqual(json_dumps(data, pretty=True), json.dumps({"args": [1, {"b": "c"}]}, indent=4, sort_keys=True))
+
+    def test_single_pass(self):
+        data = {"args": [Proxy(lambda: "foo"), Proxy(lambda: 1.5)]}
+        with patch.object(_json, "_resolve_proxy", side_effect=AssertionError("copied")):
+            self.assertEqual(json_dumps(data), '{"args":["foo",1.5]}')
+            with self.assertRaises(TypeError):
+                json_dumps({"obj": object()})
+
+    def test_proxy_without_c_encoder(self):
+        # e.g. PyPy
+        data = {"args": [Proxy(lambda: "foo"), Proxy(lambda: {"b": Proxy(lambda: 1.5)})]}
+        with patch("json.encoder.c_make_encoder", None), patch.object(settings, "SIMPLEFLOW_FAST_JSON", False):
+            self.assertEqual(json_dumps(data), '{"args":["foo",{"b":1.5}]}')
+
     def test_set(self):
         data = [
             {1, 2, 3},
@@ -106,5 +132,172 @@ class TestJsonDumps(unittest.TestCase):
         self.assertEqual(sorted(expected[1]), sorted(actual[1]))
 
 
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(12 if depth < 3 else 7)
+    if kind == 0:
+        return rng.choice([None, True, False])
+    if kind == 1:
+        return rng.randint(-(2**70), 2**70) if rng.random() < 0.1 else rng.randint(-1000, 10**12)
+    if kind == 2:
+        return rng.choice([rng.random(), rng.uniform(-1e20, 1e20), rng.random() * 10 ** rng.randint(-12, 20)])
+    if kind == 3:
+        alphabet = 'abc "\\/\n\t\x00\x1f\x7f\xe9\u20ac\U0001f600'
+        return "".join(rng.choice(alphabet) for _ in range(rng.randrange(8)))
+    if kind == 4:
+        return datetime.datetime(2020, 1, 2, 3, 4, 5, rng.choice([0, 123456]), tzinfo=rng.choice([None, pytz.UTC]))
+    if kind == 5:
+        return uuid.UUID(int=rng.getrandbits(128))
+    if kind == 6:
+        return rng.choice([b"bytes", datetime.date(2020, 1, 2), datetime.time(3, 4, 5, 600000)])
+    if kind == 7:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    if kind == 8:
+        return tuple(random_value(rng, depth + 1) for _ in range(rng.randrange(4)))
+    if kind == 9:
+        value = random_value(rng, depth + 1)
+        return Proxy(lambda: value)
+    return {random_value(rng, 3) if kind == 10 and depth else f"k{i}": random_value(rng, depth + 1) for i in range(4)}
+
+
+def dumps_or_error(obj, **kwargs):
+    try:
+        return json_dumps(obj, **kwargs)
+    except Exception as e:
+        return type(e)
+
+
+def loads_or_error(data):
+    try:
+        return json_loads_or_raw(data)
+    except Exception as e:
+        return type(e)
+
+
+class Color(enum.Enum):
+    RED = 1
+    GREEN = ("0", "1", "0")
+
+
+class Status(str, enum.Enum):
+    OK = "ok"
+
+
+class Level(enum.IntEnum):
+    HIGH = 2
+
+
+@unittest.skipIf(_json.orjson is None, "orjson is not installed")
+class TestFastJsonConformance(unittest.TestCase):
+    """
+    json_dumps() and json_loads_or_raw() must return the same thing with and
+    without orjson.
+    """
+
+    def assert_same_dumps(self, obj, **kwargs):
+        with patch.object(settings, "SIMPLEFLOW_FAST_JSON", False):
+            expected = dumps_or_error(obj, **kwargs)
+        self.assertEqual(expected, dumps_or_error(obj, **kwargs), repr(obj))
+
+    def assert_same_loads(self, data):
+        with patch.object(settings, "SIMPLEFLOW_FAST_JSON", False):
+            expected = loads_or_error(data)
+        actual = loads_or_error(data)
+        self.assertEqual(repr(expected), repr(actual), repr(data))
+        self.assertEqual(
+            [type(v) for v in expected] if isinstance(expected, list) else type(expected),
+            [type(v) for v in actual] if isinstance(actual, list) else type(actual),
+        )
+
+    def test_dumps_edge_cases(self):
+        resolved = Future()
+        resolved.set_finished({"b": 1, "a": 2})
+        cases = [
+            float("nan"),
+            [float("inf"), -float("inf")],
+            [1e16, 1e-5, 2.5e-5, 0.0001, 1e22, -0.0, 5e-324],
+            2**63,
+            -(2**64),
+            "\U0001f600 \u2028 \x7f \ud800",
+            {1: "a"},
+            {"b": 1, "a": {"d": 2, "c": 3}},
+            {"set": {3}, "frozen": frozenset()},
+            {"future": resolved},
+            Point(1, 2),
+            object(),
+            datetime.datetime(2020, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        ]
+        for case in cases:
+            self.assert_same_dumps(case)
+
+    def test_dumps_non_finite_floats(self):
+        nan_future = Future()
+        nan_future.set_finished([float("nan")])
+        for case in (
+            [None, float("nan")],
+            {"a": None, "b": (1.5, float("inf"))},
+            {"future": nan_future, "other": None},
+            Proxy(lambda: [None, -float("inf")]),
+        ):
+            self.assert_same_dumps(case)
+
+    def test_dumps_none_once(self):
+        data = {"a": None, "b": [None, 1.5, {"c": None}]}
+        with patch("json.dumps", side_effect=AssertionError("encoded twice")):
+            self.assertEqual('{"a":null,"b":[null,1.5,{"c":null}]}', json_dumps(data))
+
+    def test_dumps_custom_default(self):
+        self.assert_same_dumps([datetime.datetime(1970, 1, 1), object()], default=lambda _: "foo")
+        self.assert_same_dumps([Color.RED], default=lambda _: "foo")
+
+    def test_dumps_enums(self):
+        self.assert_same_dumps([Color.RED, {"color": Color.GREEN}, Status.OK, Level.HIGH])
+        self.assertEqual(json_dumps([Color.RED, Color.GREEN]), '[1,["0","1","0"]]')
+
+    def test_dumps_generators(self):
+        self.assertEqual(json_dumps({"gen": (i for i in range(3))}), '{"gen":[0,1,2]}')
+        # the fallback to json.dumps() must not see a consumed generator
+        self.assertEqual(json_dumps([None, (i for i in range(3))]), "[null,[0,1,2]]")
+
+    def test_dumps_pending_future(self):
+        with self.assertRaises(ExecutionBlocked):
+            json_dumps({"result": Future()})
+
+    def test_dumps_random_objects(self):
+        rng = random.Random(42)
+        for _ in range(2000):
+            self.assert_same_dumps(random_value(rng))
+
+    def test_loads(self):
+        cases = [
+            "",
+            "null",
+            "not json",
+            "123456789012345678901234567890",
+            "-9223372036854775809",
+            "18446744073709551615",
+            "1e400",
+            "NaN",
+            '"\\ud800"',
+            '{"a": 1, "a": 2}',
+            '{"a": [1.5, -0, true]}',
+        ]
+        for case in cases:
+            self.assert_same_loads(case)
+
+    def test_loads_random_documents(self):
+        rng = random.Random(42)
+        for _ in range(2000):
+            with patch.object(settings, "SIMPLEFLOW_FAST_JSON", False):
+                data = dumps_or_error(random_value(rng))
+            if isinstance(data, str):
+                self.assert_same_loads(data)
+
+
 if __name__ == "__main__":
     unittest.main()
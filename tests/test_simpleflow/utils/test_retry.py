@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import os
 import unittest
 from time import time
 from unittest import mock
 
 from flaky import flaky
 
-from simpleflow.utils.retry import constant, exponential, with_delay
+from simpleflow.utils import retry
+from simpleflow.utils.retry import RetryBudget, RetryPolicy, constant, exponential, with_delay
 
 error_epsilon = 0.01  # tolerate an error of 0.01%
 RETRY_WAIT_TIME = 0.1  # time between retries
@@ -102,3 +104,78 @@ class TestRetry(unittest.TestCase):
                 func()
 
         self.assertEqual(callable.count, max_count)
+
+
+@mock.patch("time.sleep")
+class TestRetryPolicy(unittest.TestCase):
+    def test_retries_retryable_errors(self, sleep):
+        callable = DummyCallableRaises(KeyError("test"))
+        policy = RetryPolicy(max_attempts=3, is_retryable=lambda e: isinstance(e, KeyError), budget=None)
+        with self.assertRaises(KeyError):
+            policy(callable)()
+        self.assertEqual(3, callable.count)
+        self.assertEqual(2, sleep.call_count)
+
+        callable = DummyCallableRaises(ValueError("test"))
+        with self.assertRaises(ValueError):
+            policy.call(callable)
+        self.assertEqual(1, callable.count)
+
+    def test_delays_are_jittered_and_capped(self, sleep):
+        policy = RetryPolicy(max_attempts=20, base_delay=1, max_delay=10, max_elapsed=None, budget=None)
+        with self.assertRaises(ValueError):
+            policy.call(DummyCallableRaises(ValueError("test")))
+        delays = [call[0][0] for call in sleep.call_args_list]
+        self.assertEqual(19, len(delays))
+        self.assertTrue(all(1 <= delay <= 10 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_max_elapsed(self, sleep):
+        policy = RetryPolicy(max_attempts=10, base_delay=5, max_delay=5, max_elapsed=12, budget=None)
+        callable = DummyCallableRaises(ValueError("test"))
+        with mock.patch("time.monotonic", side_effect=[0, 0, 5, 10]), self.assertRaises(ValueError):
+            policy.call(callable)
+        # the third retry would start after 15 seconds
+        self.assertEqual(3, callable.count)
+
+    def test_budget(self, sleep):
+        budget = RetryBudget(ratio=0.5, min_per_second=0, max_balance=2)
+        policy = RetryPolicy(max_attempts=10, base_delay=0, budget=budget)
+        callable = DummyCallableRaises(ValueError("test"))
+        with self.assertRaises(ValueError):
+            policy.call(callable)
+        self.assertEqual(3, callable.count)
+
+        # successes refill the budget
+        for _ in range(2):
+            self.assertIsNone(policy.call(DummyCallable()))
+        callable = DummyCallableRaises(ValueError("test"))
+        with self.assertRaises(ValueError):
+            policy.call(callable)
+        self.assertEqual(2, callable.count)
+
+    def test_budget_refills_over_time(self, sleep):
+        with mock.patch("time.monotonic", side_effect=[0, 0, 0.1, 0.6]):
+            budget = RetryBudget(ratio=0, min_per_second=2, max_balance=1)
+            self.assertTrue(budget.try_withdraw())
+            self.assertFalse(budget.try_withdraw())
+            self.assertTrue(budget.try_withdraw())
+
+    def test_budget_is_reset_after_fork(self, sleep):
+        budget = retry.RETRY_BUDGET
+        balance = budget.balance
+        budget.balance = 0
+        try:
+            read, write = os.pipe()
+            with budget._lock:
+                pid = os.fork()
+                if not pid:  # child: the lock is held by the parent
+                    os.close(read)
+                    os.write(write, b"1" if budget.try_withdraw() else b"0")
+                    os._exit(0)
+            os.close(write)
+            os.waitpid(pid, 0)
+            self.assertEqual(b"1", os.read(read, 1))
+            os.close(read)
+        finally:
+            budget.balance = balance
@@ -9,6 +9,7 @@ from moto.swf import swf_backend
 from simpleflow.swf.executor import Executor
 from simpleflow.swf.process.worker.base import ActivityPoller, ActivityWorker
 from simpleflow.swf.mapper.actors import Decider
+from simpleflow.swf.mapper.models import registration_cache
 from tests.data.constants import DOMAIN
 
 
@@ -16,6 +17,8 @@ from tests.data.constants import DOMAIN
 @mock_swf
 class MockSWFTestCase(unittest.TestCase):
     def setUp(self):
+        # tests decorated by mock_swf don't reset the backend: start afresh
+        swf_backend.reset()
         # SWF preparation
         self.domain = DOMAIN
         self.workflow_type_name = "test-workflow"
@@ -40,6 +43,8 @@ class MockSWFTestCase(unittest.TestCase):
 
     def tearDown(self):
         swf_backend.reset()
+        # the SWF objects are gone with the backend
+        registration_cache.clear()
         assert not self.swf_conn.list_domains(registrationStatus="REGISTERED")[
             "domainInfos"
         ], "moto state incorrectly reset!"